@@ -1,26 +1,34 @@
 import math
-import os
+import time
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-GOOGLE_API_KEY = os.environ["GOOGLE_API_KEY"]
+from functools import lru_cache, partial
+from typing import Callable, Mapping, Optional, Union
 
-if not GOOGLE_API_KEY:
-    raise EnvironmentError("GOOGLE_API_KEY is not set")
-
-from typing import Callable
-
-from IPython.display import Image, display
+from graph_common.instrumentation import InstrumentationHandler
+from graph_common.model_profiles import NodeModel, builds_profile_models
+from graph_common.single_flight import SingleFlight, model_config_key, request_key, resolve_single_flight
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, SystemMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import Runnable
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, START, MessagesState, StateGraph
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import tools_condition
 from langsmith import traceable
 from typing_extensions import TypedDict
 
+from batch_math import BATCH_MATH_TOOLS
+from checkpointers import CheckpointerBackend, make_checkpointer
+from compaction import ConversationCompactor
+from fast_math import FastPathNode, PathStats, route_fast_path, served_by_fast_path
+from graph_cache import GraphCache, get_or_build, resolve_graph_cache
+from model_profiles import PROFILES, build_chat_model
+from rate_limit import RateLimiter, resolve_rate_limiter
+from tool_executor import ToolExecutor
+
 
 def multiply(a: float, b: float) -> float:
     """Multiply two floats.
@@ -76,7 +84,37 @@ def log(a: float) -> float:
     """
     return math.log(a)
 
-MATH_TOOLS = [multiply, add, subtract, divide, power, sqrt, log]
+SCALAR_MATH_TOOLS = [multiply, add, subtract, divide, power, sqrt, log]
+
+# Batch variants (batch_math.py) let the model process a whole column in one call
+MATH_TOOLS = SCALAR_MATH_TOOLS + BATCH_MATH_TOOLS
+
+# Deterministic tools whose results ToolExecutor may memoise; batch results
+# can be large, so they are not cached
+PURE_TOOLS = frozenset(tool.__name__ for tool in SCALAR_MATH_TOOLS)
+
+def agent_node(
+    state: MessagesState,
+    llm_with_tools: Runnable,
+    rate_limiter: Optional[RateLimiter],
+    system_message: str,
+    single_flight: Optional[SingleFlight],
+    scope: str,
+):
+    """LLM decides: respond directly or call tool.
+
+    Concurrent calls with the same `scope` (model settings and tools) and
+    conversation share one model request through `single_flight`, whatever
+    thread they run on.
+    """
+    messages = [SystemMessage(content=system_message)] + state["messages"]
+    if rate_limiter is None:
+        call = lambda: llm_with_tools.invoke(messages)
+    else:
+        call = lambda: rate_limiter.invoke(llm_with_tools, messages)
+    if single_flight is None:
+        return {"messages": [call()]}
+    return {"messages": [single_flight.do(request_key(scope, messages), call)]}
 
 class ReActAgent:
 
@@ -88,55 +126,199 @@ When the user asks a math question:
 2. Show your step-by-step reasoning
 3. Provide the final numerical answer clearly
 4. Explain the result in simple terms
+
+For a list or column of numbers, call the *_batch tool once with the whole
+list instead of one scalar call per value.
 """
 
+    # Nodes that call a model; each can get its own model through `node_models`
+    MODEL_NODES = ("agent", "compact")
+
     def __init__(self,
                  Model_name: str = "gemini-2.5-flash",
                  tools: list[Callable] = MATH_TOOLS,
-                 temperature: float = 0.0):
-        """Initialize ReAct agent with LLM and tools."""
-        self.builder = StateGraph(MessagesState)
+                 temperature: float = 0.0,
+                 checkpointer: Union[CheckpointerBackend, BaseCheckpointSaver] = "memory",
+                 compaction: Union[bool, ConversationCompactor] = True,
+                 fast_path: bool = False,
+                 llm: Optional[BaseChatModel] = None,
+                 instrumentation: Optional[InstrumentationHandler] = None,
+                 tool_workers: int = 8,
+                 tool_cache_size: int = 1024,
+                 single_flight: Union[bool, SingleFlight] = True,
+                 rate_limiter: Union[bool, RateLimiter, None] = None,
+                 node_models: Optional[Mapping[str, NodeModel]] = None,
+                 graph_cache: Union[bool, GraphCache] = True):
+        """Initialize ReAct agent with LLM and tools.
+
+        `checkpointer` is a backend name for make_checkpointer ("memory",
+        "bounded", "sqlite") or a ready checkpointer instance.
+        `compaction` keeps long threads under a token budget before each
+        turn (True = default ConversationCompactor, False = off).
+        `fast_path` answers pure arithmetic locally with the math tools,
+        without any model call.
+        `llm` replaces the Gemini model (e.g. a fake model in benchmarks).
+        `instrumentation` records per-node timing and token metrics.
+        `tool_workers` threads run the tool calls of one turn concurrently and
+        up to `tool_cache_size` results of pure tools are memoised.
+        `single_flight` makes concurrent identical model calls (same model
+        settings, tools and conversation) share one request, on any thread
+        and also when the graph is served from langgraph.json (True = the
+        process-wide SingleFlight, False = off, or a given instance).
+        `rate_limiter` schedules model calls under RPM/TPM limits with retries
+        on 429 (default: the process-wide limiter when Gemini is used).
+        `node_models` maps "agent" / "compact" to a model_profiles profile
+        name or a model instance, e.g. {"compact": "flash-lite"} summarises
+        old turns with the cheaper model; unlisted nodes use `llm` /
+        `Model_name`.
+        `graph_cache` reuses the tool-bound model, compactor, tool executor
+        and compiled graph of an earlier agent with the same models, tools and
+        options (True = shared GraphCache, False = build per instance, or a
+        given cache). Every agent still gets its own checkpointer, so threads
+        are never shared; the tool result cache and executor stats are.
+        Models are matched by identity: agents that each build a new `llm`
+        never hit the cache.
+        """
         self.tools = tools
-        self.checkpointer = MemorySaver()
-        self._setup_model(Model_name, temperature)
-        self._setup_nodes()
-        self._setup_edges()
-        self.graph = self.builder.compile(checkpointer=self.checkpointer)
-
-    def _setup_model(self, model_name: str, temperature: float):
-        """Setup model WITH SYSTEM MESSAGE."""
-        self.llm = ChatGoogleGenerativeAI(
-            google_api_key=GOOGLE_API_KEY,
-            model=model_name,
-            temperature=temperature
+        self.checkpointer = make_checkpointer(checkpointer) if isinstance(checkpointer, str) else checkpointer
+        self.rate_limiter = resolve_rate_limiter(
+            rate_limiter, builds_own_client=llm is None or builds_profile_models(node_models)
+        )
+        self._setup_model(Model_name, temperature, llm, node_models)
+        self.fast_path = fast_path
+        self.path_stats = PathStats()
+        self.single_flight = resolve_single_flight(single_flight)
+        parts = get_or_build(
+            resolve_graph_cache(graph_cache),
+            self._graph_key(compaction, tool_workers, tool_cache_size),
+            lambda: self._build_graph(compaction, tool_workers, tool_cache_size),
+        )
+        self.builder, self.llm_with_tools = parts["builder"], parts["llm_with_tools"]
+        self.compactor, self.tool_executor = parts["compactor"], parts["tool_executor"]
+        # The graph is compiled without a checkpointer; attaching this agent's is a shallow copy.
+        # Calls without a thread_id have nothing to resume and run on the bare graph.
+        self._stateless_graph = parts["graph"]
+        if instrumentation is not None:
+            self._stateless_graph = self._stateless_graph.with_config(callbacks=[instrumentation])
+        self.graph = self._stateless_graph
+        if self.checkpointer is not None:
+            self.graph = self.graph.copy(update={"checkpointer": self.checkpointer})
+
+    def _setup_model(
+        self,
+        model_name: str,
+        temperature: float,
+        llm: Optional[BaseChatModel] = None,
+        node_models: Optional[Mapping[str, NodeModel]] = None,
+    ):
+        """Setup the default model and the model of each node (system message added per call)."""
+        # The RateLimiter owns retries (429s and transient errors) and backoff when there is one
+        max_retries = 0 if self.rate_limiter is not None else None
+        if llm is None:
+            llm = build_chat_model(model_name, temperature, max_retries=max_retries)
+        self.llm = llm
+        self.node_llms = PROFILES.resolve_node_models(node_models, self.MODEL_NODES, llm, max_retries=max_retries)
+
+    def _graph_key(
+        self, compaction: Union[bool, ConversationCompactor], tool_workers: int, tool_cache_size: int
+    ) -> tuple:
+        """What the compiled graph depends on; the cached parts keep these objects alive."""
+        if compaction is True:
+            compaction_key = ("default", id(self.node_llms["compact"]))
+        else:
+            compaction_key = id(compaction) if compaction else None
+        return (
+            type(self),
+            id(self.node_llms["agent"]),
+            compaction_key,
+            tuple(map(id, self.tools)),
+            self.fast_path,
+            tool_workers,
+            tool_cache_size,
+            id(self.rate_limiter),
+            id(self.single_flight),
         )
-        self.llm_with_tools = self.llm.bind_tools(self.tools)
 
-    def _agent_node(self, state: MessagesState):
-        """LLM decides: respond directly or call tool."""
-        messages = [SystemMessage(content=self.SYSTEM_MESSAGE)] + state["messages"]
-        return {"messages": [self.llm_with_tools.invoke(messages)]}
+    def _build_graph(
+        self, compaction: Union[bool, ConversationCompactor], tool_workers: int, tool_cache_size: int
+    ) -> dict:
+        """Bind the tools, build the nodes and compile the graph (skipped on a graph cache hit)."""
+        self.llm_with_tools = self.node_llms["agent"].bind_tools(self.tools)
+        if compaction is True:
+            compaction = ConversationCompactor(llm=self.node_llms["compact"])
+        self.compactor = compaction or None
+        self.tool_executor = ToolExecutor(
+            self.tools,
+            pure=PURE_TOOLS,
+            max_workers=tool_workers,
+            cache_size=tool_cache_size,
+        )
+        self.builder = StateGraph(MessagesState)
+        self._setup_nodes()
+        self._setup_edges()
+        return {
+            "builder": self.builder,
+            "llm_with_tools": self.llm_with_tools,
+            "compactor": self.compactor,
+            "tool_executor": self.tool_executor,
+            "graph": self.builder.compile(),
+            "tools": tuple(self.tools),
+            "rate_limiter": self.rate_limiter,
+            "single_flight": self.single_flight,
+        }
 
     def _setup_nodes(self):
         """Register all nodes"""
-        self.builder.add_node("agent", self._agent_node)
-        self.builder.add_node("tools", ToolNode(self.tools))
+        if self.fast_path:
+            self.builder.add_node("fast_path", FastPathNode(self.tools))
+        if self.compactor:
+            self.builder.add_node("compact", self.compactor)
+        # Built from the cached parts only: a bound method would keep this
+        # agent (checkpointer, stats) alive for as long as the cache entry
+        self.builder.add_node("agent", partial(
+            agent_node,
+            llm_with_tools=self.llm_with_tools,
+            rate_limiter=self.rate_limiter,
+            system_message=self.SYSTEM_MESSAGE,
+            single_flight=self.single_flight,
+            scope=request_key("agent", model_config_key(self.node_llms["agent"]), [tool.__name__ for tool in self.tools]),
+        ))
+        self.builder.add_node("tools", self.tool_executor)
 
     def _setup_edges(self):
         """Register all edges"""
-        self.builder.add_edge(START, "agent")
+        llm_entry = "compact" if self.compactor else "agent"
+        if self.fast_path:
+            self.builder.add_edge(START, "fast_path")
+            self.builder.add_conditional_edges("fast_path", route_fast_path, {"answered": END, "llm": llm_entry})
+        else:
+            self.builder.add_edge(START, llm_entry)
+        if self.compactor:
+            # Compact once per user turn, before the first model call
+            self.builder.add_edge("compact", "agent")
         self.builder.add_conditional_edges("agent", tools_condition)
         self.builder.add_edge("tools", "agent")
         self.builder.add_edge("agent", END)
 
+    def _graph_for(self, config: Optional[dict]):
+        """The checkpointed graph for calls on a thread, the bare graph otherwise."""
+        if (config or {}).get("configurable", {}).get("thread_id") is None:
+            return self._stateless_graph
+        return self.graph
+
     def invoke(self, messages: list[AnyMessage], config: dict = None):
-        return self.graph.invoke({"messages": messages}, config=config)
+        start = time.perf_counter()
+        result = self._graph_for(config).invoke({"messages": messages}, config=config)
+        self.path_stats.record("fast" if served_by_fast_path(result) else "llm", time.perf_counter() - start)
+        return result
 
     def stream(self, messages: list[AnyMessage], config: dict = None):
-        return self.graph.stream({"messages": messages}, config=config)
+        return self._graph_for(config).stream({"messages": messages}, config=config)
 
     def show(self, filename: str = "graph_diagram.png"):
         """Display Mermaid diagram and save it as a PNG file."""
+        from IPython.display import Image, display
+
         png_data = self.graph.get_graph().draw_mermaid_png()
         # Save PNG to disk
         with open(filename, "wb") as f:
@@ -144,7 +326,16 @@ When the user asks a math question:
         display(Image(png_data))
         print(f"Diagram saved as {filename}")
 
-graph = ReActAgent().graph
+@lru_cache(maxsize=1)
+def make_graph():
+    """Build the studio graph once, on first use."""
+    return ReActAgent().graph
+
+def __getattr__(name: str):
+    # `graph` (referenced from langgraph.json) is built lazily on first access
+    if name == "graph":
+        return make_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 @traceable(name="ReActAgent")
 def main():
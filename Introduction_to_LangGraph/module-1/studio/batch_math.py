@@ -0,0 +1,129 @@
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, TypedDict
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MAX_BATCH_ROWS = 1_000_000
+
+
+class BatchError(TypedDict):
+    index: int
+    error: str
+
+
+class BatchResult(TypedDict):
+    values: list[Optional[float]]  # None where the row failed
+    errors: list[BatchError]
+
+
+def _numpy():
+    # Imported on first batch call so importing the agent stays cheap
+    import numpy
+
+    return numpy
+
+
+def _columns(*columns: list[float]) -> list["np.ndarray"]:
+    """Convert the tool arguments to float arrays, broadcasting one-element lists."""
+    np = _numpy()
+    arrays = [np.asarray(column, dtype=float).reshape(-1) for column in columns]
+    rows = max(len(a) for a in arrays)
+    if rows > MAX_BATCH_ROWS:
+        raise ValueError(f"at most {MAX_BATCH_ROWS} rows per call, got {rows}")
+    for a in arrays:
+        if len(a) not in (1, rows):
+            raise ValueError(f"columns must have the same length (or length 1), got {[len(a) for a in arrays]}")
+    return [np.broadcast_to(a, rows) for a in arrays]
+
+
+def _evaluate(
+    compute: Callable[..., "np.ndarray"],
+    columns: list["np.ndarray"],
+    checks: Sequence[tuple["np.ndarray", str]] = (),
+) -> BatchResult:
+    """Run `compute` on whole columns and report failing rows instead of raising.
+
+    `checks` are (mask, message) pairs for known domain errors; any other
+    non-finite result is reported as such.
+    """
+    np = _numpy()
+    with np.errstate(all="ignore"):
+        values = np.asarray(compute(*columns), dtype=float)
+    failed = ~np.isfinite(values)
+    messages = np.full(len(values), "result is not a finite number", dtype=object)
+    for mask, message in reversed(checks):
+        messages[mask] = message
+        failed |= mask
+
+    errors: list[BatchError] = [{"index": int(i), "error": messages[i]} for i in np.flatnonzero(failed)]
+    result = values.astype(object)
+    result[failed] = None
+    return {"values": result.tolist(), "errors": errors}
+
+
+def multiply_batch(a: list[float], b: list[float]) -> BatchResult:
+    """Multiply two columns of floats row by row.
+    Args:
+        a: first column (a one-element list applies to every row)
+        b: second column (a one-element list applies to every row)
+    """
+    return _evaluate(lambda x, y: x * y, _columns(a, b))
+
+def add_batch(a: list[float], b: list[float]) -> BatchResult:
+    """Add two columns of floats row by row.
+    Args:
+        a: first column (a one-element list applies to every row)
+        b: second column (a one-element list applies to every row)
+    """
+    return _evaluate(lambda x, y: x + y, _columns(a, b))
+
+def subtract_batch(a: list[float], b: list[float]) -> BatchResult:
+    """Subtract two columns of floats row by row (a - b).
+    Args:
+        a: first column (a one-element list applies to every row)
+        b: second column (a one-element list applies to every row)
+    """
+    return _evaluate(lambda x, y: x - y, _columns(a, b))
+
+def divide_batch(a: list[float], b: list[float]) -> BatchResult:
+    """Divide two columns of floats row by row (a / b).
+    Args:
+        a: first column (a one-element list applies to every row)
+        b: second column (a one-element list applies to every row)
+    """
+    x, y = _columns(a, b)
+    return _evaluate(lambda x, y: x / y, [x, y], [(y == 0, "division by zero")])
+
+def power_batch(a: list[float], b: list[float]) -> BatchResult:
+    """Raise a column of floats to a column of powers row by row (a ** b).
+    Args:
+        a: base column (a one-element list applies to every row)
+        b: exponent column (a one-element list applies to every row)
+    """
+    np = _numpy()
+    x, y = _columns(a, b)
+    checks = [
+        ((x == 0) & (y < 0), "zero to a negative power"),
+        ((x < 0) & (y != np.round(y)), "negative base with a fractional exponent"),
+    ]
+    return _evaluate(lambda x, y: x ** y, [x, y], checks)
+
+def sqrt_batch(a: list[float]) -> BatchResult:
+    """Square root of every float in a column.
+    Args:
+        a: column of floats
+    """
+    np = _numpy()
+    (x,) = _columns(a)
+    return _evaluate(np.sqrt, [x], [(x < 0, "square root of a negative number")])
+
+def log_batch(a: list[float]) -> BatchResult:
+    """Natural logarithm of every float in a column.
+    Args:
+        a: column of floats
+    """
+    np = _numpy()
+    (x,) = _columns(a)
+    return _evaluate(np.log, [x], [(x <= 0, "math domain error")])
+
+BATCH_MATH_TOOLS = [multiply_batch, add_batch, subtract_batch, divide_batch, power_batch, sqrt_batch, log_batch]
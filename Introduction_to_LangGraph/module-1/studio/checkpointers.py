@@ -0,0 +1,141 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Literal, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import InMemorySaver
+
+CheckpointerBackend = Literal["memory", "bounded", "sqlite"]
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """In-memory checkpointer with a per-thread history limit and LRU thread eviction.
+
+    Only the newest `max_checkpoints_per_thread` checkpoints of every thread
+    are kept (older ones, their pending writes and unreferenced channel
+    blobs are dropped), and once more than `max_threads` threads exist the
+    least recently used one is deleted entirely.
+    """
+
+    def __init__(self, max_checkpoints_per_thread: int = 10, max_threads: int = 1000, **kwargs: Any):
+        if max_checkpoints_per_thread < 2:
+            # The latest checkpoint and its parent are needed to resume a thread
+            raise ValueError("max_checkpoints_per_thread must be at least 2")
+        if max_threads < 1:
+            raise ValueError("max_threads must be at least 1")
+        super().__init__(**kwargs)
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread
+        self.max_threads = max_threads
+        self.evicted_threads = 0
+        self._threads: OrderedDict[str, None] = OrderedDict()
+        # Per-thread indexes so trimming never scans other threads' data
+        self._thread_blobs: dict[str, set[tuple]] = {}
+        self._thread_writes: dict[str, set[tuple]] = {}
+        self._lock = threading.RLock()
+
+    def _touch(self, thread_id: str) -> None:
+        self._threads[thread_id] = None
+        self._threads.move_to_end(thread_id)
+
+    def _trim_thread(self, thread_id: str, checkpoint_ns: str) -> None:
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) <= self.max_checkpoints_per_thread:
+            return
+        # Checkpoint ids are time-ordered (uuid6), so sorting gives oldest first
+        for checkpoint_id in sorted(checkpoints)[: -self.max_checkpoints_per_thread]:
+            del checkpoints[checkpoint_id]
+            key = (thread_id, checkpoint_ns, checkpoint_id)
+            self.writes.pop(key, None)
+            self._thread_writes.get(thread_id, set()).discard(key)
+
+        live = set()
+        for saved_checkpoint, _, _ in checkpoints.values():
+            live.update(self.serde.loads_typed(saved_checkpoint)["channel_versions"].items())
+        blob_keys = self._thread_blobs.get(thread_id, set())
+        for key in [k for k in blob_keys if k[1] == checkpoint_ns and (k[2], k[3]) not in live]:
+            self.blobs.pop(key, None)
+            blob_keys.discard(key)
+
+    def _evict_idle_threads(self) -> None:
+        while len(self._threads) > self.max_threads:
+            thread_id, _ = self._threads.popitem(last=False)
+            self._drop_thread(thread_id)
+            self.evicted_threads += 1
+
+    def _drop_thread(self, thread_id: str) -> None:
+        self.storage.pop(thread_id, None)
+        for key in self._thread_writes.pop(thread_id, set()):
+            self.writes.pop(key, None)
+        for key in self._thread_blobs.pop(thread_id, set()):
+            self.blobs.pop(key, None)
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            if thread_id in self._threads:
+                self._touch(thread_id)
+            return super().get_tuple(config)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            self._thread_blobs.setdefault(thread_id, set()).update(
+                (thread_id, checkpoint_ns, channel, version) for channel, version in new_versions.items()
+            )
+            self._touch(thread_id)
+            self._trim_thread(thread_id, checkpoint_ns)
+            self._evict_idle_threads()
+            return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self._lock:
+            super().put_writes(config, writes, task_id, task_path)
+            configurable = config["configurable"]
+            self._thread_writes.setdefault(configurable["thread_id"], set()).add(
+                (configurable["thread_id"], configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"])
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._threads.pop(thread_id, None)
+            self._drop_thread(thread_id)
+
+
+def make_checkpointer(
+    backend: CheckpointerBackend = "memory",
+    *,
+    path: str = "checkpoints.sqlite",
+    max_checkpoints_per_thread: int = 10,
+    max_threads: int = 1000,
+) -> BaseCheckpointSaver:
+    """Create a checkpointer for the given backend.
+
+    memory:  unbounded MemorySaver (lost on restart).
+    bounded: BoundedMemorySaver with history limits and idle-thread eviction.
+    sqlite:  SqliteSaver persisted on disk at `path`.
+    """
+    if backend == "memory":
+        return InMemorySaver()
+    if backend == "bounded":
+        return BoundedMemorySaver(max_checkpoints_per_thread=max_checkpoints_per_thread, max_threads=max_threads)
+    if backend == "sqlite":
+        from langgraph.checkpoint.sqlite import SqliteSaver
+
+        return SqliteSaver(sqlite3.connect(path, check_same_thread=False))
+    raise ValueError(f"Unknown checkpointer backend: {backend}")
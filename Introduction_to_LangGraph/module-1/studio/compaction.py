@@ -0,0 +1,108 @@
+import logging
+from typing import Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AnyMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+    get_buffer_string,
+)
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.constants import TAG_NOSTREAM
+from langgraph.graph import MessagesState
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:"
+
+SUMMARY_PROMPT = """Summarise the earlier part of a conversation with a math assistant.
+List every question asked and its final numerical answer, one per line.
+Answer with the list only."""
+
+
+def _split_turns(messages: list[AnyMessage]) -> list[list[AnyMessage]]:
+    """Group messages into turns, each starting at a HumanMessage."""
+    turns: list[list[AnyMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def _is_tool_exchange(message: AnyMessage) -> bool:
+    return isinstance(message, ToolMessage) or (isinstance(message, AIMessage) and bool(message.tool_calls))
+
+
+class ConversationCompactor:
+    """Graph node that keeps a thread's prompt under a token budget.
+
+    Once the history exceeds `max_tokens`, the last `keep_last_turns` turns
+    stay exact and older turns are compacted: first their tool call/result
+    pairs are dropped (the question and final answer remain), then, if still
+    over budget, the older turns are replaced by one summary message
+    (`summarize=True`) or dropped oldest first.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 4000,
+        keep_last_turns: int = 2,
+        summarize: bool = False,
+        llm: Optional[BaseChatModel] = None,
+    ):
+        if keep_last_turns < 1:
+            raise ValueError("keep_last_turns must be at least 1")
+        self.max_tokens = max_tokens
+        self.keep_last_turns = keep_last_turns
+        self.summarize = summarize
+        self.llm = llm
+        self.compactions = 0
+        self.tokens_removed = 0
+
+    def _summarize(self, older: list[AnyMessage]) -> list[AnyMessage]:
+        if self.llm is None:
+            raise ValueError("summarize=True needs an llm")
+        response = self.llm.invoke(
+            [SystemMessage(content=SUMMARY_PROMPT), HumanMessage(content=get_buffer_string(older))],
+            config={"tags": [TAG_NOSTREAM]},
+        )
+        return [HumanMessage(content=f"{SUMMARY_PREFIX}\n{response.content}")]
+
+    def compact(self, messages: list[AnyMessage]) -> list[AnyMessage]:
+        """Return the compacted message list (unchanged if under budget)."""
+        if count_tokens_approximately(messages) <= self.max_tokens:
+            return messages
+
+        turns = _split_turns(messages)
+        older_turns, recent_turns = turns[: -self.keep_last_turns], turns[-self.keep_last_turns :]
+        recent = [m for turn in recent_turns for m in turn]
+
+        older = [m for turn in older_turns for m in turn if not _is_tool_exchange(m)]
+        if count_tokens_approximately(older + recent) <= self.max_tokens or not older:
+            return older + recent
+        if self.summarize:
+            return self._summarize(older) + recent
+
+        while older and count_tokens_approximately(older + recent) > self.max_tokens:
+            # Drop the oldest remaining turn (question + answer)
+            next_turn = next((i for i, m in enumerate(older[1:], 1) if isinstance(m, HumanMessage)), len(older))
+            older = older[next_turn:]
+        return older + recent
+
+    def __call__(self, state: MessagesState) -> dict:
+        messages = list(state["messages"])
+        compacted = self.compact(messages)
+        if len(compacted) == len(messages) and all(a is b for a, b in zip(compacted, messages)):
+            return {}
+
+        before, after = count_tokens_approximately(messages), count_tokens_approximately(compacted)
+        self.compactions += 1
+        self.tokens_removed += before - after
+        logger.info(f"Compacted thread history: {len(messages)} -> {len(compacted)} messages, ~{before} -> ~{after} tokens")
+        return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *compacted]}
@@ -0,0 +1,159 @@
+import ast
+import math
+import re
+import threading
+from typing import Callable, Literal, Optional, Union
+
+from graph_common.stats import percentile
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import MessagesState
+
+MAX_EXPRESSION_LENGTH = 200
+MAX_EXPONENT = 1000
+
+# Leading words people put in front of a bare expression ("calculate 3*3*3")
+_PREFIX_RE = re.compile(r"^\s*(?:please\s+)?(?:calculate|compute|evaluate|solve|what\s+is|what's)\s*:?\s*", re.IGNORECASE)
+_ALLOWED_CHARS_RE = re.compile(r"^[\d\s.+\-*/^()a-z,]*$")
+
+_BINARY_TOOLS = {ast.Add: "add", ast.Sub: "subtract", ast.Mult: "multiply", ast.Div: "divide", ast.Pow: "power"}
+_FUNCTION_TOOLS = ("sqrt", "log")
+
+Path = Literal["fast", "llm"]
+
+
+class NotArithmetic(ValueError):
+    """The text is not a pure arithmetic expression the evaluator can handle."""
+
+
+class ArithmeticEvaluator:
+    """Safe AST evaluator that computes arithmetic with the agent's own math tools.
+
+    Only numbers, + - * / ** (or ^), unary minus, parentheses and calls to
+    sqrt()/log() are accepted, and only when the matching tool is present.
+    A bare number ("2", "what is 5?", "-3") is not a calculation and is left
+    to the LLM.
+    """
+
+    def __init__(self, tools: list[Callable]):
+        self.tools = {tool.__name__: tool for tool in tools}
+
+    def extract_expression(self, text: str) -> Optional[str]:
+        expression = _PREFIX_RE.sub("", text.strip()).rstrip(" ?.=").replace("^", "**").replace("×", "*")
+        if not expression or len(expression) > MAX_EXPRESSION_LENGTH:
+            return None
+        if not _ALLOWED_CHARS_RE.match(expression.lower()) or not re.search(r"\d", expression):
+            return None
+        return expression
+
+    def _tool(self, name: str) -> Callable:
+        if name not in self.tools:
+            raise NotArithmetic(f"tool {name!r} not available")
+        return self.tools[name]
+
+    def _eval(self, node: ast.AST) -> float:
+        if isinstance(node, ast.Expression):
+            return self._eval(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return float(node.value)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+            value = self._eval(node.operand)
+            return -value if isinstance(node.op, ast.USub) else value
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_TOOLS:
+            left, right = self._eval(node.left), self._eval(node.right)
+            if isinstance(node.op, ast.Pow) and abs(right) > MAX_EXPONENT:
+                raise NotArithmetic("exponent too large")
+            return self._tool(_BINARY_TOOLS[type(node.op)])(left, right)
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in _FUNCTION_TOOLS
+            and len(node.args) == 1
+            and not node.keywords
+        ):
+            return self._tool(node.func.id)(self._eval(node.args[0]))
+        raise NotArithmetic(f"unsupported syntax: {type(node).__name__}")
+
+    @staticmethod
+    def _computes(tree: ast.AST) -> bool:
+        """True if the expression has a binary operator or a sqrt()/log() call."""
+        return any(isinstance(node, (ast.BinOp, ast.Call)) for node in ast.walk(tree))
+
+    def evaluate(self, text: str) -> Optional[float]:
+        """Evaluate `text` if it is pure arithmetic, else return None."""
+        expression = self.extract_expression(text)
+        if expression is None:
+            return None
+        try:
+            tree = ast.parse(expression, mode="eval")
+            if not self._computes(tree):
+                return None
+            result = self._eval(tree)
+        except (SyntaxError, NotArithmetic, ArithmeticError, ValueError, TypeError):
+            # Invalid input or math errors (1/0, log(-1)) are left to the LLM to explain
+            return None
+        if isinstance(result, complex) or math.isnan(result) or math.isinf(result):
+            return None
+        return result
+
+
+def format_number(value: float) -> str:
+    return str(int(value)) if value.is_integer() and abs(value) < 1e15 else f"{value:.10g}"
+
+
+class PathStats:
+    """Request counts and latencies for the fast path vs. the LLM path."""
+
+    def __init__(self):
+        self._latencies: dict[Path, list[float]] = {"fast": [], "llm": []}
+        self._lock = threading.Lock()
+
+    def record(self, path: Path, seconds: float) -> None:
+        with self._lock:
+            self._latencies[path].append(seconds)
+
+    def report(self) -> dict[str, Union[int, float, dict[str, float]]]:
+        with self._lock:
+            fast, llm = list(self._latencies["fast"]), list(self._latencies["llm"])
+        total = len(fast) + len(llm)
+        report: dict[str, Union[int, float, dict[str, float]]] = {
+            "requests": total,
+            "fast_path_fraction": len(fast) / total if total else 0.0,
+        }
+        for path, values in (("fast", fast), ("llm", llm)):
+            report[path] = {f"p{p}_ms": percentile(values, p) * 1000 for p in (50, 95, 99)}
+        return report
+
+
+class FastPathNode:
+    """Pre-router node: answers pure arithmetic locally, otherwise does nothing."""
+
+    def __init__(self, tools: list[Callable]):
+        self.evaluator = ArithmeticEvaluator(tools)
+
+    def __call__(self, state: MessagesState) -> dict:
+        last = state["messages"][-1] if state["messages"] else None
+        if not isinstance(last, HumanMessage) or not isinstance(last.content, str):
+            return {}
+        result = self.evaluator.evaluate(last.content)
+        if result is None:
+            return {}
+        expression = self.evaluator.extract_expression(last.content)
+        return {
+            "messages": [
+                AIMessage(
+                    content=f"{expression} = {format_number(result)}",
+                    response_metadata={"fast_path": True},
+                )
+            ]
+        }
+
+
+def served_by_fast_path(state: MessagesState) -> bool:
+    """True if the latest message is a fast-path answer."""
+    messages = state.get("messages") or []
+    return bool(messages) and isinstance(messages[-1], AIMessage) and bool(messages[-1].response_metadata.get("fast_path"))
+
+
+def route_fast_path(state: MessagesState) -> Literal["answered", "llm"]:
+    """Finish if the fast path answered, otherwise continue to the LLM."""
+    return "answered" if served_by_fast_path(state) else "llm"
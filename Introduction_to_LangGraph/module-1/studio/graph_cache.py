@@ -0,0 +1,64 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Hashable, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class GraphCache:
+    """Process-wide LRU of built agent parts (compiled graph, tool-bound model, ...).
+
+    Agents look their parts up by a configuration key and build them only on
+    a miss, so creating an agent per request costs a dictionary lookup.
+    Keys may contain `id()`s of models or limiters: the cached value must
+    hold references to those objects so the ids stay unique while the entry
+    lives. Builds run under one lock, so a key is never built twice.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], T]) -> T:
+        with self._lock:
+            if key in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._misses += 1
+            value = self._entries[key] = build()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "size": len(self._entries)}
+
+
+@lru_cache(maxsize=1)
+def shared_graph_cache() -> GraphCache:
+    """The GraphCache shared by every agent in the process."""
+    return GraphCache()
+
+
+def resolve_graph_cache(option: Union[bool, GraphCache]) -> Optional[GraphCache]:
+    """True = the shared cache, False = build every agent from scratch, or a given cache."""
+    if isinstance(option, GraphCache):
+        return option
+    return shared_graph_cache() if option else None
+
+
+def get_or_build(cache: Optional[GraphCache], key: Hashable, build: Callable[[], T]) -> T:
+    """`build()` through `cache`, or directly when caching is off."""
+    return build() if cache is None else cache.get_or_build(key, build)
@@ -0,0 +1,49 @@
+import os
+from functools import lru_cache
+from typing import Optional
+
+from graph_common.model_profiles import ModelProfile, ProfileRegistry
+from langchain_core.language_models.chat_models import BaseChatModel
+
+
+def get_google_api_key() -> str:
+    """Read GOOGLE_API_KEY when a model is actually built, not at import."""
+    api_key = os.environ.get("GOOGLE_API_KEY")
+    if not api_key:
+        raise EnvironmentError("GOOGLE_API_KEY is not set")
+    return api_key
+
+
+# Gemini list prices (paid tier, text); a lighter model for routing/summaries
+# answers in a fraction of the latency and cost
+MODEL_PROFILES: dict[str, ModelProfile] = {
+    "flash": {"model": "gemini-2.5-flash", "temperature": 0.0, "input_cost": 0.30, "output_cost": 2.50},
+    "flash-lite": {"model": "gemini-2.5-flash-lite", "temperature": 0.0, "input_cost": 0.10, "output_cost": 0.40},
+    "pro": {"model": "gemini-2.5-pro", "temperature": 0.0, "input_cost": 1.25, "output_cost": 10.00},
+}
+
+
+@lru_cache(maxsize=32)
+def build_chat_model(model: str, temperature: float = 0.0, max_retries: Optional[int] = None) -> BaseChatModel:
+    """Gemini chat model; `max_retries=0` when a RateLimiter owns retries (429s, 5xx, timeouts).
+
+    One instance per configuration is shared by every agent, which lets
+    agents share their cached graphs (see graph_cache.py).
+    """
+    # Imported here so importing this module stays cheap
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        google_api_key=get_google_api_key(),
+        model=model,
+        temperature=temperature,
+        **({"max_retries": max_retries} if max_retries is not None else {}),
+    )
+
+
+def build_profile_model(profile: ModelProfile, max_retries: Optional[int] = None) -> BaseChatModel:
+    """Chat model for a profile of MODEL_PROFILES."""
+    return build_chat_model(profile["model"], profile["temperature"], max_retries=max_retries)
+
+
+PROFILES = ProfileRegistry(MODEL_PROFILES, build_profile_model)
@@ -0,0 +1,296 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable, Optional, TypeVar, Union
+
+import httpx
+from graph_common.stats import percentile
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.runnables import Runnable
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# Server-side failures worth retrying: timeout, internal error, bad gateway, unavailable
+TRANSIENT_STATUS_CODES = frozenset({408, 500, 502, 503, 504})
+
+
+class RateLimitExceeded(RuntimeError):
+    """The upstream kept answering 429 after all retries."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `per_minute` units per minute.
+
+    `acquire` reserves its amount immediately (the level may go negative)
+    and sleeps until the reservation is covered, so waiters are served in
+    arrival order and a large request cannot be starved by small ones.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` and return how long the caller must wait before using it."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._level -= amount
+            return max(0.0, -self._level / self.rate)
+
+    def acquire(self, amount: float = 1.0) -> float:
+        wait = self.reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def adjust(self, amount: float) -> None:
+        """Correct an earlier reservation (positive = used more than reserved)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._level = min(self.capacity, self._level - amount)
+
+
+class AIMDController:
+    """Concurrency limit with additive increase / multiplicative decrease.
+
+    Each success raises the limit by `increase / limit` (about +`increase`
+    per window of `limit` calls); each throttled call multiplies it by
+    `decrease`. Callers block in `acquire` while `limit` calls are in flight.
+    """
+
+    def __init__(
+        self,
+        initial: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.limit = float(initial)
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.waiting -= 1
+            self.in_flight += 1
+
+    def release(self, throttled: bool = False) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+            else:
+                self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+            self._cond.notify_all()
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """True for HTTP 429 / quota errors from Gemini, httpx or similar clients."""
+    for obj in (error, getattr(error, "response", None)):
+        if getattr(obj, "status_code", None) == 429 or getattr(obj, "code", None) == 429:
+            return True
+    text = str(error).lower()
+    return "429" in text or "resource_exhausted" in text or "rate limit" in text
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    for obj in (error, getattr(error, "response", None)):
+        for name in ("status_code", "code"):
+            value = getattr(obj, name, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def is_transient(error: BaseException) -> bool:
+    """True for timeouts, dropped connections and 5xx answers, which usually pass on retry."""
+    # httpx.TransportError covers connect/read timeouts and reset connections
+    if isinstance(error, (TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    if _status_code(error) in TRANSIENT_STATUS_CODES:
+        return True
+    text = str(error).lower()
+    return "unavailable" in text or "deadline_exceeded" in text
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Process-wide scheduler for model calls: RPM/TPM buckets, AIMD concurrency, retries.
+
+    Every call first waits for a concurrency slot, then for one request
+    from the RPM bucket and its estimated tokens from the TPM bucket. A 429
+    halves the concurrency limit and is retried with full-jitter exponential
+    backoff (or the server's Retry-After); transient errors (timeouts,
+    connection resets, 5xx) are retried with the same backoff. The token
+    reservation is corrected with the response's usage metadata when there
+    is one.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = 16,
+        initial_concurrency: int = 4,
+        max_retries: int = 6,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        expected_output_tokens: int = 256,
+        request_burst: Optional[float] = None,
+    ):
+        # request_burst caps back-to-back requests (default: a full minute's quota)
+        self.rpm = TokenBucket(requests_per_minute, capacity=request_burst) if requests_per_minute else None
+        self.tpm = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AIMDController(initial=min(initial_concurrency, max_concurrency), max_limit=max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.expected_output_tokens = expected_output_tokens
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=10_000)  # recent admission waits
+        self._counters = {"calls": 0, "succeeded": 0, "failed": 0, "throttled": 0, "transient": 0, "retries": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        delay = _retry_after(error)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        return delay
+
+    def _admit(self, tokens: int) -> None:
+        """Block until a concurrency slot and the RPM/TPM budget are available."""
+        start = time.perf_counter()
+        self.concurrency.acquire()
+        if self.rpm is not None:
+            self.rpm.acquire(1)
+        if self.tpm is not None:
+            self.tpm.acquire(tokens)
+        with self._lock:
+            self._waits.append(time.perf_counter() - start)
+
+    def call(self, fn: Callable[[], T], estimated_tokens: int = 0) -> T:
+        """Run `fn` under the limits, retrying rate-limit and transient errors."""
+        self._count("calls")
+        attempt = 0
+        while True:
+            self._admit(estimated_tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                throttled = is_rate_limited(e)
+                self.concurrency.release(throttled=throttled)
+                if not throttled and not is_transient(e):
+                    self._count("failed")
+                    raise
+                self._count("throttled" if throttled else "transient")
+                if attempt == self.max_retries:
+                    self._count("failed")
+                    if not throttled:
+                        raise
+                    raise RateLimitExceeded(f"still rate limited after {self.max_retries} retries: {e}") from e
+                delay = self._backoff(attempt, e)
+                reason = "Rate limited" if throttled else f"Transient error ({type(e).__name__})"
+                logger.warning(f"{reason} (attempt {attempt + 1}), retrying in {delay:.2f}s")
+                self._count("retries")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self.concurrency.release()
+            self._count("succeeded")
+            if self.tpm is not None:
+                usage = getattr(result, "usage_metadata", None) or {}
+                if usage.get("total_tokens"):
+                    self.tpm.adjust(usage["total_tokens"] - estimated_tokens)
+            return result
+
+    def invoke(self, runnable: Runnable, messages: list[BaseMessage], **kwargs: Any) -> AIMessage:
+        """`runnable.invoke(messages)` under the limits, with a token estimate for TPM."""
+        estimated = count_tokens_approximately(messages) + self.expected_output_tokens
+        return self.call(lambda: runnable.invoke(messages, **kwargs), estimated_tokens=estimated)
+
+    def stats(self) -> dict[str, Any]:
+        """Counters, current queue depth and concurrency limit, and admission wait percentiles."""
+        with self._lock:
+            waits = list(self._waits)
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "queue_depth": self.concurrency.waiting,
+            "max_queue_depth": self.concurrency.max_waiting,
+            "in_flight": self.concurrency.in_flight,
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "wait_p50_ms": percentile(waits, 50) * 1000,
+            "wait_p95_ms": percentile(waits, 95) * 1000,
+            "wait_max_ms": max(waits, default=0.0) * 1000,
+        }
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.environ.get(name)
+    return float(value) if value else None
+
+
+@lru_cache(maxsize=1)
+def shared_rate_limiter() -> RateLimiter:
+    """The RateLimiter shared by every agent in the process.
+
+    Limits come from GEMINI_RPM, GEMINI_TPM and GEMINI_MAX_CONCURRENCY
+    (unset = no RPM/TPM limit, 16 concurrent calls).
+    """
+    return RateLimiter(
+        requests_per_minute=_env_float("GEMINI_RPM"),
+        tokens_per_minute=_env_float("GEMINI_TPM"),
+        max_concurrency=int(_env_float("GEMINI_MAX_CONCURRENCY") or 16),
+    )
+
+
+def resolve_rate_limiter(option: Union[bool, RateLimiter, None], builds_own_client: bool) -> Optional[RateLimiter]:
+    """Map an agent's `rate_limiter` argument to a limiter.
+
+    None means: the shared limiter if the agent talks to Gemini itself,
+    nothing for an injected model (fakes, local models).
+    """
+    if isinstance(option, RateLimiter):
+        return option
+    if option is None:
+        option = builds_own_client
+    return shared_rate_limiter() if option else None
@@ -1,24 +1,25 @@
-import os
-
 from dotenv import load_dotenv
 
 load_dotenv()
 
-GOOGLE_API_KEY = os.environ["GOOGLE_API_KEY"]
-
-if not GOOGLE_API_KEY:
-    raise EnvironmentError("GOOGLE_API_KEY is not set")
-
-from typing import Callable
+from functools import lru_cache, partial
+from typing import Callable, Mapping, Optional, Union
 
-from IPython.display import Image, display
+from graph_common.instrumentation import InstrumentationHandler
+from graph_common.model_profiles import NodeModel, builds_profile_models
+from graph_common.single_flight import SingleFlight, model_config_key, request_key, resolve_single_flight
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import AnyMessage, HumanMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.runnables import Runnable
 from langgraph.graph import END, START, MessagesState, StateGraph
 from langgraph.prebuilt import ToolNode, tools_condition
 from langsmith import traceable
 from typing_extensions import TypedDict
 
+from graph_cache import GraphCache, get_or_build, resolve_graph_cache
+from model_profiles import PROFILES, build_chat_model
+from rate_limit import RateLimiter, resolve_rate_limiter
+
 
 def multiply(a: float, b: float) -> float:
 
@@ -34,37 +35,123 @@ class MessagesState(MessagesState):
     # Add any keys needed beyond messages, which is pre-built
     pass
 
+def agent_node(
+    state: MessagesState,
+    llm_with_tools: Runnable,
+    rate_limiter: Optional[RateLimiter],
+    single_flight: Optional[SingleFlight],
+    scope: str,
+):
+    """LLM decides: respond directly or call tool.
+
+    Concurrent calls with the same `scope` (model settings and tools) and
+    messages share one model request through `single_flight`.
+    """
+    messages = state["messages"]
+    if rate_limiter is None:
+        call = lambda: llm_with_tools.invoke(messages)
+    else:
+        call = lambda: rate_limiter.invoke(llm_with_tools, messages)
+    if single_flight is None:
+        return {"messages": [call()]}
+    return {"messages": [single_flight.do(request_key(scope, messages), call)]}
+
 class RouterAgent:
+
+    # Nodes that call a model; each can get its own model through `node_models`
+    MODEL_NODES = ("agent",)
+
     def __init__(self,
                  Model_name: str="gemini-2.5-flash",
                  tools: list[Callable]=[multiply],
-                 temperature: float=0.0):
-        """Initialize router agent with LLM and tools."""
-        self.builder = StateGraph(MessagesState)
+                 temperature: float=0.0,
+                 llm: Optional[BaseChatModel]=None,
+                 instrumentation: Optional[InstrumentationHandler]=None,
+                 single_flight: Union[bool, SingleFlight]=True,
+                 rate_limiter: Union[bool, RateLimiter, None]=None,
+                 node_models: Optional[Mapping[str, NodeModel]]=None,
+                 graph_cache: Union[bool, GraphCache]=True):
+        """Initialize router agent with LLM and tools.
+
+        `llm` replaces the Gemini model (e.g. a fake model in benchmarks).
+        `instrumentation` records per-node timing and token metrics.
+        `single_flight` makes concurrent identical model calls (same model
+        settings, tools and messages) share one request, also when the graph
+        is served from langgraph.json (True = the process-wide SingleFlight,
+        False = off, or a given instance).
+        `rate_limiter` schedules model calls under RPM/TPM limits with retries
+        on 429 (default: the process-wide limiter when Gemini is used).
+        `node_models` maps "agent" to a model_profiles profile name (e.g.
+        "flash-lite": the node only decides between a tool call and a direct
+        reply) or a model instance; unlisted nodes use `llm` / `Model_name`.
+        `graph_cache` reuses the tool-bound model and compiled graph of an
+        earlier agent with the same models, tools and rate limiter (True =
+        shared GraphCache, False = build per instance, or a given cache);
+        such agents share their graph nodes. Models are matched by identity,
+        so agents that each build a new `llm` never hit the cache.
+        """
         self.tools = tools
-        self._setup_model(Model_name, temperature)
-        self._setup_nodes()
-        self._setup_edges()
-        self.graph = self.builder.compile()
-
-
-    def _setup_model(self, model_name: str, temperature: float):
-        """Setup model"""
-        self.llm = ChatGoogleGenerativeAI(
-            google_api_key=GOOGLE_API_KEY,
-            model=model_name,
-            temperature=temperature
+        self.single_flight = resolve_single_flight(single_flight)
+        self.rate_limiter = resolve_rate_limiter(
+            rate_limiter, builds_own_client=llm is None or builds_profile_models(node_models)
+        )
+        self._setup_model(Model_name, temperature, llm, node_models)
+        parts = get_or_build(resolve_graph_cache(graph_cache), self._graph_key(), self._build_graph)
+        self.builder, self.llm_with_tools, self.graph = parts["builder"], parts["llm_with_tools"], parts["graph"]
+        if instrumentation is not None:
+            self.graph = self.graph.with_config(callbacks=[instrumentation])
+
+
+    def _setup_model(
+        self,
+        model_name: str,
+        temperature: float,
+        llm: Optional[BaseChatModel] = None,
+        node_models: Optional[Mapping[str, NodeModel]] = None,
+    ):
+        """Setup the default model and the model of each node"""
+        # The RateLimiter owns retries (429s and transient errors) and backoff when there is one
+        max_retries = 0 if self.rate_limiter is not None else None
+        if llm is None:
+            llm = build_chat_model(model_name, temperature, max_retries=max_retries)
+        self.llm = llm
+        self.node_llms = PROFILES.resolve_node_models(node_models, self.MODEL_NODES, llm, max_retries=max_retries)
+
+    def _graph_key(self) -> tuple:
+        """What the compiled graph depends on; the cached parts keep these objects alive."""
+        return (
+            type(self),
+            id(self.node_llms["agent"]),
+            tuple(map(id, self.tools)),
+            id(self.rate_limiter),
+            id(self.single_flight),
         )
-        self.llm_with_tools = self.llm.bind_tools(self.tools)
-
 
-    def _agent_node(self, state: MessagesState):
-        """LLM decides: respond directly or call tool."""
-        return {"messages": [self.llm_with_tools.invoke(state["messages"])]}
+    def _build_graph(self) -> dict:
+        """Bind the tools and compile the graph (skipped on a graph cache hit)."""
+        self.llm_with_tools = self.node_llms["agent"].bind_tools(self.tools)
+        self.builder = StateGraph(MessagesState)
+        self._setup_nodes()
+        self._setup_edges()
+        return {
+            "builder": self.builder,
+            "llm_with_tools": self.llm_with_tools,
+            "graph": self.builder.compile(),
+            "tools": tuple(self.tools),
+            "rate_limiter": self.rate_limiter,
+            "single_flight": self.single_flight,
+        }
 
     def _setup_nodes(self):
         """Register all nodes"""
-        self.builder.add_node("agent", self._agent_node)
+        # Not a bound method: the cached graph must not keep this agent alive
+        self.builder.add_node("agent", partial(
+            agent_node,
+            llm_with_tools=self.llm_with_tools,
+            rate_limiter=self.rate_limiter,
+            single_flight=self.single_flight,
+            scope=request_key("router", model_config_key(self.node_llms["agent"]), [tool.__name__ for tool in self.tools]),
+        ))
         self.builder.add_node("tools", ToolNode(self.tools))
 
     def _setup_edges(self):
@@ -75,8 +162,7 @@ class RouterAgent:
 
 
     def invoke(self, messages: list[AnyMessage]):
-        return self.graph.invoke({"messages": messages},
-                                 )
+        return self.graph.invoke({"messages": messages})
 
     def stream(self, messages: list[AnyMessage]):
         return self.graph.stream({"messages": messages},
@@ -84,6 +170,8 @@ class RouterAgent:
 
     def show(self, filename: str = "graph_diagram.png"):
         """Display Mermaid diagram and save it as a PNG file."""
+        from IPython.display import Image, display
+
         png_data = self.graph.get_graph().draw_mermaid_png()
         # Save PNG to disk
         with open(filename, "wb") as f:
@@ -91,7 +179,16 @@ class RouterAgent:
         display(Image(png_data))
         print(f"Diagram saved as {filename}")
 
-graph = RouterAgent().graph
+@lru_cache(maxsize=1)
+def make_graph():
+    """Build the studio graph once, on first use."""
+    return RouterAgent().graph
+
+def __getattr__(name: str):
+    # `graph` (referenced from langgraph.json) is built lazily on first access
+    if name == "graph":
+        return make_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @traceable(name="RouterAgent")
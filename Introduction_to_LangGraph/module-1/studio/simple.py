@@ -1,10 +1,12 @@
 import random
-from typing import Literal
+from functools import lru_cache
+from typing import Literal, Union
 
-from IPython.display import Image, display
 from langgraph.graph import END, START, StateGraph
 from typing_extensions import TypedDict
 
+from graph_cache import GraphCache, get_or_build, resolve_graph_cache
+
 
 # 1. State Schema (separate class)
 class SimpleState(TypedDict):
@@ -31,11 +33,18 @@ def decide_mood(state: SimpleState) -> Literal["node_2", "node_3"]:
     return "node_2" if random.random() < 0.5 else "node_3"
 
 class SimpleMoodGraph:
-    def __init__(self):
+    def __init__(self, graph_cache: Union[bool, GraphCache] = True):
+        """`graph_cache` reuses the compiled graph across instances (True =
+        shared GraphCache, False = compile per instance, or a given cache).
+        """
+        self.builder, self.graph = get_or_build(resolve_graph_cache(graph_cache), (type(self),), self._build_graph)
+
+    def _build_graph(self):
+        """Build and compile the graph (skipped on a graph cache hit)."""
         self.builder = StateGraph(SimpleState)
         self._setup_nodes()
         self._setup_edges()
-        self.graph = self.builder.compile()
+        return self.builder, self.builder.compile()
 
     def _setup_nodes(self):
         """Register all nodes"""
@@ -61,8 +70,21 @@ class SimpleMoodGraph:
 
     def show(self):
         """Display Mermaid diagram"""
+        from IPython.display import Image, display
+
         display(Image(self.graph.get_graph().draw_mermaid_png()))
-graph = SimpleMoodGraph().graph
+
+@lru_cache(maxsize=1)
+def make_graph():
+    """Build the studio graph once, on first use."""
+    return SimpleMoodGraph().graph
+
+def __getattr__(name: str):
+    # `graph` (referenced from langgraph.json) is built lazily on first access
+    if name == "graph":
+        return make_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # Usage
 if __name__ == "__main__":
     graph = SimpleMoodGraph()
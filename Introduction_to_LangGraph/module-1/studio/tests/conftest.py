@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+STUDIO_DIR = Path(__file__).resolve().parents[1]
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+# The studio modules are imported flat, as langgraph.json loads them; this
+# suite also covers the shared graph_common helpers and runs the agents on
+# the benchmarks' fake models (bench_workers is a worker pool factory)
+for path in (REPO_ROOT / "projects/graph_benchmarks", REPO_ROOT / "projects/graph_common", STUDIO_DIR):
+    sys.path.insert(0, str(path))
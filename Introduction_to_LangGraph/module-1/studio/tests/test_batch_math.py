@@ -0,0 +1,47 @@
+import math
+
+import pytest
+
+from agent import SCALAR_MATH_TOOLS
+from batch_math import BATCH_MATH_TOOLS, MAX_BATCH_ROWS, divide_batch, log_batch, multiply_batch, power_batch, sqrt_batch
+
+SCALAR = {tool.__name__: tool for tool in SCALAR_MATH_TOOLS}
+A = [3.0, -2.0, 0.5, 10.0]
+B = [2.0, 4.0, -1.5, 3.0]
+
+
+@pytest.mark.parametrize("batch", [tool for tool in BATCH_MATH_TOOLS if tool.__name__.removesuffix("_batch") in SCALAR])
+def test_batch_tools_match_their_scalar_tool_row_by_row(batch):
+    scalar = SCALAR[batch.__name__.removesuffix("_batch")]
+    rows = [abs(a) for a in A] if batch.__name__ in ("sqrt_batch", "log_batch") else A
+    two_args = batch.__name__ not in ("sqrt_batch", "log_batch")
+
+    result = batch(rows, B) if two_args else batch(rows)
+
+    expected = [scalar(a, b) if two_args else scalar(a) for a, b in zip(rows, B)]
+    assert result == {"values": pytest.approx(expected), "errors": []}
+
+
+def test_one_element_columns_apply_to_every_row():
+    assert multiply_batch([1.0, 2.0, 3.0], [10.0])["values"] == [10.0, 20.0, 30.0]
+
+
+def test_failing_rows_are_reported_without_failing_the_batch():
+    assert divide_batch([1.0, 2.0, 3.0], [1.0, 0.0, 2.0]) == {
+        "values": [1.0, None, 1.5],
+        "errors": [{"index": 1, "error": "division by zero"}],
+    }
+    assert sqrt_batch([4.0, -1.0])["errors"] == [{"index": 1, "error": "square root of a negative number"}]
+    assert log_batch([math.e, 0.0])["errors"] == [{"index": 1, "error": "math domain error"}]
+    assert [e["error"] for e in power_batch([0.0, -8.0, 10.0], [-1.0, 0.5, 400.0])["errors"]] == [
+        "zero to a negative power",
+        "negative base with a fractional exponent",
+        "result is not a finite number",
+    ]
+
+
+def test_mismatched_or_oversized_columns_are_rejected():
+    with pytest.raises(ValueError, match="same length"):
+        multiply_batch([1.0, 2.0], [1.0, 2.0, 3.0])
+    with pytest.raises(ValueError, match="at most"):
+        multiply_batch([1.0] * (MAX_BATCH_ROWS + 1), [2.0])
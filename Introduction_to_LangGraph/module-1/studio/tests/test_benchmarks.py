@@ -0,0 +1,56 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from fake_models import FakeChatModel
+from langchain_core.messages import AIMessageChunk, HumanMessage, ToolMessage
+
+from agent import MATH_TOOLS
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+
+def test_fake_model_plays_a_scripted_react_turn():
+    llm = FakeChatModel(latency=0.0, output_tokens=4, tool_calls_per_turn=2).bind_tools(MATH_TOOLS[:2])
+    question = [HumanMessage(content="3 * 4 + 1?")]
+
+    call = llm.invoke(question)
+    answer = llm.invoke(question + [call] + [ToolMessage(content="2", tool_call_id=tc["id"]) for tc in call.tool_calls])
+
+    assert [(tc["name"], tc["args"]) for tc in call.tool_calls] == [
+        ("multiply", {"a": 2.0, "b": 2.0}),
+        ("add", {"a": 2.0, "b": 2.0}),
+    ]
+    assert not answer.tool_calls and answer.content.endswith("token token token token")
+    assert answer.usage_metadata["output_tokens"] == 4
+
+
+def test_fake_model_streams_the_same_answer_and_usage():
+    llm = FakeChatModel(latency=0.0, output_tokens=6)
+    prompt = [HumanMessage(content="Write a post")]
+
+    chunks = list(llm.stream(prompt))
+    message = sum(chunks[1:], chunks[0])
+
+    assert isinstance(message, AIMessageChunk) and len(chunks) > 6
+    assert message.content == llm.invoke(prompt).content
+    assert message.usage_metadata["output_tokens"] == 6
+
+
+def test_graph_benchmark_runs_every_graph_offline(tmp_path):
+    output = tmp_path / "results.json"
+    subprocess.run(
+        [
+            sys.executable, str(REPO_ROOT / "projects/graph_benchmarks/bench_graphs.py"),
+            "--runs", "2", "--concurrency", "2", "--memory-runs", "1", "--latency", "0", "--output", str(output),
+        ],
+        capture_output=True,
+        check=True,
+        cwd=REPO_ROOT,
+    )
+
+    results = json.loads(output.read_text())["results"]
+    assert set(results) == {"reflection", "router", "react", "simple"}
+    assert all(result["runs"] == 2 and result["nodes"] for result in results.values())
+    assert {"generate_post", "critique_post"} <= set(results["reflection"]["nodes"])
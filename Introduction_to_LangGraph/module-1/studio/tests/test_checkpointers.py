@@ -0,0 +1,51 @@
+import operator
+from typing import Annotated
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+from typing_extensions import TypedDict
+
+from checkpointers import BoundedMemorySaver
+
+
+class CounterState(TypedDict):
+    count: Annotated[int, operator.add]
+
+
+def counter_graph(checkpointer: BoundedMemorySaver):
+    builder = StateGraph(CounterState)
+    builder.add_node("increment", lambda state: {"count": 1})
+    builder.add_edge(START, "increment")
+    builder.add_edge("increment", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def thread(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_thread_history_is_trimmed_but_state_is_kept():
+    saver, unbounded = BoundedMemorySaver(max_checkpoints_per_thread=3), InMemorySaver()
+    for checkpointer in (saver, unbounded):
+        graph = counter_graph(checkpointer)
+        for _ in range(5):
+            result = graph.invoke({"count": 0}, thread("t"))
+
+    assert result["count"] == 5
+    assert len(saver.storage["t"][""]) == 3
+    assert {key[1:3] for key in saver.writes} <= {("", checkpoint_id) for checkpoint_id in saver.storage["t"][""]}
+    assert len(saver.blobs) < len(unbounded.blobs)
+
+
+def test_least_recently_used_thread_is_evicted():
+    saver = BoundedMemorySaver(max_threads=2)
+    graph = counter_graph(saver)
+    graph.invoke({"count": 0}, thread("a"))
+    graph.invoke({"count": 0}, thread("b"))
+    graph.get_state(thread("a"))  # reading "a" makes "b" the least recently used
+    graph.invoke({"count": 0}, thread("c"))
+
+    assert saver.evicted_threads == 1
+    assert saver.get_tuple(thread("b")) is None
+    assert graph.get_state(thread("a")).values["count"] == 1
+    assert not any(key[0] == "b" for key in saver.blobs)
@@ -0,0 +1,83 @@
+import pytest
+from fake_models import FakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.graph.message import add_messages
+
+from compaction import SUMMARY_PREFIX, ConversationCompactor
+
+
+def turn(i, filler=""):
+    return [
+        HumanMessage(content=f"question {i} {filler}"),
+        AIMessage(content="", tool_calls=[{"name": "add", "args": {"a": i, "b": i}, "id": f"call-{i}"}]),
+        ToolMessage(content=str(2 * i), tool_call_id=f"call-{i}"),
+        AIMessage(content=f"answer {i}"),
+    ]
+
+
+def thread(turns, filler=""):
+    return [message for i in range(turns) for message in turn(i, filler)]
+
+
+def contents(messages):
+    return [message.content for message in messages]
+
+
+def test_history_under_budget_is_left_alone():
+    compactor = ConversationCompactor(max_tokens=10_000)
+    messages = thread(3)
+
+    assert compactor.compact(messages) is messages
+    assert compactor({"messages": messages}) == {} and compactor.compactions == 0
+
+
+def test_older_tool_exchanges_are_dropped_first():
+    messages = thread(4)
+    budget = count_tokens_approximately(messages) - 1
+    compactor = ConversationCompactor(max_tokens=budget, keep_last_turns=2)
+
+    compacted = compactor.compact(messages)
+
+    assert contents(compacted[:4]) == ["question 0 ", "answer 0", "question 1 ", "answer 1"]
+    assert compacted[4:] == messages[8:]
+
+
+def test_oldest_turns_are_dropped_until_under_budget():
+    messages = thread(6, filler="x " * 200)
+    compactor = ConversationCompactor(max_tokens=count_tokens_approximately(thread(3, filler="x " * 200)))
+
+    compacted = compactor.compact(messages)
+
+    assert count_tokens_approximately(compacted) <= compactor.max_tokens
+    assert compacted[-8:] == messages[-8:]
+    assert isinstance(compacted[0], HumanMessage) and "question 0" not in compacted[0].content
+
+
+def test_older_turns_can_be_replaced_by_a_summary():
+    messages = thread(6, filler="x " * 200)
+    llm = FakeChatModel(latency=0.0, output_tokens=3, response_prefix="")
+    compactor = ConversationCompactor(max_tokens=300, summarize=True, llm=llm)
+
+    compacted = compactor.compact(messages)
+
+    assert compacted[0].content == f"{SUMMARY_PREFIX}\ntoken token token"
+    assert compacted[1:] == messages[-8:]
+
+
+def test_summarize_needs_a_model():
+    compactor = ConversationCompactor(max_tokens=10, summarize=True)
+
+    with pytest.raises(ValueError, match="llm"):
+        compactor.compact(thread(4, filler="x " * 50))
+
+
+def test_node_update_replaces_the_thread_history():
+    messages = add_messages([], thread(4))
+    compactor = ConversationCompactor(max_tokens=count_tokens_approximately(messages) - 1)
+
+    update = compactor({"messages": messages})
+    history = add_messages(messages, update["messages"])
+
+    assert contents(history) == contents(compactor.compact(messages))
+    assert compactor.compactions == 1 and compactor.tokens_removed > 0
@@ -0,0 +1,63 @@
+import pytest
+from fake_models import FakeChatModel
+from langchain_core.messages import HumanMessage
+from test_single_flight import CallCounter
+
+from agent import MATH_TOOLS, ReActAgent
+from fast_math import ArithmeticEvaluator
+
+
+@pytest.mark.parametrize("text", ["2", "what is 5?", "-3", "(7)", "calculate +4.5"])
+def test_bare_numbers_are_left_to_the_llm(text):
+    assert ArithmeticEvaluator(MATH_TOOLS).evaluate(text) is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("calculate 3*3*3", 27),
+    ("what is -3 + 5?", 2),
+    ("2^10", 1024),
+    ("sqrt(16)", 4),
+])
+def test_arithmetic_is_evaluated_with_the_tools(text, expected):
+    assert ArithmeticEvaluator(MATH_TOOLS).evaluate(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", [
+    "Hello, how are you?",
+    "what is the capital of France?",
+    "__import__('os').system('ls')",
+    "(1).real + 2",
+    "abs(-3) + 1",
+    "2 ** 100000",
+    "1 / 0",
+    "log(-1)",
+    "3 +",
+    "1+" * 150 + "1",
+])
+def test_non_arithmetic_and_invalid_input_is_left_to_the_llm(text):
+    assert ArithmeticEvaluator(MATH_TOOLS).evaluate(text) is None
+
+
+def test_operators_without_a_matching_tool_are_left_to_the_llm():
+    evaluator = ArithmeticEvaluator([tool for tool in MATH_TOOLS if tool.__name__ != "power"])
+
+    assert evaluator.evaluate("2 ** 3") is None
+    assert evaluator.evaluate("2 * 3") == 6
+
+
+def test_agent_answers_arithmetic_locally_and_sends_the_rest_to_the_llm():
+    counter = CallCounter()
+    agent = ReActAgent(
+        llm=FakeChatModel(latency=0.0, response_prefix="", tool_calls_per_turn=0),
+        fast_path=True,
+        compaction=False,
+        graph_cache=False,
+        single_flight=False,
+    )
+
+    fast = agent.invoke([HumanMessage(content="calculate 3*3*3")], {"callbacks": [counter]})
+    agent.invoke([HumanMessage(content="Hello, how are you?")], {"callbacks": [counter]})
+
+    assert fast["messages"][-1].content == "3*3*3 = 27"
+    assert counter.calls == 1
+    assert agent.path_stats.report()["fast_path_fraction"] == 0.5
@@ -0,0 +1,28 @@
+import gc
+import weakref
+
+import pytest
+from fake_models import FakeChatModel
+from langchain_core.messages import HumanMessage
+
+from agent import ReActAgent
+from graph_cache import GraphCache
+from router import RouterAgent
+
+
+@pytest.mark.parametrize("make", [
+    lambda **kw: RouterAgent(**kw),
+    lambda **kw: ReActAgent(checkpointer=None, compaction=False, **kw),
+], ids=["router", "react"])
+def test_cached_graph_does_not_keep_the_first_agent_alive(make):
+    llm = FakeChatModel(latency=0)
+    cache = GraphCache()
+    first = weakref.ref(make(llm=llm, graph_cache=cache))
+    gc.collect()
+
+    second = make(llm=llm, graph_cache=cache)
+    result = second.invoke([HumanMessage(content="what is 2 * 3?")])
+
+    assert first() is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+    assert result["messages"][-1].content
@@ -0,0 +1,59 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import agent
+import router
+import simple
+
+
+def run_fresh(code):
+    """Run `code` in a new interpreter without Gemini credentials and return its JSON output."""
+    env = {key: value for key, value in os.environ.items() if key != "GOOGLE_API_KEY"}
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(autouse=True)
+def fresh_graphs():
+    for module in (agent, router, simple):
+        module.make_graph.cache_clear()
+    yield
+    for module in (agent, router, simple):
+        module.make_graph.cache_clear()
+
+
+def test_importing_the_studio_modules_builds_nothing():
+    loaded = run_fresh(
+        "import json, sys, agent, router, simple\n"
+        "print(json.dumps([name for name in ('langchain_google_genai', 'IPython') if name in sys.modules]))"
+    )
+
+    assert loaded == []
+
+
+@pytest.mark.parametrize("module", [agent, router])
+def test_graph_needs_credentials_only_when_first_used(module, monkeypatch):
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+
+    with pytest.raises(EnvironmentError, match="GOOGLE_API_KEY"):
+        module.graph
+
+
+@pytest.mark.parametrize("module", [agent, router, simple])
+def test_graph_is_built_once_on_first_access(module, monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+
+    graph = module.graph
+
+    assert module.graph is graph and hasattr(graph, "invoke")
+    assert module.make_graph.cache_info().misses == 1
+
+
+def test_other_module_attributes_still_raise():
+    with pytest.raises(AttributeError):
+        router.not_a_graph
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from langchain_core.messages import HumanMessage
+from stub_servers import RateLimitedStubServer, StubHTTPChatModel
+
+from rate_limit import RateLimiter
+
+
+def http_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://stub")
+    return httpx.HTTPStatusError(f"{status}", request=request, response=httpx.Response(status, request=request))
+
+
+def flaky(errors: list[BaseException]):
+    calls = []
+
+    def call():
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "ok"
+
+    return call, calls
+
+
+def test_429s_from_the_server_are_retried_until_served():
+    limiter = RateLimiter(base_delay=0.05, max_delay=0.5, max_retries=10)
+    with RateLimitedStubServer(requests_per_second=10, burst=1, latency=0) as server:
+        llm = StubHTTPChatModel(base_url=server.url)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda i: limiter.invoke(llm, [HumanMessage(content=f"q{i}")]), range(4)))
+
+    assert all(result.content.startswith("stub answer") for result in results)
+    assert server.counters["served"] == 4
+    assert limiter.stats()["throttled"] == server.counters["throttled"] > 0
+
+
+@pytest.mark.parametrize("error", [http_error(503), httpx.ConnectError("reset"), httpx.ReadTimeout("slow")])
+def test_transient_errors_are_retried(error):
+    limiter = RateLimiter(base_delay=0.01)
+    call, calls = flaky([error, error])
+
+    assert limiter.call(call) == "ok"
+    assert len(calls) == 3
+    assert limiter.stats()["transient"] == 2
+
+
+def test_client_errors_are_not_retried():
+    limiter = RateLimiter(base_delay=0.01)
+    call, calls = flaky([http_error(400)])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        limiter.call(call)
+    assert len(calls) == 1
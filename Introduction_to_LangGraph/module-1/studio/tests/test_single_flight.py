@@ -0,0 +1,128 @@
+import asyncio
+import gc
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fake_models import FakeChatModel
+from graph_common.single_flight import SingleFlight, shared_single_flight
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import HumanMessage
+
+from agent import ReActAgent
+from router import RouterAgent
+
+
+class CallCounter(BaseCallbackHandler):
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        with self._lock:
+            self.calls += 1
+
+
+def run_concurrently(call, clients=8):
+    barrier = threading.Barrier(clients)
+
+    def client(i):
+        barrier.wait()
+        return call(i)
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        return list(pool.map(client, range(clients)))
+
+
+def test_agents_share_the_process_wide_single_flight_by_default():
+    llm = FakeChatModel(latency=0)
+    assert RouterAgent(llm=llm).single_flight is shared_single_flight()
+    assert ReActAgent(llm=llm, compaction=False).single_flight is shared_single_flight()
+    assert RouterAgent(llm=llm, single_flight=False).single_flight is None
+
+
+def test_compiled_graph_coalesces_identical_model_calls():
+    counter = CallCounter()
+    agent = RouterAgent(llm=FakeChatModel(latency=0.2, callbacks=[counter]), single_flight=SingleFlight())
+
+    run_concurrently(lambda i: agent.graph.invoke({"messages": [HumanMessage(content="what is 2 * 3?")]}))
+
+    assert counter.calls == 1
+    assert agent.single_flight.stats()["coalesced"] == 7
+
+
+def test_react_calls_on_separate_threads_are_coalesced():
+    counter = CallCounter()
+    agent = ReActAgent(llm=FakeChatModel(latency=0.2, callbacks=[counter]), compaction=False, single_flight=SingleFlight())
+
+    results = run_concurrently(lambda i: agent.invoke(
+        [HumanMessage(content="what is 2 * 3?")], {"configurable": {"thread_id": f"client-{i}"}}
+    ))
+
+    # One tool-calling turn and one final answer, shared by all clients
+    assert counter.calls == 2
+    assert {result["messages"][-1].content for result in results} == {results[0]["messages"][-1].content}
+
+
+def test_react_invoke_without_thread_id_runs_on_the_stateless_graph():
+    agent = ReActAgent(llm=FakeChatModel(latency=0), compaction=False)
+    assert agent.invoke([HumanMessage(content="what is 2 * 3?")])["messages"][-1].content
+    assert list(agent.checkpointer.list(None)) == []
+
+
+def test_async_calls_on_one_event_loop_are_coalesced():
+    single_flight = SingleFlight()
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return {"answer": 6}
+
+    async def clients():
+        return await asyncio.gather(*(single_flight.ado("key", fetch) for _ in range(5)))
+
+    results = asyncio.run(clients())
+
+    assert len(executions) == 1 and all(result is results[0] for result in results)
+    assert single_flight.stats() == {"requests": 5, "executions": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_async_failure_reaches_every_waiter_and_is_not_reported_as_unretrieved():
+    single_flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream failed")
+
+    async def clients():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        results = await asyncio.gather(*(single_flight.ado("key", fail) for _ in range(3)), return_exceptions=True)
+        with pytest.raises(RuntimeError):
+            await single_flight.ado("alone", fail)
+        gc.collect()
+        return results, errors
+
+    results, errors = asyncio.run(clients())
+
+    assert [str(result) for result in results] == ["upstream failed"] * 3
+    assert errors == [] and single_flight.stats()["in_flight"] == 0
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def clients():
+        leader = asyncio.ensure_future(single_flight.ado("key", fetch))
+        waiter = asyncio.ensure_future(single_flight.ado("key", fetch))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        return await leader, waiter.cancelled()
+
+    assert asyncio.run(clients()) == ("done", True)
@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from agent import MATH_TOOLS, PURE_TOOLS
+from tool_executor import ToolExecutor
+
+
+def tool_call(name, call_id, **args):
+    return {"name": name, "args": args, "id": call_id, "type": "tool_call"}
+
+
+def tool_turn(*calls):
+    return {"messages": [AIMessage(content="", tool_calls=list(calls))]}
+
+
+class ToolStartRecorder(BaseCallbackHandler):
+    def __init__(self):
+        self.tools = []
+
+    def on_tool_start(self, serialized, input_str, **kwargs):
+        self.tools.append(serialized["name"])
+
+
+def test_calls_of_one_message_run_in_parallel_and_keep_their_order():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def wait_for_all(a: float) -> float:
+        """Return `a` once every call of the message has started.
+        Args:
+            a: first float
+        """
+        barrier.wait()
+        return a
+
+    executor = ToolExecutor([wait_for_all])
+    result = executor(tool_turn(*(tool_call("wait_for_all", f"call-{i}", a=i) for i in range(3))), {})
+
+    assert [m.tool_call_id for m in result["messages"]] == ["call-0", "call-1", "call-2"]
+    assert [m.content for m in result["messages"]] == ["0.0", "1.0", "2.0"]
+
+
+def test_pure_tools_are_memoised_across_turns():
+    executor = ToolExecutor(MATH_TOOLS, pure=PURE_TOOLS)
+    for turn in range(3):
+        result = executor(tool_turn(
+            tool_call("multiply", f"m{turn}", a=3, b=4),
+            tool_call("add_batch", f"b{turn}", a=[1, 2], b=[3, 4]),
+        ), {})
+        assert [m.content for m in result["messages"]][0] == "12.0"
+
+    stats = executor.stats()
+    assert stats["multiply"]["calls"] == 3 and stats["multiply"]["cache_hits"] == 2
+    assert stats["add_batch"]["cache_hits"] == 0
+
+
+def test_tool_exceptions_propagate_by_default_like_tool_node():
+    executor = ToolExecutor(MATH_TOOLS)
+
+    with pytest.raises(ZeroDivisionError):
+        executor(tool_turn(tool_call("divide", "d", a=1, b=0)), {})
+    assert executor.stats()["divide"]["errors"] == 1
+
+
+def test_handled_tool_errors_become_error_messages():
+    executor = ToolExecutor(MATH_TOOLS, handle_tool_errors=(ZeroDivisionError,))
+
+    [message] = executor(tool_turn(tool_call("divide", "d", a=1, b=0)), {})["messages"]
+
+    assert message.status == "error"
+    assert message.content.startswith("Error: ZeroDivisionError(")
+    with pytest.raises(ValueError):
+        executor(tool_turn(tool_call("log", "l", a=-1)), {})
+
+
+def test_invalid_arguments_and_unknown_tools_are_reported_to_the_model():
+    executor = ToolExecutor(MATH_TOOLS)
+
+    invalid, unknown = executor(tool_turn(
+        tool_call("multiply", "m", a="three", b=4),
+        tool_call("modulo", "x", a=1, b=2),
+    ), {})["messages"]
+
+    assert invalid.status == "error" and "Error invoking tool 'multiply'" in invalid.content
+    assert unknown.status == "error" and "modulo is not a valid tool" in unknown.content
+
+
+def test_tools_run_with_the_graph_callbacks():
+    builder = StateGraph(MessagesState)
+    builder.add_node("tools", ToolExecutor(MATH_TOOLS))
+    builder.add_edge(START, "tools")
+    builder.add_edge("tools", END)
+    recorder = ToolStartRecorder()
+
+    builder.compile().invoke(
+        tool_turn(tool_call("add", "a", a=1, b=2), tool_call("sqrt", "s", a=9)),
+        {"callbacks": [recorder]},
+    )
+
+    assert sorted(recorder.tools) == ["add", "sqrt"]
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+from graph_common.worker_pool import GraphWorkerPool, load_factory
+from langchain_core.messages import HumanMessage
+
+from simple import SimpleMoodGraph
+
+
+class Builds:
+    """Worker target that reports which process built it and with what."""
+
+    def __init__(self, tag="default"):
+        self.tag = tag
+        self.pid = os.getpid()
+
+    def invoke(self, x, scale=1):
+        return {"tag": self.tag, "pid": self.pid, "built": id(self), "value": x * scale}
+
+
+def test_load_factory_resolves_module_and_dotted_attribute():
+    assert load_factory("simple:SimpleMoodGraph") is SimpleMoodGraph
+    assert load_factory("os.path:join") is os.path.join
+    assert load_factory("simple:SimpleMoodGraph.invoke") is SimpleMoodGraph.invoke
+
+
+@pytest.mark.parametrize("spec", ["simple", "simple:", ":SimpleMoodGraph"])
+def test_load_factory_rejects_a_malformed_spec(spec):
+    with pytest.raises(ValueError, match="module:callable"):
+        load_factory(spec)
+
+
+def test_jobs_run_in_worker_processes_on_a_target_built_once_each():
+    with GraphWorkerPool("test_worker_pool:Builds", processes=2, factory_kwargs={"tag": "pooled"}) as pool:
+        pids = pool.warm_up(timeout=30)
+        results = list(pool.map(range(20)))
+
+    assert os.getpid() not in pids and 1 <= len(pids) <= 2
+    assert [result["value"] for result in results] == list(range(20))
+    assert {result["tag"] for result in results} == {"pooled"}
+    assert {result["pid"] for result in results} <= pids
+    built = {}
+    for result in results:
+        assert built.setdefault(result["pid"], result["built"]) == result["built"]
+
+
+def test_submit_passes_positional_and_keyword_arguments():
+    with GraphWorkerPool("test_worker_pool:Builds", processes=1) as pool:
+        result = pool.submit(3, scale=4).result(timeout=30)
+
+    assert result["value"] == 12 and result["tag"] == "default"
+
+
+def test_worker_errors_surface_on_the_future():
+    with GraphWorkerPool("test_worker_pool:Builds", processes=1, method="missing") as pool:
+        future = pool.submit(1)
+
+        with pytest.raises(AttributeError, match="missing"):
+            future.result(timeout=30)
+
+
+def test_pool_runs_a_studio_graph():
+    with GraphWorkerPool("simple:SimpleMoodGraph", processes=2) as pool:
+        results = list(pool.map(["Hi"] * 4, chunksize=2))
+
+    assert all(result["graph_state"] in ("Hi I am happy!", "Hi I am sad!") for result in results)
+
+
+def test_pool_runs_a_react_agent_on_a_fake_model():
+    with GraphWorkerPool("bench_workers:make_react_agent", processes=1) as pool:
+        result = pool.submit([HumanMessage(content="What is 3 times 2?")]).result(timeout=60)
+
+    assert result["messages"][-1].content
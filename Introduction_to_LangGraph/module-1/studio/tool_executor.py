@@ -0,0 +1,179 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional, Union
+
+from langchain_core.messages import AIMessage, ToolCall, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+from langchain_core.tools import BaseTool, StructuredTool
+from langgraph.errors import GraphBubbleUp
+from langgraph.graph import MessagesState
+from langgraph.prebuilt.tool_node import (
+    INVALID_TOOL_NAME_ERROR_TEMPLATE,
+    TOOL_CALL_ERROR_TEMPLATE,
+    ToolInvocationError,
+)
+from pydantic import ValidationError
+
+# Exceptions a tool may raise that become an error ToolMessage for the model
+HandledErrors = Union[bool, type[Exception], tuple[type[Exception], ...]]
+
+
+class ToolResultCache:
+    """Thread-safe bounded LRU of tool results keyed by tool name and arguments."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(name: str, args: dict[str, Any]) -> str:
+        return name + ":" + json.dumps(args, sort_keys=True, default=str)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class ToolStats:
+    """Per-tool call counts, cache hits, errors and execution time."""
+
+    def __init__(self):
+        self._stats: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, cache_hit: bool, error: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, {"calls": 0, "cache_hits": 0, "errors": 0, "total_ms": 0.0})
+            stats["calls"] += 1
+            stats["cache_hits"] += cache_hit
+            stats["errors"] += error
+            stats["total_ms"] += seconds * 1000
+
+    def report(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    **stats,
+                    "hit_rate": stats["cache_hits"] / stats["calls"],
+                    "mean_ms": stats["total_ms"] / stats["calls"],
+                }
+                for name, stats in sorted(self._stats.items())
+            }
+
+
+class ToolExecutor:
+    """Drop-in replacement for ToolNode with parallel calls and memoisation.
+
+    All tool calls of one AI message run concurrently on a shared thread
+    pool, with the node's config and context variables, so callbacks and
+    tracing reach the tools. Results of tools named in `pure` (deterministic,
+    no side effects) are kept in a bounded LRU shared by every turn and
+    thread of the agent.
+
+    Errors are handled like ToolNode's default: invalid arguments and unknown
+    tool names become an error ToolMessage for the model, other exceptions
+    propagate. `handle_tool_errors` widens that to every exception (True) or
+    the given exception types, or turns it off (False).
+    """
+
+    def __init__(
+        self,
+        tools: list[Callable],
+        pure: Iterable[str] = (),
+        max_workers: int = 8,
+        cache_size: int = 1024,
+        handle_tool_errors: Optional[HandledErrors] = None,
+    ):
+        self.tools: dict[str, BaseTool] = {}
+        for tool in tools:
+            tool = tool if isinstance(tool, BaseTool) else StructuredTool.from_function(tool)
+            self.tools[tool.name] = tool
+        self.pure = frozenset(pure)
+        self.max_workers = max_workers
+        self.cache = ToolResultCache(cache_size)
+        self.tool_stats = ToolStats()
+        self.handle_tool_errors = handle_tool_errors
+        self._pool: Optional[ContextThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ContextThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # Runs each call in a copy of the caller's context (tracing, callbacks)
+                self._pool = ContextThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tools")
+            return self._pool
+
+    def _error_content(self, error: Exception) -> Optional[str]:
+        """Message for the model when `error` is handled, None to re-raise it."""
+        handled = self.handle_tool_errors
+        if handled is None:
+            return error.message if isinstance(error, ToolInvocationError) else None
+        if handled is True or (handled is not False and isinstance(error, handled)):
+            return TOOL_CALL_ERROR_TEMPLATE.format(error=repr(error))
+        return None
+
+    def _run(self, call: ToolCall, config: Optional[RunnableConfig] = None) -> ToolMessage:
+        name = call["name"]
+        start = time.perf_counter()
+        key = ToolResultCache.key(name, call["args"]) if name in self.pure else None
+        content = self.cache.get(key) if key is not None else None
+        if content is not None:
+            self.tool_stats.record(name, time.perf_counter() - start, cache_hit=True, error=False)
+            return ToolMessage(content=content, name=name, tool_call_id=call["id"])
+
+        if name not in self.tools:
+            self.tool_stats.record(name, time.perf_counter() - start, cache_hit=False, error=True)
+            content = INVALID_TOOL_NAME_ERROR_TEMPLATE.format(requested_tool=name, available_tools=", ".join(self.tools))
+            return ToolMessage(content=content, name=name, tool_call_id=call["id"], status="error")
+
+        try:
+            try:
+                message = self.tools[name].invoke({**call, "type": "tool_call"}, config)
+            except ValidationError as e:
+                raise ToolInvocationError(name, e, call["args"]) from e
+        except GraphBubbleUp:
+            # Interrupts and other control flow always reach the graph
+            raise
+        except Exception as e:
+            self.tool_stats.record(name, time.perf_counter() - start, cache_hit=False, error=True)
+            content = self._error_content(e)
+            if content is None:
+                raise
+            return ToolMessage(content=content, name=name, tool_call_id=call["id"], status="error")
+
+        self.tool_stats.record(name, time.perf_counter() - start, cache_hit=False, error=False)
+        if key is not None:
+            self.cache.put(key, message.content)
+        return message
+
+    def __call__(self, state: MessagesState, config: RunnableConfig) -> dict:
+        message = state["messages"][-1]
+        calls = message.tool_calls if isinstance(message, AIMessage) else []
+        if len(calls) <= 1:
+            return {"messages": [self._run(call, config) for call in calls]}
+        # map keeps the order of the tool calls
+        return {"messages": list(self._get_pool().map(self._run, calls, [config] * len(calls)))}
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Per-tool calls, cache hits, hit rate, errors, total and mean ms."""
+        return self.tool_stats.report()
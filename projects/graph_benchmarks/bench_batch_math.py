@@ -0,0 +1,107 @@
+"""Rows per second of the batch math tools vs. one scalar tool call per row.
+
+Three ways to evaluate a column with ReActAgent's math tools:
+
+* scalar-fn:   plain Python call of the scalar function per row (lower bound
+               of the per-cell path, no tool overhead);
+* scalar-tool: one tool invocation per row, as the agent does today when it
+               emits one tool call per cell (argument validation + ToolMessage);
+* batch-tool:  one invocation of the NumPy batch tool for the whole column.
+
+Every operation gets a column with ~1% failing rows (zeros / non-positive
+values) so per-element error handling is part of the measurement. Model
+round-trips are not included: with one model turn per tool call the scalar
+path is far slower still. Run from the repository root:
+
+    python projects/graph_benchmarks/bench_batch_math.py [--rows 1000 100000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "Introduction_to_LangGraph/module-1/studio"))
+sys.path.insert(0, str(REPO_ROOT / "projects/graph_common"))
+
+from langchain_core.tools import StructuredTool  # noqa: E402
+
+import agent  # noqa: E402
+import batch_math  # noqa: E402
+
+# (scalar tool, batch tool, number of operands)
+OPERATIONS = [
+    (agent.multiply, batch_math.multiply_batch, 2),
+    (agent.divide, batch_math.divide_batch, 2),
+    (agent.log, batch_math.log_batch, 1),
+]
+
+
+def make_columns(rows: int, operands: int, seed: int) -> list[list[float]]:
+    rng = random.Random(seed)
+    columns = [[rng.uniform(1, 100) for _ in range(rows)] for _ in range(operands)]
+    for i in rng.sample(range(rows), max(rows // 100, 1)):
+        columns[-1][i] = 0.0
+    return columns
+
+
+def scalar_fn(fn: Callable, columns: list[list[float]]) -> None:
+    for args in zip(*columns):
+        try:
+            fn(*args)
+        except (ArithmeticError, ValueError):
+            pass
+
+
+def scalar_tool(tool: StructuredTool, columns: list[list[float]]) -> None:
+    names = list(tool.args)
+    for i, args in enumerate(zip(*columns)):
+        call = {"name": tool.name, "args": dict(zip(names, args)), "id": f"call_{i}", "type": "tool_call"}
+        try:
+            tool.invoke(call)
+        except (ArithmeticError, ValueError):
+            pass
+
+
+def batch_tool(tool: StructuredTool, columns: list[list[float]]) -> None:
+    tool.invoke({"name": tool.name, "args": dict(zip(tool.args, columns)), "id": "call_0", "type": "tool_call"})
+
+
+def rows_per_second(run: Callable[[], None], rows: int, min_seconds: float) -> float:
+    run()  # warm-up (NumPy import, pydantic schema build)
+    repeats, start = 0, time.perf_counter()
+    while True:
+        run()
+        repeats += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return repeats * rows / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="minimum measuring time per cell")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'operation':<10}{'rows':>9}{'scalar-fn':>14}{'scalar-tool':>14}{'batch-tool':>14}{'speedup':>10}")
+    for scalar, batch, operands in OPERATIONS:
+        scalar_as_tool = StructuredTool.from_function(scalar)
+        batch_as_tool = StructuredTool.from_function(batch)
+        for rows in args.rows:
+            columns = make_columns(rows, operands, args.seed)
+            fn_rps = rows_per_second(lambda: scalar_fn(scalar, columns), rows, args.min_seconds)
+            tool_rps = rows_per_second(lambda: scalar_tool(scalar_as_tool, columns), rows, args.min_seconds)
+            batch_rps = rows_per_second(lambda: batch_tool(batch_as_tool, columns), rows, args.min_seconds)
+            print(
+                f"{scalar.__name__:<10}{rows:>9}{fn_rps:>14,.0f}{tool_rps:>14,.0f}{batch_rps:>14,.0f}"
+                f"{batch_rps / tool_rps:>9.0f}x"
+            )
+    print("\nrows/s; speedup = batch-tool vs. scalar-tool")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Checkpointer benchmark: memory use and checkpoint write latency vs. thread count.
+
+Drives a tiny MessagesState graph (an echo node, no LLM) through several
+turns per thread with each ReActAgent checkpointer backend. Run from the
+repository root:
+
+    python projects/graph_benchmarks/bench_checkpointer.py --threads 10 100 1000 --turns 5
+"""
+import argparse
+import functools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "Introduction_to_LangGraph/module-1/studio"))
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langgraph.graph import END, START, MessagesState, StateGraph  # noqa: E402
+
+from checkpointers import make_checkpointer  # noqa: E402
+
+
+def echo(state: MessagesState):
+    return {"messages": [AIMessage(content=f"echo: {state['messages'][-1].content}")]}
+
+
+def build_graph(checkpointer):
+    builder = StateGraph(MessagesState)
+    builder.add_node("echo", echo)
+    builder.add_edge(START, "echo")
+    builder.add_edge("echo", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def timed_puts(checkpointer, latencies: list[float]):
+    """Record the latency of every checkpoint write."""
+    put = checkpointer.put
+
+    @functools.wraps(put)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return put(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    checkpointer.put = wrapper
+
+
+def run(backend: str, threads: int, turns: int, options: dict) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        tracemalloc.start()
+        checkpointer = make_checkpointer(backend, path=os.path.join(tmp, "checkpoints.sqlite"), **options)
+        latencies: list[float] = []
+        timed_puts(checkpointer, latencies)
+        graph = build_graph(checkpointer)
+        start = time.perf_counter()
+        for turn in range(turns):
+            for thread in range(threads):
+                config = {"configurable": {"thread_id": f"thread-{thread}"}}
+                graph.invoke({"messages": [HumanMessage(content=f"question {turn}")]}, config)
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        latencies.sort()
+        return {
+            "backend": backend,
+            "threads": threads,
+            "turns": turns,
+            "checkpoint_writes": len(latencies),
+            "write_p50_ms": statistics.median(latencies) * 1000,
+            "write_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+            "retained_mb": current / 1e6,
+            "peak_mb": peak / 1e6,
+            "elapsed_s": elapsed,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--backends", nargs="+", default=["memory", "bounded", "sqlite"])
+    parser.add_argument("--max-checkpoints-per-thread", type=int, default=4)
+    parser.add_argument("--max-threads", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    bounded_options = {"max_checkpoints_per_thread": args.max_checkpoints_per_thread, "max_threads": args.max_threads}
+    results = [
+        run(backend, threads, args.turns, bounded_options)
+        for backend in args.backends
+        for threads in args.threads
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'backend':<10}{'threads':>8}{'writes':>8}{'p50 ms':>9}{'p95 ms':>9}{'retained MB':>13}{'peak MB':>9}")
+    for r in results:
+        print(
+            f"{r['backend']:<10}{r['threads']:>8}{r['checkpoint_writes']:>8}{r['write_p50_ms']:>9.3f}"
+            f"{r['write_p95_ms']:>9.3f}{r['retained_mb']:>13.2f}{r['peak_mb']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
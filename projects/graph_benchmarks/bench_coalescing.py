@@ -0,0 +1,113 @@
+"""Load test for single-flight request coalescing.
+
+`--clients` threads fire requests at the same moment, drawn from only
+`--distinct` different prompts, at RouterAgent's compiled graph (as served
+from langgraph.json), ReActAgent.invoke without a thread_id and with one
+thread per client, and LinkedInPostAgent.run. Each agent is run with
+coalescing off and on (its own SingleFlight, so the counts are per agent).
+The table shows the upstream model calls, the coalesced requests and the
+wall time. Run from the repository root:
+
+    python projects/graph_benchmarks/bench_coalescing.py [--clients 64 --distinct 4 --waves 3]
+"""
+import argparse
+import logging
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "sections/02_reflection_agent/projects"))
+sys.path.insert(0, str(REPO_ROOT / "Introduction_to_LangGraph/module-1/studio"))
+sys.path.insert(0, str(REPO_ROOT / "projects/graph_common"))
+
+from langchain_core.callbacks import BaseCallbackHandler  # noqa: E402
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from fake_models import FakeChatModel  # noqa: E402
+
+
+class ModelCallCounter(BaseCallbackHandler):
+    """Counts upstream chat model calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized: dict[str, Any], messages: Any, **kwargs: Any) -> None:
+        with self._lock:
+            self.calls += 1
+
+
+def build_agents(latency: float, single_flight: bool) -> dict[str, tuple[Any, ModelCallCounter, Callable[[Any, str], Any]]]:
+    from graph_common.single_flight import SingleFlight
+
+    from agent import ReActAgent
+    from graph import LinkedInPostAgent
+    from router import RouterAgent
+
+    agents = {}
+    for name in ("router", "react", "react-thread", "reflection"):
+        counter = ModelCallCounter()
+        llm = FakeChatModel(latency=latency, callbacks=[counter])
+        coalescing = SingleFlight() if single_flight else False
+        if name == "router":
+            agent = RouterAgent(llm=llm, single_flight=coalescing)
+            call = lambda a, prompt: a.graph.invoke({"messages": [HumanMessage(content=prompt)]})
+        elif name == "react":
+            agent = ReActAgent(llm=llm, compaction=False, single_flight=coalescing)
+            call = lambda a, prompt: a.invoke([HumanMessage(content=prompt)])
+        elif name == "react-thread":
+            agent = ReActAgent(llm=llm, compaction=False, single_flight=coalescing)
+            call = lambda a, prompt: a.invoke(
+                [HumanMessage(content=prompt)], {"configurable": {"thread_id": uuid.uuid4().hex}}
+            )
+        else:
+            agent = LinkedInPostAgent(max_attempts=2, llm=llm, single_flight=coalescing)
+            call = lambda a, prompt: a.run(prompt)
+        agents[name] = (agent, counter, call)
+    return agents
+
+
+def load(agent: Any, call: Callable[[Any, str], Any], clients: int, distinct: int, waves: int) -> float:
+    prompts = [f"What is {i} times {i}?" for i in range(distinct)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for _ in range(waves):
+            barrier = threading.Barrier(clients)
+
+            def client(i: int) -> None:
+                barrier.wait()
+                call(agent, prompts[i % distinct])
+
+            list(pool.map(client, range(clients)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=64, help="concurrent requests per wave")
+    parser.add_argument("--distinct", type=int, default=4, help="number of different prompts")
+    parser.add_argument("--waves", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake model latency per call (s)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    requests = args.clients * args.waves
+    print(f"{requests} requests ({args.clients} concurrent x {args.waves} waves, {args.distinct} distinct prompts)\n")
+    print(f"{'agent':<14}{'single-flight':>14}{'model calls':>13}{'coalesced':>11}{'wall s':>9}")
+    for single_flight in (False, True):
+        for name, (agent, counter, call) in build_agents(args.latency, single_flight).items():
+            elapsed = load(agent, call, args.clients, args.distinct, args.waves)
+            coalesced = agent.single_flight.stats()["coalesced"] if agent.single_flight else 0
+            print(f"{name:<14}{'on' if single_flight else 'off':>14}{counter.calls:>13}{coalesced:>11}{elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Construction time of the studio agents with and without the graph cache.
+
+Builds `--instances` SimpleMoodGraph / RouterAgent / ReActAgent objects (the
+last two on one shared fake model), the way a server that creates an agent
+per request would:
+
+* off:    graph_cache=False, every instance binds its tools and compiles;
+* cached: a fresh GraphCache, the first instance builds and the rest reuse
+  the compiled graph (ReActAgent still gets its own checkpointer).
+
+Run from the repository root:
+
+    python projects/graph_benchmarks/bench_construction.py [--instances 200]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "Introduction_to_LangGraph/module-1/studio"))
+sys.path.insert(0, str(REPO_ROOT / "projects/graph_common"))
+
+from fake_models import FakeChatModel  # noqa: E402
+
+
+def build_times(factory: Callable[[], Any], instances: int) -> list[float]:
+    times = []
+    for _ in range(instances):
+        start = time.perf_counter()
+        factory()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--instances", type=int, default=200)
+    args = parser.parse_args()
+
+    from agent import ReActAgent
+    from graph_cache import GraphCache
+    from router import RouterAgent
+    from simple import SimpleMoodGraph
+
+    llm = FakeChatModel()
+    agents = {
+        "SimpleMoodGraph": lambda **kw: SimpleMoodGraph(**kw),
+        "RouterAgent": lambda **kw: RouterAgent(llm=llm, **kw),
+        "ReActAgent": lambda **kw: ReActAgent(llm=llm, **kw),
+    }
+    print(f"{args.instances} instances per agent (ms per instance)\n")
+    print(f"{'agent':<17}{'off p50':>9}{'off mean':>10}{'first':>8}{'cached p50':>12}{'cached mean':>13}{'speedup':>9}  cache")
+    for name, make in agents.items():
+        off = build_times(lambda: make(graph_cache=False), args.instances)
+        cache = GraphCache()
+        cached = build_times(lambda: make(graph_cache=cache), args.instances)
+        first, rest = cached[0], cached[1:] or cached
+        speedup = statistics.mean(off) / statistics.mean(rest)
+        print(f"{name:<17}{statistics.median(off):>9.3f}{statistics.mean(off):>10.3f}{first:>8.2f}"
+              f"{statistics.median(rest):>12.3f}{statistics.mean(rest):>13.3f}{speedup:>8.0f}x  {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
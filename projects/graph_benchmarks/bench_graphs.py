@@ -0,0 +1,235 @@
+"""Offline benchmark suite for the course graphs using deterministic fake LLMs.
+
+Benchmarks LinkedInPostAgent (sequential and best-of-3), RouterAgent, ReActAgent and SimpleMoodGraph
+without Ollama or Gemini. For every graph it measures per-node latency,
+end-to-end p50/p95/p99, throughput under concurrency and peak traced
+memory. Run from the repository root:
+
+    python projects/graph_benchmarks/bench_graphs.py --runs 50 --concurrency 8 \\
+        --output bench_results.json [--compare previous_results.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "sections/02_reflection_agent/projects"))
+sys.path.insert(0, str(REPO_ROOT / "Introduction_to_LangGraph/module-1/studio"))
+sys.path.insert(0, str(REPO_ROOT / "projects/graph_common"))
+
+from langchain_core.callbacks import BaseCallbackHandler  # noqa: E402
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from fake_models import FakeChatModel  # noqa: E402
+from graph_common.stats import percentile  # noqa: E402
+
+# Metrics compared by --compare (lower is better for all of them except throughput)
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "peak_memory_mb")
+
+
+class NodeLatencyHandler(BaseCallbackHandler):
+    """Callback handler recording wall time of every graph node run."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self._starts: dict[UUID, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any],
+        inputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        if node is None or kwargs.get("name") != node:
+            return
+        with self._lock:
+            # Only the outermost run of a node counts (its inner callable has the same name)
+            parent = self._starts.get(parent_run_id) if parent_run_id else None
+            if parent is None or parent[0] != node:
+                self._starts[run_id] = (node, time.perf_counter())
+
+    def _finish(self, run_id: UUID) -> None:
+        with self._lock:
+            started = self._starts.pop(run_id, None)
+            if started is not None:
+                node, start = started
+                self.latencies.setdefault(node, []).append(time.perf_counter() - start)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+
+class Target:
+    """A graph plus a function producing (input, config) for run number i."""
+
+    def __init__(self, name: str, graph: Any, make_input: Callable[[int], tuple[Any, dict]]):
+        self.name = name
+        self.graph = graph
+        self.make_input = make_input
+
+    def run(self, i: int, callbacks: Optional[list] = None) -> None:
+        graph_input, config = self.make_input(i)
+        if callbacks:
+            config = {**config, "callbacks": callbacks}
+        self.graph.invoke(graph_input, config)
+
+
+def build_targets(llm_factory: Callable[[], FakeChatModel]) -> dict[str, Target]:
+    from agent import ReActAgent
+    from graph import LinkedInPostAgent
+    from router import RouterAgent
+    from simple import SimpleMoodGraph
+
+    reflection = LinkedInPostAgent(max_attempts=3, llm=llm_factory())
+    best_of_3 = LinkedInPostAgent(max_attempts=3, llm=llm_factory(), num_candidates=3)
+    router = RouterAgent(llm=llm_factory())
+    react = ReActAgent(llm=llm_factory(), checkpointer="memory")
+    simple = SimpleMoodGraph()
+    question = {"messages": [HumanMessage(content="What is 2 times 2?")]}
+    return {
+        "reflection": Target("reflection", reflection._runner, lambda i: (reflection._initial_state(f"topic {i}"), {})),
+        "reflection_best_of_3": Target(
+            "reflection_best_of_3", best_of_3._runner, lambda i: (best_of_3._initial_state(f"topic {i}"), {})
+        ),
+        "router": Target("router", router.graph, lambda i: (question, {})),
+        "react": Target("react", react.graph, lambda i: (question, {"configurable": {"thread_id": f"bench-{i}"}})),
+        "simple": Target("simple", simple.graph, lambda i: ({"graph_state": "Hi"}, {})),
+    }
+
+
+def benchmark(target: Target, runs: int, concurrency: int, memory_runs: int) -> dict[str, Any]:
+    handler = NodeLatencyHandler()
+    latencies = []
+    for i in range(runs):
+        start = time.perf_counter()
+        target.run(i, callbacks=[handler])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda i: target.run(runs + i), range(runs)))
+    throughput = runs / (time.perf_counter() - start)
+
+    tracemalloc.start()
+    for i in range(memory_runs):
+        target.run(2 * runs + i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "runs": runs,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "throughput_rps": throughput,
+        "concurrency": concurrency,
+        "peak_memory_mb": peak / 1e6,
+        "nodes": {
+            node: {
+                "count": len(values),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+            }
+            for node, values in sorted(handler.latencies.items())
+        },
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, previous: dict) -> None:
+    print(f"\nComparison with {previous['meta'].get('commit')} (current {current['meta'].get('commit')}):")
+    for name, result in current["results"].items():
+        old = previous["results"].get(name)
+        if old is None:
+            continue
+        deltas = []
+        for metric in COMPARED_METRICS:
+            if old.get(metric):
+                deltas.append(f"{metric} {100 * (result[metric] - old[metric]) / old[metric]:+.1f}%")
+        print(f"  {name:<11} " + ", ".join(deltas))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graphs", nargs="+", default=["reflection", "router", "react", "simple"])
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--memory-runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.01, help="fake model latency per call (s)")
+    parser.add_argument("--output-tokens", type=int, default=50, help="fake model output tokens per call")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    # The graphs log every step at INFO; keep the benchmark output readable
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+    targets = build_targets(lambda: FakeChatModel(latency=args.latency, output_tokens=args.output_tokens))
+
+    results = {}
+    for name in args.graphs:
+        # SimpleMoodGraph prints from its nodes
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = benchmark(targets[name], args.runs, args.concurrency, args.memory_runs)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "latency_s": args.latency,
+            "output_tokens": args.output_tokens,
+        },
+        "results": results,
+    }
+
+    print(f"{'graph':<22}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'runs/s':>9}{'peak MB':>9}")
+    for name, r in results.items():
+        print(f"{name:<22}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['throughput_rps']:>9.1f}{r['peak_memory_mb']:>9.2f}")
+        for node, n in r["nodes"].items():
+            print(f"  {node:<20} n={n['count']:<5} p50 {n['p50_ms']:.2f} ms  p95 {n['p95_ms']:.2f} ms")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
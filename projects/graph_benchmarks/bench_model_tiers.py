@@ -0,0 +1,100 @@
+"""Per-node latency and token-cost breakdown with one model vs. tiered models.
+
+Fake models stand in for a large and a small model (`--large-latency`,
+`--small-latency`) and carry real Gemini model names, so the cost column
+uses the list prices in the studio's model_profiles.py:
+
+* reflection: LinkedInPostAgent with every node on the large model vs.
+  the critic on the small one (node_models={"critique_post": ...});
+* router: RouterAgent's routing call on the large vs. the small model.
+
+Node rows come from InstrumentationHandler + SummarySink. Run from the
+repository root:
+
+    python projects/graph_benchmarks/bench_model_tiers.py [--topics 8 --large-latency 0.3]
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "sections/02_reflection_agent/projects"))
+sys.path.insert(0, str(REPO_ROOT / "Introduction_to_LangGraph/module-1/studio"))
+sys.path.insert(0, str(REPO_ROOT / "projects/graph_common"))
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from fake_models import FakeChatModel  # noqa: E402
+
+LARGE, SMALL = "gemini-2.5-flash", "gemini-2.5-flash-lite"
+
+
+def models(args: argparse.Namespace) -> tuple[FakeChatModel, FakeChatModel]:
+    large = FakeChatModel(model=LARGE, latency=args.large_latency, output_tokens=args.output_tokens)
+    small = FakeChatModel(model=SMALL, latency=args.small_latency, output_tokens=args.output_tokens // 2)
+    return large, small
+
+
+def run_reflection(args: argparse.Namespace, tiered: bool) -> tuple[float, list[dict[str, Any]]]:
+    from graph import LinkedInPostAgent
+    from graph_common.instrumentation import InstrumentationHandler, SummarySink
+    from model_profiles import PROFILES
+
+    large, small = models(args)
+    sink = SummarySink()
+    agent = LinkedInPostAgent(
+        max_attempts=3,
+        llm=large,
+        node_models={"critique_post": small} if tiered else None,
+        instrumentation=InstrumentationHandler(sink, graph_name="reflection"),
+        single_flight=False,
+    )
+    start = time.perf_counter()
+    agent.run_many([f"topic {i}" for i in range(args.topics)], max_concurrency=args.topics)
+    return time.perf_counter() - start, sink.report(PROFILES.prices())
+
+
+def run_router(args: argparse.Namespace, tiered: bool) -> tuple[float, list[dict[str, Any]]]:
+    from graph_common.instrumentation import InstrumentationHandler, SummarySink
+    from model_profiles import PROFILES
+    from router import RouterAgent
+
+    large, small = models(args)
+    sink = SummarySink()
+    agent = RouterAgent(
+        llm=large,
+        node_models={"agent": small} if tiered else None,
+        instrumentation=InstrumentationHandler(sink, graph_name="router"),
+        single_flight=False,
+    )
+    start = time.perf_counter()
+    for i in range(args.topics):
+        agent.invoke([HumanMessage(content=f"What is {i} * 2.5?")])
+    return time.perf_counter() - start, sink.report(PROFILES.prices())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=8, help="reflection topics / router requests")
+    parser.add_argument("--large-latency", type=float, default=0.3)
+    parser.add_argument("--small-latency", type=float, default=0.08)
+    parser.add_argument("--output-tokens", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    for graph, run in (("reflection", run_reflection), ("router", run_router)):
+        for setup in ("single", "tiered"):
+            elapsed, rows = run(args, setup == "tiered")
+            total = sum(row["cost_usd"] for row in rows)
+            print(f"\n{graph} / {setup}: {elapsed:.2f}s wall, ${total * 1000:.3f} per 1000 batches")
+            print(f"{'node':<16}{'model':<24}{'runs':>6}{'calls':>7}{'p50 ms':>9}{'p95 ms':>9}{'in tok':>9}{'out tok':>9}{'cost $':>11}")
+            for row in rows:
+                print(f"{row['node']:<16}{row['model']:<24}{row['runs']:>6}{row['model_calls']:>7}{row['wall_p50_ms']:>9.0f}"
+                      f"{row['wall_p95_ms']:>9.0f}{row['input_tokens']:>9}{row['output_tokens']:>9}{row['cost_usd']:>11.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Cold start and connection reuse of the Ollama backend, against a local stub.
+
+Runs LinkedInPostAgent on an OllamaStubServer that takes `--load-delay`
+seconds to "load" the model, in two setups:
+
+* default: every agent instance builds its own ChatOllama (own HTTP client,
+  no keep_alive, no warm-up), as get_llm() used to;
+* managed: one OllamaClientManager (ollama_client.py) with a warm-up call,
+  keep_alive and a single pooled HTTP client shared by all agents.
+
+Reported: latency of the first model call of the first run, cold/warm call
+latencies, model loads and TCP connections seen by the server. Run from the
+repository root:
+
+    python projects/graph_benchmarks/bench_ollama_client.py [--agents 3 --topics 4]
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "sections/02_reflection_agent/projects"))
+sys.path.insert(0, str(REPO_ROOT / "projects/graph_common"))
+
+from stub_servers import OllamaStubServer  # noqa: E402
+
+MODEL = "qwen2.5:3b"
+
+
+def first_call_latency(agent) -> float:
+    """Seconds until the first generate_post of a fresh run has finished."""
+    start = time.perf_counter()
+    for chunk in agent.stream("first topic"):
+        if chunk["node"] == "generate_post" and chunk["first"]:
+            break
+    return time.perf_counter() - start
+
+
+def scenario(name: str, args: argparse.Namespace) -> dict:
+    from langchain_ollama import ChatOllama
+
+    from graph import LinkedInPostAgent
+    from ollama_client import LatencyRecorder, OllamaClientManager
+
+    with OllamaStubServer(load_delay=args.load_delay, token_latency=args.token_latency) as server:
+        if name == "default":
+            recorder = LatencyRecorder()
+            make_llm = lambda: ChatOllama(model=MODEL, temperature=0.1, base_url=server.url, callbacks=[recorder])
+        else:
+            manager = OllamaClientManager(base_url=server.url, keep_alive="30m", max_connections=args.concurrency)
+            manager.warm_up(MODEL)
+            recorder = manager.metrics
+            make_llm = lambda: manager.chat_model(MODEL, temperature=0.1)
+
+        agents = [LinkedInPostAgent(max_attempts=2, llm=make_llm(), single_flight=False) for _ in range(args.agents)]
+        first = first_call_latency(agents[0])
+        start = time.perf_counter()
+        for agent in agents:
+            agent.run_many([f"topic {i}" for i in range(args.topics)], max_concurrency=args.concurrency)
+        return {
+            "first_call_s": first,
+            "batch_s": time.perf_counter() - start,
+            "latency": recorder.report(),
+            **server.counters,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=3, help="agent instances, each with its own model in 'default'")
+    parser.add_argument("--topics", type=int, default=4, help="topics per agent")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--load-delay", type=float, default=1.0, help="simulated model load time (s)")
+    parser.add_argument("--token-latency", type=float, default=0.0005)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"{'setup':<9}{'first call s':>13}{'cold n':>8}{'cold p50 ms':>13}{'warm p50 ms':>13}{'warm p95 ms':>13}"
+          f"{'loads':>7}{'TCP conns':>11}{'requests':>10}")
+    for name in ("default", "managed"):
+        r = scenario(name, args)
+        cold, warm = r["latency"]["cold"], r["latency"]["warm"]
+        print(f"{name:<9}{r['first_call_s']:>13.2f}{cold['count']:>8}{cold['p50_ms']:>13.0f}{warm['p50_ms']:>13.1f}"
+              f"{warm['p95_ms']:>13.1f}{r['loads']:>7}{r['connections']:>11}{r['requests']:>10}")
+    print("\n'managed' pays the model load in the warm-up call, before the first run starts.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Prompt construction micro-benchmark for the reflection nodes.
+
+Compares the old per-call prompt building (a new ChatPromptTemplate with
+the critique/topic/post baked in through f-strings, every call) with the
+module-level templates in nodes.py:
+
+* per-call overhead of building + rendering the prompt;
+* prefix reuse over a simulated reflection run: the share of each prompt
+  already covered by the longest common prefix with an earlier prompt,
+  i.e. what a prefix-caching server (Ollama/llama.cpp keep the KV cache of
+  earlier requests per slot) does not have to re-evaluate.
+
+With `--ollama` both prompt styles are also sent to a local Ollama and the
+reported `prompt_eval_count` (tokens actually evaluated) is summed.
+Run from the repository root:
+
+    python projects/graph_benchmarks/bench_prompts.py [--calls 2000] [--ollama]
+"""
+import argparse
+import logging
+import os
+import sys
+import timeit
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "sections/02_reflection_agent/projects"))
+sys.path.insert(0, str(REPO_ROOT / "projects/graph_common"))
+
+from langchain_core.messages import BaseMessage, HumanMessage  # noqa: E402
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder  # noqa: E402
+
+import nodes  # noqa: E402
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+def legacy_generate_messages(state: dict, messages: list[BaseMessage]) -> list[BaseMessage]:
+    """Prompt building as generate_post did it before templates were precompiled."""
+    system_prompt = nodes.GENERATE_SYSTEM_PROMPT
+    if state["critique"]:
+        system_prompt += f"\n\nPREVIOUS CRITIQUE (address these issues):\n{state['critique']}"
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        MessagesPlaceholder(variable_name="messages"),
+        ("human", f"Topic: {state['topic']}"),
+    ])
+    return prompt.invoke({"messages": messages}).to_messages()
+
+
+def legacy_critique_messages(state: dict, messages: list[BaseMessage]) -> list[BaseMessage]:
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", nodes.CRITIQUE_SYSTEM_PROMPT),
+        MessagesPlaceholder(variable_name="messages"),
+        ("human", f"Post to critique:\n\n{state['generated_post']}\n\nTopic: {state['topic']}"),
+    ])
+    return prompt.invoke({"messages": messages}).to_messages()
+
+
+def precompiled_generate_messages(state: dict, messages: list[BaseMessage]) -> list[BaseMessage]:
+    return nodes.GENERATE_PROMPT.invoke(nodes._generate_inputs(state, messages)).to_messages()
+
+
+def precompiled_critique_messages(state: dict, messages: list[BaseMessage]) -> list[BaseMessage]:
+    return nodes.CRITIQUE_PROMPT.invoke(nodes._critique_inputs(state, messages)).to_messages()
+
+
+STYLES = {
+    "legacy": (legacy_generate_messages, legacy_critique_messages),
+    "precompiled": (precompiled_generate_messages, precompiled_critique_messages),
+}
+
+
+def simulated_run(attempts: int) -> list[tuple[str, dict, list[BaseMessage]]]:
+    """(node, state, history) for every model call of a full reflection run."""
+    calls = []
+    state = {"topic": "How to become a software engineer", "critique": "", "generated_post": ""}
+    history: list[BaseMessage] = []
+    for attempt in range(1, attempts + 1):
+        calls.append(("generate", dict(state), list(history)))
+        post = f"Post draft {attempt}: " + "Learn the fundamentals, build projects, ship. " * 20
+        history.append(HumanMessage(content=f"Generated post (attempt {attempt}):\n\n{post}"))
+        state["generated_post"] = post
+        if attempt == attempts:
+            break
+        calls.append(("critique", dict(state), list(history)))
+        critique = f"SCORE: {5 + attempt}/10\nHook too weak. IMPROVEMENTS: 1. Add a code example 2. Shorter"
+        history.append(HumanMessage(content=f"Critique:\n\n{critique}"))
+        state["critique"] = critique
+    return calls
+
+
+def serialize(messages: list[BaseMessage]) -> str:
+    """Approximate the model server's chat-template rendering."""
+    return "".join(f"<|{m.type}|>{m.content}<|end|>" for m in messages)
+
+
+def prefix_reuse(prompts: list[str]) -> float:
+    """Share of prompt characters covered by the longest common prefix with an earlier prompt."""
+    reused = total = 0
+    for i, prompt in enumerate(prompts):
+        reused += max((len(os.path.commonprefix([earlier, prompt])) for earlier in prompts[:i]), default=0)
+        total += len(prompt)
+    return reused / total if total else 0.0
+
+
+def render_run(style: str, attempts: int) -> list[list[BaseMessage]]:
+    generate, critique = STYLES[style]
+    return [
+        (generate if node == "generate" else critique)(state, history)
+        for node, state, history in simulated_run(attempts)
+    ]
+
+
+def ollama_prompt_eval(style: str, attempts: int) -> int:
+    """Sum of prompt tokens Ollama actually evaluated over a run (cache misses)."""
+    llm = nodes.get_llm()
+    total = 0
+    for messages in render_run(style, attempts):
+        response = llm.invoke(messages)
+        total += response.response_metadata.get("prompt_eval_count") or 0
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--attempts", type=int, default=3)
+    parser.add_argument("--ollama", action="store_true", help="also measure prompt_eval_count on a local Ollama")
+    args = parser.parse_args()
+
+    state = {
+        "topic": "How to become a software engineer",
+        "critique": "SCORE: 6/10\nHook too weak. IMPROVEMENTS: 1. Add a code example",
+        "generated_post": "Draft post",
+    }
+    history = [HumanMessage(content="Generated post (attempt 1):\n\nDraft post")]
+
+    print(f"{'style':<13}{'generate us/call':>18}{'critique us/call':>18}{'prefix reuse':>14}")
+    for style, (generate, critique) in STYLES.items():
+        generate_us = timeit.timeit(lambda: generate(state, history), number=args.calls) / args.calls * 1e6
+        critique_us = timeit.timeit(lambda: critique(state, history), number=args.calls) / args.calls * 1e6
+        reuse = prefix_reuse([serialize(m) for m in render_run(style, args.attempts)])
+        print(f"{style:<13}{generate_us:>18.1f}{critique_us:>18.1f}{reuse:>13.1%}")
+
+    if args.ollama:
+        for style in STYLES:
+            print(f"{style}: Ollama prompt_eval_count over one run = {ollama_prompt_eval(style, args.attempts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Burst load against a local 429-returning stub: no limiter vs. RateLimiter.
+
+`--clients` RouterAgent requests start at once against a
+RateLimitedStubServer that serves `--server-rps` requests per second
+(bursts of `--server-burst`) and rejects the rest with 429. Scenarios:
+
+* none:      no limiter; every 429 fails its run;
+* aimd:      RateLimiter without a configured quota: jittered retries and
+             AIMD concurrency only;
+* aimd+rpm:  RateLimiter that also knows the quota (RPM bucket), so it
+             mostly waits instead of being rejected.
+
+Run from the repository root:
+
+    python projects/graph_benchmarks/bench_rate_limit.py [--clients 60 --server-rps 20]
+"""
+import argparse
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "Introduction_to_LangGraph/module-1/studio"))
+sys.path.insert(0, str(REPO_ROOT / "projects/graph_common"))
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from rate_limit import RateLimiter  # noqa: E402
+from stub_servers import RateLimitedStubServer, StubHTTPChatModel  # noqa: E402
+
+
+def scenario(name: str, args: argparse.Namespace) -> tuple[dict, Optional[dict], dict, float]:
+    from router import RouterAgent
+
+    limiter = None
+    if name != "none":
+        limiter = RateLimiter(
+            requests_per_minute=args.server_rps * 60 if name == "aimd+rpm" else None,
+            request_burst=args.server_burst,
+            max_concurrency=args.clients,
+            base_delay=0.1,
+            max_retries=8,
+        )
+    with RateLimitedStubServer(args.server_rps, args.server_burst, latency=args.latency) as server:
+        agent = RouterAgent(
+            llm=StubHTTPChatModel(base_url=server.url), single_flight=False, rate_limiter=limiter or False
+        )
+
+        def client(i: int) -> bool:
+            try:
+                agent.invoke([HumanMessage(content=f"question {i}")])
+                return True
+            except Exception:
+                return False
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            ok = sum(pool.map(client, range(args.clients)))
+        elapsed = time.perf_counter() - start
+        return {"ok": ok, "failed": args.clients - ok}, limiter.stats() if limiter else None, dict(server.counters), elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=60)
+    parser.add_argument("--server-rps", type=float, default=20)
+    parser.add_argument("--server-burst", type=float, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub response latency (s)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    logging.getLogger().setLevel(logging.ERROR)
+
+    print(f"{args.clients} concurrent requests, stub quota {args.server_rps:g} req/s (burst {args.server_burst:g})\n")
+    print(f"{'scenario':<10}{'ok':>5}{'failed':>8}{'429s':>7}{'retries':>9}{'max queue':>11}{'wait p95 ms':>13}{'final limit':>13}{'wall s':>8}")
+    for name in ("none", "aimd", "aimd+rpm"):
+        runs, stats, server, elapsed = scenario(name, args)
+        stats = stats or {}
+        print(
+            f"{name:<10}{runs['ok']:>5}{runs['failed']:>8}{server['throttled']:>7}{stats.get('retries', 0):>9}"
+            f"{stats.get('max_queue_depth', 0):>11}{stats.get('wait_p95_ms', 0):>13.0f}"
+            f"{stats.get('concurrency_limit', '-'):>13}{elapsed:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
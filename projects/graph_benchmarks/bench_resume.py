@@ -0,0 +1,117 @@
+"""Wasted model calls of LinkedInPostAgent batches under injected failures.
+
+A fake model fails each call with probability `--failure-rate`. The batch
+is retried until every topic has succeeded (or `--max-rounds` is
+reached):
+
+* restart: no checkpointer, failed topics are rerun from scratch;
+* resume:  SQLite checkpointer and run_many(resume=True), failed topics
+  continue from their last completed node.
+
+"wasted" counts every model call beyond what a failure-free batch makes;
+"redone" is the part of it that repeated calls which had already
+succeeded. Run from the repository root:
+
+    python projects/graph_benchmarks/bench_resume.py [--topics 20 --failure-rate 0.15]
+"""
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "sections/02_reflection_agent/projects"))
+sys.path.insert(0, str(REPO_ROOT / "projects/graph_common"))
+
+from langchain_core.messages import BaseMessage  # noqa: E402
+from langchain_core.outputs import ChatGenerationChunk, ChatResult  # noqa: E402
+from pydantic import PrivateAttr  # noqa: E402
+
+from fake_models import FakeChatModel  # noqa: E402
+
+
+class InjectedFailure(RuntimeError):
+    """Stands in for a dropped connection or a server error."""
+
+
+class FlakyChatModel(FakeChatModel):
+    """FakeChatModel whose calls fail with probability `failure_rate` (seeded)."""
+
+    failure_rate: float = 0.15
+    seed: int = 0
+    _rng: random.Random = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _counts: dict[str, int] = PrivateAttr(default_factory=lambda: {"calls": 0, "failures": 0})
+
+    def model_post_init(self, context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    def _maybe_fail(self) -> None:
+        with self._lock:
+            self._counts["calls"] += 1
+            failed = self._rng.random() < self.failure_rate
+            self._counts["failures"] += failed
+        if failed:
+            raise InjectedFailure("injected model failure")
+
+    def _generate(self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        self._maybe_fail()
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+    def _stream(
+        self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager: Any = None, **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        self._maybe_fail()
+        yield from super()._stream(messages, stop, run_manager, **kwargs)
+
+    @property
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+def run_batch(args: argparse.Namespace, failure_rate: float, checkpoint_path: Optional[str]) -> dict[str, Any]:
+    from graph import LinkedInPostAgent
+
+    llm = FlakyChatModel(latency=args.latency, failure_rate=failure_rate, seed=args.seed)
+    agent = LinkedInPostAgent(max_attempts=args.max_attempts, llm=llm, checkpointer=checkpoint_path or False)
+    pending = [f"topic {i}" for i in range(args.topics)]
+    rounds = 0
+    while pending and rounds < args.max_rounds:
+        rounds += 1
+        report = agent.run_many(pending, max_concurrency=args.concurrency, resume=checkpoint_path is not None)
+        pending = [r["topic"] for r in report["results"] if r["error"] is not None]
+    return {"rounds": rounds, "unfinished": len(pending), **llm.counts}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=20)
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--failure-rate", type=float, default=0.15)
+    parser.add_argument("--max-rounds", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    # The injected failures are logged as errors by every node and run
+    logging.disable(logging.CRITICAL)
+
+    needed = run_batch(args, 0.0, None)["calls"]
+    print(f"{args.topics} topics x max_attempts={args.max_attempts}: {needed} model calls without failures, "
+          f"failure rate {args.failure_rate:.0%}\n")
+    print(f"{'mode':<9}{'rounds':>7}{'unfinished':>11}{'calls':>7}{'failed':>8}{'wasted':>8}{'redone':>8}{'wasted %':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, path in (("restart", None), ("resume", str(Path(tmp) / "checkpoints.sqlite"))):
+            r = run_batch(args, args.failure_rate, path)
+            wasted = r["calls"] - needed
+            print(f"{mode:<9}{r['rounds']:>7}{r['unfinished']:>11}{r['calls']:>7}{r['failures']:>8}{wasted:>8}"
+                  f"{wasted - r['failures']:>8}{wasted / r['calls']:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Wall time and wasted tokens of the pipelined (speculative rewrite) reflection loop.
+
+LinkedInPostAgent runs the same topics one after another with the normal
+loop and with `pipelined=True`, where the rewrite of attempt N+1 starts
+while attempt N is critiqued and is discarded when the critic's score
+reaches the target. The fake critic draws scores from `--scores` with a
+fixed seed, so both modes see the same scores and make the same number
+of attempts. "wasted %" is the share of all model tokens (input +
+output) spent on discarded rewrites. Run from the repository root:
+
+    python projects/graph_benchmarks/bench_speculation.py [--topics 10 --generate-latency 0.3]
+"""
+import argparse
+import logging
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "sections/02_reflection_agent/projects"))
+sys.path.insert(0, str(REPO_ROOT / "projects/graph_common"))
+
+from langchain_core.callbacks import BaseCallbackHandler  # noqa: E402
+from langchain_core.messages import AIMessage, BaseMessage  # noqa: E402
+from langchain_core.outputs import LLMResult  # noqa: E402
+from pydantic import PrivateAttr  # noqa: E402
+
+from fake_models import FakeChatModel  # noqa: E402
+
+
+class RandomScoreCritic(FakeChatModel):
+    """FakeChatModel whose answers start with a seeded random "SCORE: n/10"."""
+
+    scores: tuple[int, ...] = (5, 6, 7, 8, 9)
+    seed: int = 0
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    def _respond(self, messages: list[BaseMessage], tools: Optional[list[dict]]) -> AIMessage:
+        message = super()._respond(messages, tools)
+        body = message.content[len(self.response_prefix):]
+        return AIMessage(content=f"SCORE: {self._rng.choice(self.scores)}/10\n{body}", usage_metadata=message.usage_metadata)
+
+
+class TokenCounter(BaseCallbackHandler):
+    """Input + output tokens of every call of the models it is attached to."""
+
+    def __init__(self):
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        usage = response.generations[0][0].message.usage_metadata or {}
+        with self._lock:
+            self.tokens += usage.get("total_tokens", 0)
+
+
+def run(args: argparse.Namespace, target: Optional[float], pipelined: bool) -> dict[str, Any]:
+    from graph import LinkedInPostAgent
+
+    counter = TokenCounter()
+    generator = FakeChatModel(latency=args.generate_latency, output_tokens=args.output_tokens, callbacks=[counter])
+    critic = RandomScoreCritic(
+        latency=args.critique_latency, output_tokens=args.output_tokens // 2, seed=args.seed, callbacks=[counter]
+    )
+    agent = LinkedInPostAgent(
+        max_attempts=args.max_attempts,
+        llm=generator,
+        node_models={"critique_post": critic},
+        target_score=target,
+        pipelined=pipelined,
+        single_flight=False,
+    )
+    attempts = 0
+    start = time.perf_counter()
+    for i in range(args.topics):
+        attempts += agent.run_stats(agent.run(f"topic {i}"))["attempts"]
+    elapsed = time.perf_counter() - start
+    # Discarded rewrites finish in the background; wait for their token counts
+    while agent.speculation_stats()["in_flight"]:
+        time.sleep(0.01)
+    return {**agent.speculation_stats(), "elapsed": elapsed, "attempts": attempts, "model_tokens": counter.tokens}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=10)
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--targets", type=float, nargs="+", default=[7, 8, 9, 11], help="11 = never reached")
+    parser.add_argument("--scores", type=int, nargs="+", default=[5, 6, 7, 8, 9])
+    parser.add_argument("--generate-latency", type=float, default=0.3)
+    parser.add_argument("--critique-latency", type=float, default=0.15)
+    parser.add_argument("--output-tokens", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    RandomScoreCritic.model_fields["scores"].default = tuple(args.scores)
+    logging.disable(logging.INFO)
+
+    print(f"{args.topics} topics, max_attempts={args.max_attempts}, generate {args.generate_latency}s, "
+          f"critique {args.critique_latency}s\n")
+    print(f"{'target':>7}{'attempts':>10}{'seq s':>8}{'pipe s':>8}{'saved':>8}{'discarded':>11}{'wasted tok':>12}{'wasted %':>10}")
+    for target in args.targets:
+        seq, pipe = run(args, target, False), run(args, target, True)
+        saved = 1 - pipe["elapsed"] / seq["elapsed"]
+        print(f"{target:>7g}{pipe['attempts']:>10}{seq['elapsed']:>8.2f}{pipe['elapsed']:>8.2f}{saved:>8.0%}"
+              f"{pipe['discarded']:>11}{pipe['wasted_tokens']:>12}{pipe['wasted_tokens'] / pipe['model_tokens']:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Startup-time benchmark: module import cost vs. first graph/model build.
+
+Each measurement runs in a fresh interpreter so nothing is already
+imported. Run from the repository root:
+
+    python projects/graph_benchmarks/bench_startup.py --repeat 5
+
+Use `--json` for machine-readable output that can be compared across commits
+(e.g. run once on the baseline commit and once on HEAD).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# (label, project directory, module to import, expression that builds the graph/model)
+TARGETS = [
+    ("reflection.nodes", "sections/02_reflection_agent/projects", "nodes", "nodes.get_default_llm()"),
+    ("reflection.graph", "sections/02_reflection_agent/projects", "graph", "graph.LinkedInPostAgent()"),
+    ("studio.simple", "Introduction_to_LangGraph/module-1/studio", "simple", "simple.graph"),
+    ("studio.router", "Introduction_to_LangGraph/module-1/studio", "router", "router.graph"),
+    ("studio.agent", "Introduction_to_LangGraph/module-1/studio", "agent", "agent.graph"),
+]
+
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+import {module}
+t1 = time.perf_counter()
+{build}
+t2 = time.perf_counter()
+print(json.dumps({{"import": t1 - t0, "build": t2 - t1}}))
+"""
+
+
+def measure(project_dir: str, module: str, build: str) -> dict[str, float]:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(str(REPO_ROOT / d) for d in (project_dir, "projects/graph_common"))}
+    # A placeholder key lets the Gemini client be constructed; no request is sent.
+    env.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, build=build)],
+        cwd=REPO_ROOT / project_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    for label, project_dir, module, build in TARGETS:
+        try:
+            runs = [measure(project_dir, module, build) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as e:
+            results[label] = {"error": e.stderr.strip().splitlines()[-1] if e.stderr else str(e)}
+            continue
+        results[label] = {
+            "import_ms": statistics.median(r["import"] for r in runs) * 1000,
+            "build_ms": statistics.median(r["build"] for r in runs) * 1000,
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'target':<20}{'import (ms)':>14}{'first build (ms)':>20}")
+    for label, r in results.items():
+        if "error" in r:
+            print(f"{label:<20}  error: {r['error']}")
+        else:
+            print(f"{label:<20}{r['import_ms']:>14.1f}{r['build_ms']:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
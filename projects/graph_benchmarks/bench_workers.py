@@ -0,0 +1,104 @@
+"""Scaling benchmark for GraphWorkerPool across process counts.
+
+With a zero-latency fake model, graph execution is pure Python work
+(state merging, reducers, message handling) and is bound by the GIL. This
+compares a thread pool in one process with GraphWorkerPool at 1, 2, 4, ...
+processes for LinkedInPostAgent.run and ReActAgent.invoke. Each worker
+builds its agent once, in warm-up, outside the timed part. Run from the
+repository root:
+
+    python projects/graph_benchmarks/bench_workers.py [--jobs 400 --processes 1 2 4 8]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "sections/02_reflection_agent/projects"))
+sys.path.insert(0, str(REPO_ROOT / "Introduction_to_LangGraph/module-1/studio"))
+sys.path.insert(0, str(REPO_ROOT / "projects/graph_common"))
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from fake_models import FakeChatModel  # noqa: E402
+from graph_common.worker_pool import GraphWorkerPool  # noqa: E402
+
+
+def _quiet() -> None:
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def make_reflection_agent(latency: float = 0.0, output_tokens: int = 50) -> Any:
+    """Worker factory: LinkedInPostAgent on a fake model."""
+    _quiet()
+    from graph import LinkedInPostAgent
+
+    return LinkedInPostAgent(max_attempts=3, llm=FakeChatModel(latency=latency, output_tokens=output_tokens))
+
+
+def make_react_agent(latency: float = 0.0, output_tokens: int = 50) -> Any:
+    """Worker factory: stateless ReActAgent on a fake model."""
+    _quiet()
+    from agent import ReActAgent
+
+    return ReActAgent(
+        llm=FakeChatModel(latency=latency, output_tokens=output_tokens), checkpointer=None, compaction=False
+    )
+
+
+TARGETS = {
+    # name: (factory, method, job input for i)
+    "reflection": ("bench_workers:make_reflection_agent", "run", lambda i: f"topic {i}"),
+    "react": ("bench_workers:make_react_agent", "invoke", lambda i: [HumanMessage(content=f"What is {i} times 2?")]),
+}
+
+
+def run_threads(name: str, jobs: list[Any], threads: int, factory_kwargs: dict[str, Any]) -> float:
+    factory, method, _ = TARGETS[name]
+    agent = globals()[factory.split(":")[1]](**factory_kwargs)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(getattr(agent, method), jobs))
+    return time.perf_counter() - start
+
+
+def run_processes(name: str, jobs: list[Any], processes: int, factory_kwargs: dict[str, Any]) -> float:
+    factory, method, _ = TARGETS[name]
+    with GraphWorkerPool(factory, processes=processes, method=method, factory_kwargs=factory_kwargs) as pool:
+        pool.warm_up()
+        start = time.perf_counter()
+        list(pool.map(jobs, chunksize=4))
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graphs", nargs="+", default=list(TARGETS))
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--processes", type=int, nargs="+", default=None, help="default: 1, 2, 4, ... up to the core count")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake model latency per call (s)")
+    args = parser.parse_args()
+    _quiet()
+
+    cores = os.cpu_count() or 1
+    counts = args.processes or sorted({min(2**i, cores) for i in range(cores.bit_length() + 1)})
+    factory_kwargs = {"latency": args.latency}
+    print(f"{args.jobs} jobs per run, {cores} cores, fake latency {args.latency}s\n")
+    print(f"{'graph':<12}{'runner':<14}{'jobs/s':>10}{'speedup':>10}")
+    for name in args.graphs:
+        jobs = [TARGETS[name][2](i) for i in range(args.jobs)]
+        baseline = args.jobs / run_threads(name, jobs, max(counts), factory_kwargs)
+        print(f"{name:<12}{f'{max(counts)} threads':<14}{baseline:>10.1f}{1:>9.2f}x")
+        for processes in counts:
+            rate = args.jobs / run_processes(name, jobs, processes, factory_kwargs)
+            print(f"{name:<12}{f'{processes} processes':<14}{rate:>10.1f}{rate / baseline:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
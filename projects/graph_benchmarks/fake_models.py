@@ -0,0 +1,114 @@
+"""Deterministic fake chat models for offline graph benchmarks.
+
+`FakeChatModel` answers after a configurable latency with a fixed number
+of output tokens. When tools are bound it plays a scripted ReAct turn:
+the first call on a human message requests `tool_calls_per_turn` tool
+calls, and the call after the tool results gives the final answer.
+"""
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Sequence
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+
+class FakeChatModel(BaseChatModel):
+    latency: float = 0.05
+    output_tokens: int = 50
+    response_prefix: str = "SCORE: 6/10\n"
+    tool_calls_per_turn: int = 1
+    model: str = "fake-chat"
+    temperature: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark-chat-model"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model": self.model, "temperature": self.temperature}
+
+    def bind_tools(self, tools: Sequence[Callable | dict], **kwargs: Any) -> Runnable:
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _respond(self, messages: list[BaseMessage], tools: Optional[list[dict]]) -> AIMessage:
+        input_tokens = count_tokens_approximately(messages)
+        usage = {
+            "input_tokens": input_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": input_tokens + self.output_tokens,
+        }
+        if tools and not isinstance(messages[-1], ToolMessage):
+            tool_calls = []
+            for i in range(self.tool_calls_per_turn):
+                function = tools[i % len(tools)]["function"]
+                args = {name: 2.0 for name in function["parameters"].get("required", [])}
+                tool_calls.append({"name": function["name"], "args": args, "id": f"call_{len(messages)}_{i}"})
+            return AIMessage(content="", tool_calls=tool_calls, usage_metadata=usage)
+        content = self.response_prefix + " ".join(["token"] * self.output_tokens)
+        return AIMessage(content=content, usage_metadata=usage)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, kwargs.get("tools")))])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, kwargs.get("tools")))])
+
+    def _chunks(self, message: AIMessage) -> list[AIMessageChunk]:
+        if message.tool_calls or not message.content:
+            tool_call_chunks = [
+                {"name": tc["name"], "args": json.dumps(tc["args"]), "id": tc["id"], "index": i}
+                for i, tc in enumerate(message.tool_calls)
+            ]
+            return [AIMessageChunk(content="", tool_call_chunks=tool_call_chunks, usage_metadata=message.usage_metadata)]
+        words = message.content.split(" ")
+        chunks = [AIMessageChunk(content=word + (" " if i < len(words) - 1 else "")) for i, word in enumerate(words)]
+        chunks[-1].usage_metadata = message.usage_metadata
+        return chunks
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        for chunk in self._chunks(self._respond(messages, kwargs.get("tools"))):
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        for chunk in self._chunks(self._respond(messages, kwargs.get("tools"))):
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
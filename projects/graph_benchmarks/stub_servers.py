@@ -0,0 +1,267 @@
+"""Local HTTP stub servers for testing the agents' network behaviour offline.
+
+`OllamaStubServer` mimics the parts of the Ollama API that ChatOllama and
+the warm-up use (/api/chat, /api/generate). It simulates model loading
+(`load_delay` on the first request or after `keep_alive` expired) and counts
+TCP connections, so cold starts and connection reuse can be measured.
+
+`RateLimitedStubServer` is a tiny chat endpoint with its own token-bucket
+quota that answers 429 (with Retry-After) once the quota is used up, like
+Gemini does under burst load. `StubHTTPChatModel` is the matching LangChain
+chat model: it posts the prompt to the stub with httpx and raises
+`httpx.HTTPStatusError` on 429, so the agents' rate limiting can be tested
+end to end without any real upstream.
+"""
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional, Sequence
+
+import httpx
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, get_buffer_string
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the default of 5 refuses connections under burst load
+
+
+class StubServer:
+    """Run a ThreadingHTTPServer on a free localhost port in a daemon thread."""
+
+    def __init__(self, handler: type[BaseHTTPRequestHandler]):
+        self._server = _Server(("127.0.0.1", 0), handler)
+        self._server.stub = self  # reachable from handlers as self.server.stub
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+class _JSONHandler(BaseHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:  # keep benchmark output clean
+        pass
+
+    def _read_json(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, status: int, body: Any, headers: Optional[dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _RateLimitedHandler(_JSONHandler):
+    def do_POST(self) -> None:
+        stub: RateLimitedStubServer = self.server.stub
+        body = self._read_json()
+        retry_after = stub.admit()
+        if retry_after is not None:
+            self._send_json(
+                429,
+                {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED", "message": "Quota exceeded"}},
+                {"Retry-After": f"{retry_after:.3f}"} if stub.send_retry_after else None,
+            )
+            return
+        time.sleep(stub.latency)
+        prompt_tokens = int(body.get("prompt_tokens", 0))
+        self._send_json(200, {
+            "content": f"stub answer #{stub.counters['served']}",
+            "usage": {"input_tokens": prompt_tokens, "output_tokens": 20, "total_tokens": prompt_tokens + 20},
+        })
+
+
+class RateLimitedStubServer(StubServer):
+    """Chat stub allowing `requests_per_second` with bursts of `burst`; excess requests get 429."""
+
+    def __init__(self, requests_per_second: float = 10, burst: float = 5, latency: float = 0.05, send_retry_after: bool = False):
+        super().__init__(_RateLimitedHandler)
+        self.rate = requests_per_second
+        self.burst = burst
+        self.latency = latency
+        self.send_retry_after = send_retry_after
+        self.counters = {"requests": 0, "served": 0, "throttled": 0}
+        self._level = burst
+        self._updated = time.monotonic()
+
+    def admit(self) -> Optional[float]:
+        """None if the request may proceed, else seconds until a slot frees up."""
+        with self.lock:
+            now = time.monotonic()
+            self._level = min(self.burst, self._level + (now - self._updated) * self.rate)
+            self._updated = now
+            self.counters["requests"] += 1
+            if self._level >= 1:
+                self._level -= 1
+                self.counters["served"] += 1
+                return None
+            self.counters["throttled"] += 1
+            return (1 - self._level) / self.rate
+
+
+class StubHTTPChatModel(BaseChatModel):
+    """Chat model backed by a stub server's POST / endpoint."""
+
+    base_url: str
+    timeout: float = 30.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-http-chat-model"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"base_url": self.base_url}
+
+    def bind_tools(self, tools: Sequence[Callable | dict], **kwargs: Any) -> Runnable:
+        return self  # the stub never calls tools
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        payload = {"prompt": get_buffer_string(messages), "prompt_tokens": count_tokens_approximately(messages)}
+        response = httpx.post(self.base_url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        body = response.json()
+        message = AIMessage(content=body["content"], usage_metadata=body["usage"])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _keep_alive_seconds(value: Any, default: float = 300.0) -> float:
+    """Ollama keep_alive ("30m", "10s", "1h", seconds; negative = forever) in seconds."""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float("inf") if value < 0 else float(value)
+    match = re.fullmatch(r"(-?\d+(?:\.\d+)?)(ms|s|m|h)?", str(value).strip())
+    if match is None:
+        return default
+    number = float(match.group(1))
+    if number < 0:
+        return float("inf")
+    return number * {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}[match.group(2)]
+
+
+class _OllamaHandler(_JSONHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is visible
+
+    def setup(self) -> None:
+        super().setup()
+        stub: OllamaStubServer = self.server.stub
+        with stub.lock:
+            stub.counters["connections"] += 1
+
+    def _final(self, model: str, load: float, start: float, prompt_tokens: int, eval_count: int) -> dict[str, Any]:
+        return {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int((time.perf_counter() - start) * 1e9),
+            "load_duration": int(load * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": 0,
+            "eval_count": eval_count,
+            "eval_duration": 0,
+        }
+
+    def do_POST(self) -> None:
+        stub: OllamaStubServer = self.server.stub
+        start = time.perf_counter()
+        body = self._read_json()
+        model = body.get("model", "")
+        with stub.lock:
+            stub.counters["requests"] += 1
+        load = stub.load(model, body.get("keep_alive"))
+
+        if self.path == "/api/generate":
+            text = "" if not body.get("prompt") else "stub completion"
+            self._send_json(200, {**self._final(model, load, start, 0, 0), "response": text})
+            return
+        if self.path != "/api/chat":
+            self._send_json(404, {"error": f"unknown endpoint {self.path}"})
+            return
+
+        prompt_tokens = sum(len(str(m.get("content", ""))) // 4 for m in body.get("messages", []))
+        words = [f"word{i}" for i in range(stub.output_tokens)]
+        final = self._final(model, load, start, prompt_tokens, len(words))
+        if not body.get("stream", True):
+            time.sleep(stub.token_latency * len(words))
+            message = {"role": "assistant", "content": " ".join(words)}
+            self._send_json(200, {**final, "message": message})
+            return
+
+        # Streamed NDJSON like the real server
+        lines = []
+        for i, word in enumerate(words):
+            content = word + (" " if i < len(words) - 1 else "")
+            lines.append({"model": model, "created_at": final["created_at"], "message": {"role": "assistant", "content": content}, "done": False})
+        lines.append({**final, "message": {"role": "assistant", "content": ""}})
+        time.sleep(stub.token_latency * len(words))
+        data = b"".join(json.dumps(line).encode() + b"\n" for line in lines)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class OllamaStubServer(StubServer):
+    """Ollama API stub with simulated model loading and keep_alive expiry."""
+
+    def __init__(self, load_delay: float = 1.0, token_latency: float = 0.001, output_tokens: int = 50):
+        super().__init__(_OllamaHandler)
+        self.load_delay = load_delay
+        self.token_latency = token_latency
+        self.output_tokens = output_tokens
+        self.counters = {"requests": 0, "connections": 0, "loads": 0}
+        self._loaded_until: dict[str, float] = {}
+        self._load_lock = threading.Lock()
+
+    def load(self, model: str, keep_alive: Any) -> float:
+        """Load `model` if needed and extend its keep-alive; return the load time."""
+        with self._load_lock:  # the server loads one model at a time
+            now = time.monotonic()
+            load = 0.0
+            if self._loaded_until.get(model, 0.0) <= now:
+                time.sleep(self.load_delay)
+                load = self.load_delay
+                with self.lock:
+                    self.counters["loads"] += 1
+            self._loaded_until[model] = time.monotonic() + _keep_alive_seconds(keep_alive)
+            return load
@@ -0,0 +1,4 @@
+"""Helpers shared by the course projects (the studio agents and the reflection agent).
+
+Import the modules directly, e.g. `from graph_common.stats import percentile`.
+"""
@@ -0,0 +1,249 @@
+# instrumentation.py
+import json
+import threading
+import time
+from typing import Any, Mapping, Optional, Protocol
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from graph_common.stats import percentile
+
+
+class MetricsSink(Protocol):
+    def emit(self, record: dict[str, Any]) -> None: ...
+
+
+class JSONLSink:
+    """Append one JSON object per finished node run to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class PrometheusSink:
+    """Aggregate node metrics and render them in the Prometheus text format.
+
+    Serve `render()` from an HTTP handler or `write()` it to a file for the
+    node_exporter textfile collector.
+    """
+
+    METRICS = (
+        ("runs_total", "counter", "Node runs"),
+        ("duration_seconds_total", "counter", "Node wall time"),
+        ("model_seconds_total", "counter", "Time spent in model calls"),
+        ("model_calls_total", "counter", "Model calls"),
+        ("input_tokens_total", "counter", "Model input tokens"),
+        ("output_tokens_total", "counter", "Model output tokens"),
+    )
+
+    def __init__(self, prefix: str = "langgraph_node"):
+        self.prefix = prefix
+        self._values: dict[tuple[str, str], dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            values = self._values.setdefault((record["graph"], record["node"]), {name: 0.0 for name, _, _ in self.METRICS})
+            values["runs_total"] += 1
+            values["duration_seconds_total"] += record["wall_ms"] / 1000
+            values["model_seconds_total"] += record["model_ms"] / 1000
+            values["model_calls_total"] += record["model_calls"]
+            values["input_tokens_total"] += record["input_tokens"]
+            values["output_tokens_total"] += record["output_tokens"]
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, kind, help_text in self.METRICS:
+                metric = f"{self.prefix}_{name}"
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+                for (graph, node), values in sorted(self._values.items()):
+                    lines.append(f'{metric}{{graph="{graph}",node="{node}"}} {values[name]:g}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+
+
+class SummarySink:
+    """Aggregate node metrics in memory for a per-node latency and cost report.
+
+    `report(prices)` returns one row per (graph, node, model) with latency
+    percentiles, token totals and, given prices as {model: (input, output)}
+    USD per 1M tokens, the cost of the node's model calls.
+    """
+
+    def __init__(self):
+        self._rows: dict[tuple[str, str, str], dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, record: dict[str, Any]) -> None:
+        key = (record["graph"], record["node"], record.get("model", ""))
+        with self._lock:
+            row = self._rows.setdefault(key, {
+                "wall_ms": [], "model_ms": [], "model_calls": 0, "input_tokens": 0, "output_tokens": 0, "errors": 0,
+            })
+            row["wall_ms"].append(record["wall_ms"])
+            row["model_ms"].append(record["model_ms"])
+            row["model_calls"] += record["model_calls"]
+            row["input_tokens"] += record["input_tokens"]
+            row["output_tokens"] += record["output_tokens"]
+            row["errors"] += record["error"] is not None
+
+    def report(self, prices: Optional[Mapping[str, tuple[float, float]]] = None) -> list[dict[str, Any]]:
+        prices = prices or {}
+        with self._lock:
+            rows = {key: {**row, "wall_ms": list(row["wall_ms"]), "model_ms": list(row["model_ms"])} for key, row in self._rows.items()}
+        report = []
+        for (graph, node, model), row in sorted(rows.items()):
+            input_price, output_price = prices.get(model, (0.0, 0.0))
+            report.append({
+                "graph": graph,
+                "node": node,
+                "model": model,
+                "runs": len(row["wall_ms"]),
+                "errors": row["errors"],
+                "model_calls": row["model_calls"],
+                "wall_p50_ms": percentile(row["wall_ms"], 50),
+                "wall_p95_ms": percentile(row["wall_ms"], 95),
+                "model_ms_total": sum(row["model_ms"]),
+                "input_tokens": row["input_tokens"],
+                "output_tokens": row["output_tokens"],
+                "cost_usd": (row["input_tokens"] * input_price + row["output_tokens"] * output_price) / 1e6,
+            })
+        return report
+
+
+class InstrumentationHandler(BaseCallbackHandler):
+    """Callback handler emitting one record per graph node run.
+
+    Each record holds the node's wall time, the time spent in model calls
+    made inside it, their input/output token counts, the model(s) they used
+    and, for the reflection graph, the attempt number. Attach it when the graph is built, e.g.
+    `graph.with_config(callbacks=[handler])`.
+    """
+
+    def __init__(self, sink: MetricsSink, graph_name: str = "graph"):
+        self.sink = sink
+        self.graph_name = graph_name
+        self._nodes: dict[UUID, dict[str, Any]] = {}
+        self._owner: dict[UUID, UUID] = {}  # run id -> node run it belongs to
+        self._model_starts: dict[UUID, float] = {}
+        self._lock = threading.Lock()
+
+    def _node_run(self, run_id: UUID, parent_run_id: Optional[UUID]) -> Optional[UUID]:
+        if parent_run_id is None:
+            return None
+        owner = self._owner.get(parent_run_id)
+        if owner is not None:
+            self._owner[run_id] = owner
+        return owner
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        with self._lock:
+            if self._node_run(run_id, parent_run_id) is not None or node is None or kwargs.get("name") != node:
+                return
+            self._owner[run_id] = run_id
+            self._nodes[run_id] = {
+                "node": node,
+                "start": time.perf_counter(),
+                "model_ms": 0.0,
+                "model_calls": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "models": set(),
+                "attempt": inputs.get("num_attempts") if isinstance(inputs, dict) else None,
+            }
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, outputs, error=None)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, None, error=error)
+
+    def _finish(self, run_id: UUID, outputs: Any, error: Optional[BaseException]) -> None:
+        with self._lock:
+            self._owner.pop(run_id, None)
+            node = self._nodes.pop(run_id, None)
+        if node is None:
+            return
+        attempt = node["attempt"]
+        if isinstance(outputs, dict) and "num_attempts" in outputs:
+            attempt = outputs["num_attempts"]
+        self.sink.emit({
+            "ts": time.time(),
+            "graph": self.graph_name,
+            "node": node["node"],
+            "attempt": attempt,
+            "wall_ms": (time.perf_counter() - node["start"]) * 1000,
+            "model_ms": node["model_ms"],
+            "model_calls": node["model_calls"],
+            "input_tokens": node["input_tokens"],
+            "output_tokens": node["output_tokens"],
+            "model": ",".join(sorted(node["models"])),
+            "error": None if error is None else type(error).__name__,
+        })
+
+    def on_chat_model_start(
+        self, serialized: dict[str, Any], messages: Any, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any
+    ) -> None:
+        model = (kwargs.get("metadata") or {}).get("ls_model_name") or (kwargs.get("invocation_params") or {}).get("model")
+        with self._lock:
+            owner = self._node_run(run_id, parent_run_id)
+            if owner is not None:
+                self._model_starts[run_id] = time.perf_counter()
+                if model and owner in self._nodes:
+                    self._nodes[owner]["models"].add(str(model))
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            owner = self._owner.pop(run_id, None)
+            start = self._model_starts.pop(run_id, None)
+            node = self._nodes.get(owner) if owner is not None else None
+            if node is None or start is None:
+                return
+            node["model_ms"] += (time.perf_counter() - start) * 1000
+            node["model_calls"] += 1
+            input_tokens, output_tokens = _token_usage(response)
+            node["input_tokens"] += input_tokens
+            node["output_tokens"] += output_tokens
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._owner.pop(run_id, None)
+            self._model_starts.pop(run_id, None)
+
+
+def _token_usage(response: LLMResult) -> tuple[int, int]:
+    """Input/output tokens from usage_metadata, falling back to llm_output."""
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+    if not (input_tokens or output_tokens) and response.llm_output:
+        usage = response.llm_output.get("token_usage") or {}
+        input_tokens = usage.get("prompt_tokens", 0)
+        output_tokens = usage.get("completion_tokens", 0)
+    return input_tokens, output_tokens
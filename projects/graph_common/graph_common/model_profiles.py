@@ -0,0 +1,77 @@
+# model_profiles.py
+from typing import Any, Callable, Mapping, Optional, TypedDict, Union
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+
+class ModelProfile(TypedDict):
+    model: str
+    temperature: float
+    input_cost: float  # USD per 1M input tokens (0 for local models)
+    output_cost: float  # USD per 1M output tokens
+
+
+# A node is configured with a profile name or a ready model instance
+NodeModel = Union[str, BaseChatModel]
+
+
+class ProfileRegistry:
+    """Named model profiles and the function that builds a chat model for one.
+
+    Each project keeps its own profiles (Gemini, Ollama) and builder; this
+    class owns the lookup, per-node resolution and price table.
+    """
+
+    def __init__(self, profiles: dict[str, ModelProfile], build: Callable[..., BaseChatModel]):
+        self.profiles = profiles
+        self._build = build
+
+    def register(
+        self, name: str, model: str, temperature: float = 0.0, input_cost: float = 0.0, output_cost: float = 0.0
+    ) -> ModelProfile:
+        """Add or replace a named profile."""
+        profile: ModelProfile = {
+            "model": model,
+            "temperature": temperature,
+            "input_cost": input_cost,
+            "output_cost": output_cost,
+        }
+        self.profiles[name] = profile
+        return profile
+
+    def get(self, name: str) -> ModelProfile:
+        try:
+            return self.profiles[name]
+        except KeyError:
+            raise KeyError(f"Unknown model profile {name!r}; known profiles: {sorted(self.profiles)}") from None
+
+    def build(self, name: str, **kwargs: Any) -> BaseChatModel:
+        """Chat model for the named profile; `kwargs` go to the project's builder."""
+        return self._build(self.get(name), **kwargs)
+
+    def resolve_node_models(
+        self,
+        node_models: Optional[Mapping[str, NodeModel]],
+        nodes: tuple[str, ...],
+        default: Optional[BaseChatModel],
+        **kwargs: Any,
+    ) -> dict[str, Optional[BaseChatModel]]:
+        """Model for every node in `nodes`: its entry in `node_models`, else `default`."""
+        node_models = node_models or {}
+        unknown = set(node_models) - set(nodes)
+        if unknown:
+            raise ValueError(f"No model-calling nodes named {sorted(unknown)}; configurable nodes: {list(nodes)}")
+        resolved = {}
+        for node in nodes:
+            choice = node_models.get(node, default)
+            resolved[node] = self.build(choice, **kwargs) if isinstance(choice, str) else choice
+        return resolved
+
+    def prices(self) -> dict[str, tuple[float, float]]:
+        """(input, output) USD per 1M tokens by model name, for SummarySink.report."""
+        return {p["model"]: (p["input_cost"], p["output_cost"]) for p in self.profiles.values()}
+
+
+def builds_profile_models(node_models: Optional[Mapping[str, NodeModel]]) -> bool:
+    """True when some node's model is built from a profile rather than passed in."""
+    return any(isinstance(choice, str) for choice in (node_models or {}).values())
@@ -0,0 +1,154 @@
+# single_flight.py
+import asyncio
+import hashlib
+import json
+import threading
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional, TypeVar, Union
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Share one execution between concurrent calls with the same key.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait and receive the same result (or exception). Nothing is
+    cached afterwards. Shared results are the same object for every caller,
+    so treat them as read-only. `ado` does the same for coroutines running
+    on one event loop.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, _Call] = {}
+        self._async_calls: dict[tuple[int, str], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._executions = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            self._requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executions += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async version of `do`; only calls on the same event loop are joined."""
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            self._requests += 1
+            future = self._async_calls.get(loop_key)
+            leader = future is None
+            if leader:
+                future = self._async_calls[loop_key] = loop.create_future()
+                self._executions += 1
+
+        if not leader:
+            # A waiter that is cancelled must not cancel the shared call
+            return await asyncio.shield(future)
+
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Marks the exception as retrieved when no other caller is waiting
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._async_calls[loop_key]
+
+    def stats(self) -> dict[str, int]:
+        """Requests seen, executions started, requests coalesced and keys in flight."""
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "executions": self._executions,
+                "coalesced": self._requests - self._executions,
+                "in_flight": len(self._calls) + len(self._async_calls),
+            }
+
+
+@lru_cache(maxsize=1)
+def shared_single_flight() -> SingleFlight:
+    """The SingleFlight shared by every agent in the process."""
+    return SingleFlight()
+
+
+def resolve_single_flight(option: Union[bool, SingleFlight]) -> Optional[SingleFlight]:
+    """True = the shared SingleFlight, False = no coalescing, or a given instance.
+
+    Keys carry the model settings and the request, so agents with different
+    configurations never share a result through the shared instance.
+    """
+    if isinstance(option, SingleFlight):
+        return option
+    return shared_single_flight() if option else None
+
+
+def model_config_key(llm: Optional[BaseChatModel]) -> str:
+    """The model's class and parameters, as LangChain's response caches key them.
+
+    The model name and temperature are added explicitly: integrations that
+    report no identifying parameters (plain ChatOllama) leave them out of
+    their llm_string.
+    """
+    if llm is None:
+        return "default"
+    try:
+        llm_string = llm._get_llm_string()
+    except Exception:
+        llm_string = repr(llm)
+    model = getattr(llm, "model", None) or getattr(llm, "model_name", None)
+    return json.dumps([llm_string, model, getattr(llm, "temperature", None)], default=str)
+
+
+def _normalise(part: Any) -> Any:
+    # Message ids differ per client even for the same prompt, so only the content counts
+    if isinstance(part, BaseMessage):
+        return [part.type, part.content, getattr(part, "tool_calls", None)]
+    if isinstance(part, (list, tuple)):
+        return [_normalise(p) for p in part]
+    return part
+
+
+def request_key(*parts: Any) -> str:
+    """Stable hash of the request parts (messages, topic, model config, ...)."""
+    normalised = [_normalise(part) for part in parts]
+    return hashlib.sha256(json.dumps(normalised, sort_keys=True, default=str).encode()).hexdigest()
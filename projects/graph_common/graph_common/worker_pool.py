@@ -0,0 +1,100 @@
+# worker_pool.py
+import importlib
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# The object built by the factory, once per worker process
+_target: Any = None
+
+
+def load_factory(spec: str):
+    """Resolve a "package.module:callable" spec."""
+    module_name, _, attr = spec.partition(":")
+    if not module_name or not attr:
+        raise ValueError(f"factory must look like 'module:callable', got {spec!r}")
+    obj = importlib.import_module(module_name)
+    for part in attr.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _init_worker(factory: str, factory_kwargs: dict[str, Any]) -> None:
+    global _target
+    start = time.perf_counter()
+    _target = load_factory(factory)(**factory_kwargs)
+    logger.info(f"Worker {os.getpid()} built {factory} in {time.perf_counter() - start:.2f}s")
+
+
+def _call(method: str, args: tuple, kwargs: dict[str, Any]) -> Any:
+    return getattr(_target, method)(*args, **kwargs)
+
+
+def _ping(delay: float) -> int:
+    time.sleep(delay)
+    return os.getpid()
+
+
+class GraphWorkerPool:
+    """Run graph invocations on a pool of processes.
+
+    Every worker calls `factory` (a "module:callable" spec, e.g.
+    "graph:LinkedInPostAgent") once at start-up and keeps the result; jobs
+    then call `method` on it ("run" for LinkedInPostAgent, "invoke" for
+    the studio agents or a compiled graph). Arguments and results must be
+    picklable. Use it when Python-side graph overhead, not the model,
+    limits throughput: each process has its own GIL.
+    """
+
+    def __init__(
+        self,
+        factory: str,
+        processes: Optional[int] = None,
+        method: str = "invoke",
+        factory_kwargs: Optional[dict[str, Any]] = None,
+        mp_context: Optional[str] = None,
+    ):
+        self.factory = factory
+        self.processes = processes or os.cpu_count() or 1
+        self.method = method
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context(mp_context) if mp_context else None,
+            initializer=_init_worker,
+            initargs=(factory, factory_kwargs or {}),
+        )
+        logger.info(f"Started GraphWorkerPool with {self.processes} processes for {factory}.{method}")
+
+    def warm_up(self, timeout: Optional[float] = None) -> set[int]:
+        """Start every worker (building its graph) before the first real job.
+
+        Returns the worker pids seen; the short sleep spreads the pings over
+        all processes.
+        """
+        futures = [self._executor.submit(_ping, 0.05) for _ in range(self.processes)]
+        return {f.result(timeout=timeout) for f in futures}
+
+    def submit(self, *args: Any, **kwargs: Any) -> Future:
+        """Schedule `target.method(*args, **kwargs)` on a worker."""
+        return self._executor.submit(_call, self.method, args, kwargs)
+
+    def map(self, inputs: Iterable[Any], chunksize: int = 1) -> Iterator[Any]:
+        """Call `method` with each input as its single argument; results keep input order."""
+        inputs = list(inputs)
+        return self._executor.map(
+            _call, [self.method] * len(inputs), [(x,) for x in inputs], [{}] * len(inputs), chunksize=chunksize
+        )
+
+    def close(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "GraphWorkerPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,187 @@
+# cache.py
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """Content address of a model call.
+
+    `llm_string` is LangChain's serialisation of the model parameters and
+    `prompt` the serialised rendered messages, so identical calls map to the
+    same key. Only parameters the model reports end up in `llm_string`:
+    plain ChatOllama reports none, not even the model name, which is why
+    ollama_client builds PooledChatOllama.
+    """
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class _CounterMixin:
+    """Hit/miss/eviction counters shared by the cache backends."""
+
+    def _reset_counters(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self),
+        }
+
+
+class InMemoryLRUCache(_CounterMixin, BaseCache):
+    """In-process LRU response cache with optional TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, RETURN_VAL_TYPE]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = cache_key(prompt, llm_string)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.time() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        with self._lock:
+            self._entries[key] = (time.time(), return_val)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteResponseCache(_CounterMixin, BaseCache):
+    """On-disk response cache that survives restarts.
+
+    Entries are evicted least-recently-used once `max_entries` is
+    exceeded, and treated as misses once older than `ttl` seconds.
+    """
+
+    def __init__(self, path: str = ".llm_cache.sqlite", max_entries: int = 100_000, ttl: Optional[float] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+        self._reset_counters()
+        logger.info(f"Opened SQLite response cache at {path}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return loads(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        value = dumps(list(return_val))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+def cache_from_env() -> Optional[BaseCache]:
+    """Build the response cache selected by the LLM_CACHE environment variable.
+
+    LLM_CACHE: "memory" (default), "sqlite" or "off".
+    LLM_CACHE_PATH / LLM_CACHE_MAX_ENTRIES / LLM_CACHE_TTL tune the backend.
+    """
+    backend = os.getenv("LLM_CACHE", "memory").lower()
+    ttl = float(os.environ["LLM_CACHE_TTL"]) if os.getenv("LLM_CACHE_TTL") else None
+    if backend == "off":
+        return None
+    if backend == "memory":
+        return InMemoryLRUCache(max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")), ttl=ttl)
+    if backend == "sqlite":
+        return SQLiteResponseCache(
+            path=os.getenv("LLM_CACHE_PATH", ".llm_cache.sqlite"),
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "100000")),
+            ttl=ttl,
+        )
+    raise ValueError(f"Unknown LLM_CACHE backend: {backend}")
@@ -0,0 +1,46 @@
+# checkpointing.py
+import sqlite3
+from typing import Optional, Union
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+DEFAULT_CHECKPOINT_PATH = "reflection_checkpoints.sqlite"
+
+
+def sqlite_checkpointer(path: str = DEFAULT_CHECKPOINT_PATH) -> BaseCheckpointSaver:
+    """SQLite saver persisted at `path`, shared safely by the threads of run_many
+    and usable from `arun` / `arun_many` as well."""
+    try:
+        from sqlite_saver import ThreadedSqliteSaver
+    except ImportError as e:
+        raise ImportError(
+            "SQLite checkpoints need the langgraph-checkpoint-sqlite package (pip install langgraph-checkpoint-sqlite)"
+        ) from e
+    return ThreadedSqliteSaver(sqlite3.connect(path, check_same_thread=False))
+
+
+def is_sync_only(saver: Optional[BaseCheckpointSaver]) -> bool:
+    """True for a plain SqliteSaver, whose async methods raise NotImplementedError."""
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+
+        from sqlite_saver import ThreadedSqliteSaver
+    except ImportError:
+        return False
+    return isinstance(saver, SqliteSaver) and not isinstance(saver, ThreadedSqliteSaver)
+
+
+def resolve_checkpointer(option: Union[bool, str, BaseCheckpointSaver, None]) -> Optional[BaseCheckpointSaver]:
+    """Map an agent's `checkpointer` argument to a saver.
+
+    True uses SQLite at DEFAULT_CHECKPOINT_PATH, a string is a SQLite path,
+    a saver instance (e.g. InMemorySaver) is used as is and False/None
+    disables checkpointing.
+    """
+    if isinstance(option, BaseCheckpointSaver):
+        return option
+    if option is True:
+        return sqlite_checkpointer()
+    if isinstance(option, str):
+        return sqlite_checkpointer(option)
+    return None
@@ -1,28 +1,125 @@
+import asyncio
 import json
 import logging
-from typing import Literal, Optional
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Iterable, Iterator, Literal, Mapping, Optional, Union
 
-from langchain_core.messages import BaseMessage  # For type checking
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from graph_common.instrumentation import InstrumentationHandler
+from graph_common.model_profiles import NodeModel
+from graph_common.single_flight import SingleFlight, model_config_key, request_key, resolve_single_flight
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage  # For type checking
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
 
-from nodes import critique_post, generate_post
-from states import AgentState
+from checkpointing import is_sync_only, resolve_checkpointer
+from history import HistoryPolicy
+from ollama_profiles import PROFILES, warm_up_profile
+from nodes import (
+    SpeculationTracker,
+    acritique_candidates,
+    acritique_post,
+    agenerate_candidate,
+    agenerate_post,
+    apipelined_critique,
+    aprepare_round,
+    critique_candidates,
+    critique_post,
+    generate_candidate,
+    generate_post,
+    get_default_llm,
+    pipelined_critique,
+    prepare_round,
+    warm_up_default_llm,
+)
+from results_writer import ResultsWriter
+from states import AgentState, BatchRunReport, PostChunk, RunStats, SpeculationStats, TopicRunResult
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class LinkedInPostAgent:
+
+    # Model slots per node; each can get its own model through `node_models`
+    MODEL_NODES = (
+        "generate_post",
+        "critique_post",
+        "speculate_post",  # the rewrite inside the pipelined critique_post (default: generate_post's model)
+        "generate_candidate",
+        "critique_candidates",
+        "prepare_round",
+    )
+
     def __init__(
         self,
         max_attempts: int = 3,
+        llm: Optional[BaseChatModel] = None,
+        use_async_nodes: bool = False,
+        history_policy: Optional[HistoryPolicy] = None,
+        target_score: Optional[float] = None,
+        instrumentation: Optional[InstrumentationHandler] = None,
+        num_candidates: int = 1,
+        single_flight: Union[bool, SingleFlight] = True,
+        warm_up: bool = False,
+        checkpointer: Union[bool, str, BaseCheckpointSaver] = False,
+        node_models: Optional[Mapping[str, NodeModel]] = None,
+        pipelined: bool = False,
     ):
+        if num_candidates < 1:
+            raise ValueError("num_candidates must be at least 1")
+        if pipelined and num_candidates > 1:
+            raise ValueError("pipelined mode needs num_candidates=1")
         self.max_attempts = max_attempts
+        self.num_candidates = num_candidates
+        # Speculatively rewrite attempt N+1 while attempt N is critiqued
+        self.pipelined = pipelined
+        self.speculation_tracker = SpeculationTracker()
+        self.target_score = target_score
+        self.llm = llm
+        # Per-node model: an ollama_profiles profile name or instance, else `llm`
+        # (e.g. ollama_profiles.TIERED_NODE_MODELS for a cheap critic)
+        self.node_llms = PROFILES.resolve_node_models(node_models, self.MODEL_NODES, llm)
+        if "speculate_post" not in (node_models or {}):
+            self.node_llms["speculate_post"] = self.node_llms["generate_post"]
+        self.use_async_nodes = use_async_nodes
+        self.history_policy = history_policy or HistoryPolicy()
+        # Concurrent `run` calls for the same topic and settings share one graph run
+        # (True = the process-wide SingleFlight)
+        self.single_flight = resolve_single_flight(single_flight)
+        # Saves every run after each node on thread `thread_id(topic)`, see `resume`
+        self.checkpointer = resolve_checkpointer(checkpointer)
+        if use_async_nodes and is_sync_only(self.checkpointer):
+            raise ValueError(
+                "SqliteSaver has no async interface; pass checkpointer=True or a SQLite path "
+                "(thread-backed saver), or an async saver such as InMemorySaver"
+            )
 
-        logger.info(f"Initializing LinkedInPostAgent with max_attempts={self.max_attempts}")
+        logger.info(
+            f"Initializing LinkedInPostAgent with max_attempts={self.max_attempts}, "
+            f"use_async_nodes={self.use_async_nodes}, history={self.history_policy.mode}, "
+            f"target_score={self.target_score}, num_candidates={self.num_candidates}, pipelined={self.pipelined}, "
+            f"checkpointer={type(self.checkpointer).__name__ if self.checkpointer else None}"
+        )
+        if warm_up:
+            # Load the Ollama models while the graph is built and the first prompt rendered
+            self._warm_up(node_models or {})
         self._graph = self._build_graph()
-        self._runner = self._graph.compile()
+        self._compiled = self._graph.compile(checkpointer=self.checkpointer)
+        self._runner = self._compiled
+        if instrumentation is not None:
+            # Opt-in per-node timing/token metrics, see instrumentation.py
+            self._runner = self._runner.with_config(callbacks=[instrumentation])
+
+    def _warm_up(self, node_models: Mapping[str, NodeModel]) -> None:
+        for profile in {choice for choice in node_models.values() if isinstance(choice, str)}:
+            warm_up_profile(profile, background=True)
+        if self.llm is None and any(node not in node_models for node in self.MODEL_NODES):
+            warm_up_default_llm(background=True)
 
     def _route_post(self, state: AgentState) -> Literal["critique_post", "generate_post", "__end__"]:
         """Route based on number of attempts."""
@@ -34,13 +131,109 @@ class LinkedInPostAgent:
             logger.info("Routing to '__end__'. Maximum attempts reached.")
             return END
 
+    def _reached_target(self, state: AgentState) -> bool:
+        score = state.get("critique_score")
+        return self.target_score is not None and score is not None and score >= self.target_score
+
+    def _route_critique(self, state: AgentState) -> Literal["generate_post", "__end__"]:
+        """Stop early once the critic's score reaches `target_score`."""
+        if self._reached_target(state):
+            logger.info(f"Routing to '__end__'. Score {state['critique_score']} reached target {self.target_score}.")
+            return END
+        logger.info("Routing to 'generate_post'.")
+        return "generate_post"
+
+    def _route_pipelined(self, state: AgentState) -> Literal["critique_post", "__end__"]:
+        """After a pipelined critique: stop on the target score or max attempts, else critique the rewrite."""
+        if self._route_critique(state) == END:
+            return END
+        return self._route_post(state)
+
+    def _build_pipelined_graph(self) -> StateGraph:
+        """generate_post -> critique_post (+ speculative rewrite on the side) -> critique_post -> ...
+
+        Only the first attempt is generated on its own; every later one is
+        the rewrite started alongside the previous critique.
+        """
+        logger.info("Building pipelined workflow graph...")
+        workflow = StateGraph(state_schema=AgentState)
+
+        generate, critique = (agenerate_post, apipelined_critique) if self.use_async_nodes else (generate_post, pipelined_critique)
+        workflow.add_node("generate_post", partial(generate, llm=self.node_llms["generate_post"], history=self.history_policy))
+        workflow.add_node("critique_post", partial(
+            critique,
+            llm=self.node_llms["critique_post"],
+            history=self.history_policy,
+            speculate_llm=self.node_llms["speculate_post"],
+            target_score=self.target_score,
+            tracker=self.speculation_tracker,
+        ))
+
+        workflow.add_edge(START, "generate_post")
+        workflow.add_conditional_edges("generate_post", self._route_post, {"critique_post": "critique_post", "__end__": END})
+        workflow.add_conditional_edges("critique_post", self._route_pipelined, {"critique_post": "critique_post", "__end__": END})
+
+        logger.info("Workflow graph built.")
+        return workflow
+
+    def _fan_out(self, state: AgentState) -> list[Send]:
+        """Start one `generate_candidate` branch per candidate of the round."""
+        logger.info(f"Fanning out {self.num_candidates} candidates for attempt #{state['num_attempts']+1}.")
+        return [Send("generate_candidate", {**state, "candidate": i}) for i in range(self.num_candidates)]
+
+    def _route_candidates(self, state: AgentState) -> Literal["prepare_round", "__end__"]:
+        """After a best-of-N round: stop on max attempts or target score, else run another round."""
+        if state["num_attempts"] >= self.max_attempts:
+            logger.info("Routing to '__end__'. Maximum attempts reached.")
+            return END
+        if self._route_critique(state) == END:
+            return END
+        return "prepare_round"
+
+    def _build_best_of_n_graph(self) -> StateGraph:
+        """prepare_round -> N x generate_candidate (parallel `Send`) -> critique_candidates -> ..."""
+        logger.info(f"Building best-of-{self.num_candidates} workflow graph...")
+        workflow = StateGraph(state_schema=AgentState)
+
+        if self.use_async_nodes:
+            prepare, generate, critique = aprepare_round, agenerate_candidate, acritique_candidates
+        else:
+            prepare, generate, critique = prepare_round, generate_candidate, critique_candidates
+        for name, node in (("prepare_round", prepare), ("generate_candidate", generate), ("critique_candidates", critique)):
+            workflow.add_node(name, partial(node, llm=self.node_llms[name], history=self.history_policy))
+
+        workflow.add_edge(START, "prepare_round")
+        workflow.add_conditional_edges("prepare_round", self._fan_out, ["generate_candidate"])
+        # Runs once, after every candidate branch of the round has finished
+        workflow.add_edge("generate_candidate", "critique_candidates")
+        workflow.add_conditional_edges(
+            "critique_candidates",
+            self._route_candidates,
+            {
+                "prepare_round": "prepare_round",
+                "__end__": END
+            }
+        )
+
+        logger.info("Workflow graph built.")
+        return workflow
+
     def _build_graph(self) -> StateGraph:
+        if self.num_candidates > 1:
+            return self._build_best_of_n_graph()
+        if self.pipelined:
+            return self._build_pipelined_graph()
+
         logger.info("Building workflow graph...")
         workflow = StateGraph(state_schema=AgentState)
 
-        # Add all nodes
-        workflow.add_node("generate_post", generate_post)
-        workflow.add_node("critique_post", critique_post)
+        # Add all nodes (async nodes can only be driven through ainvoke/arun)
+        if self.use_async_nodes:
+            generate, critique = agenerate_post, acritique_post
+        else:
+            generate, critique = generate_post, critique_post
+        workflow.add_node("generate_post", partial(generate, llm=self.node_llms["generate_post"], history=self.history_policy))
+        workflow.add_node("critique_post", partial(critique, llm=self.node_llms["critique_post"], history=self.history_policy))
         logger.debug("Added nodes: generate_post, critique_post.")
 
         # Define edges
@@ -55,8 +248,15 @@ class LinkedInPostAgent:
             }
         )
         logger.debug("Added conditional edges for generate_post.")
-        workflow.add_edge("critique_post", "generate_post")
-        logger.debug("Added edge: critique_post -> generate_post.")
+        workflow.add_conditional_edges(
+            "critique_post",
+            self._route_critique,
+            {
+                "generate_post": "generate_post",
+                "__end__": END
+            }
+        )
+        logger.debug("Added conditional edges for critique_post.")
 
         logger.info("Workflow graph built.")
         return workflow
@@ -70,38 +270,340 @@ class LinkedInPostAgent:
         logger.info(f"Workflow saved: {filename}")
         return filename
 
-    def run(self, topic: str) -> AgentState:
-        """Run the agent with a topic."""
-        logger.info(f"Running agent on topic: '{topic}'")
-        initial_state = {
+    @staticmethod
+    def _no_speculation() -> SpeculationStats:
+        return {"started": 0, "kept": 0, "discarded": 0}
+
+    def _initial_state(self, topic: str) -> AgentState:
+        return {
             "messages": [],
             "topic": topic,
             "generated_post": "",
             "critique": "",
             "num_attempts": 0,
+            "critique_score": None,
+            "improvements": [],
+            "history_summary": "",
+            "summarized_messages": 0,
+            "token_counts": [],
+            "candidates": [],
+            "candidate_scores": [],
+            "speculation": self._no_speculation(),
         }
-        result = self._runner.invoke(initial_state)
+
+    def _request_key(self, topic: str) -> str:
+        return request_key(
+            "linkedin",
+            # None runs on nodes.py's default model, so key it by that model's settings
+            [(node, model_config_key(llm or get_default_llm())) for node, llm in self.node_llms.items()],
+            self.max_attempts,
+            self.target_score,
+            self.num_candidates,
+            self.pipelined,
+            self.history_policy.mode,
+            self.history_policy.max_turns,
+            topic,
+        )
+
+    def thread_id(self, topic: str) -> str:
+        """Checkpoint thread of `topic` for this agent's settings (model name and
+        temperature per node, attempts, ...)."""
+        return f"linkedin-{self._request_key(topic)[:16]}"
+
+    @staticmethod
+    def _thread_config(thread_id: str) -> dict[str, Any]:
+        return {"configurable": {"thread_id": thread_id}}
+
+    def _fresh_config(self, topic: str) -> dict[str, Any]:
+        """Run config for starting `topic` over; drops its earlier checkpoints."""
+        if self.checkpointer is None:
+            return {}
+        thread_id = self.thread_id(topic)
+        self.checkpointer.delete_thread(thread_id)
+        return self._thread_config(thread_id)
+
+    async def _afresh_config(self, topic: str) -> dict[str, Any]:
+        if self.checkpointer is None:
+            return {}
+        thread_id = self.thread_id(topic)
+        await self.checkpointer.adelete_thread(thread_id)
+        return self._thread_config(thread_id)
+
+    def _saved_config(self, topic_or_thread: str) -> Optional[dict[str, Any]]:
+        """Config of the checkpointed thread for a thread id or topic, None if nothing is saved."""
+        if self.checkpointer is None:
+            raise ValueError("Resuming needs a checkpointer, e.g. LinkedInPostAgent(checkpointer=True)")
+        for thread_id in (topic_or_thread, self.thread_id(topic_or_thread)):
+            config = self._thread_config(thread_id)
+            if self.checkpointer.get_tuple(config) is not None:
+                return config
+        return None
+
+    async def _asaved_config(self, topic_or_thread: str) -> Optional[dict[str, Any]]:
+        if self.checkpointer is None:
+            raise ValueError("Resuming needs a checkpointer, e.g. LinkedInPostAgent(checkpointer=True)")
+        for thread_id in (topic_or_thread, self.thread_id(topic_or_thread)):
+            config = self._thread_config(thread_id)
+            if await self.checkpointer.aget_tuple(config) is not None:
+                return config
+        return None
+
+    def run(self, topic: str, resume: bool = False) -> AgentState:
+        """Run the agent with a topic.
+
+        Identical runs already in flight are joined instead of started again;
+        a run that resumes only joins other resuming runs. With a
+        checkpointer a run starts the topic over unless `resume` is set and
+        an earlier run of it was saved; that one is then continued (see
+        `resume`).
+        """
+        logger.info(f"Running agent on topic: '{topic}'")
+        resuming = resume and self.checkpointer is not None and self._saved_config(topic) is not None
+        if resuming:
+            execute = lambda: self.resume(topic)
+        else:
+            execute = lambda: self._runner.invoke(self._initial_state(topic), self._fresh_config(topic))
+        if self.single_flight is None:
+            result = execute()
+        else:
+            result = self.single_flight.do(request_key(self._request_key(topic), resuming), execute)
         logger.info("Agent run complete.")
         return result
 
+    async def arun(self, topic: str, resume: bool = False) -> AgentState:
+        """Run the agent with a topic on the event loop (see `run`).
+
+        Only identical runs on the same event loop are joined.
+        """
+        logger.info(f"Running agent asynchronously on topic: '{topic}'")
+        resuming = resume and self.checkpointer is not None and await self._asaved_config(topic) is not None
+
+        async def execute() -> AgentState:
+            if resuming:
+                return await self.aresume(topic)
+            return await self._runner.ainvoke(self._initial_state(topic), await self._afresh_config(topic))
+
+        if self.single_flight is None:
+            result = await execute()
+        else:
+            result = await self.single_flight.ado(request_key(self._request_key(topic), resuming), execute)
+        logger.info("Agent run complete.")
+        return result
+
+    def resume(self, topic_or_thread: str) -> AgentState:
+        """Continue a checkpointed run from its last completed node.
+
+        Takes the thread id or the topic (looked up with this agent's
+        settings). Nodes that finished before the failure are not run
+        again, and a run that already finished returns its final state
+        without calling the model.
+        """
+        config = self._saved_config(topic_or_thread)
+        if config is None:
+            raise KeyError(f"No checkpointed run for {topic_or_thread!r}")
+        snapshot = self._compiled.get_state(config)
+        if not snapshot.next:
+            logger.info(f"Thread {config['configurable']['thread_id']} already finished.")
+            return snapshot.values
+        logger.info(f"Resuming thread {config['configurable']['thread_id']} at {', '.join(snapshot.next)}")
+        return self._runner.invoke(None, config)
+
+    async def aresume(self, topic_or_thread: str) -> AgentState:
+        """Async version of `resume`."""
+        config = await self._asaved_config(topic_or_thread)
+        if config is None:
+            raise KeyError(f"No checkpointed run for {topic_or_thread!r}")
+        snapshot = await self._compiled.aget_state(config)
+        if not snapshot.next:
+            logger.info(f"Thread {config['configurable']['thread_id']} already finished.")
+            return snapshot.values
+        logger.info(f"Resuming thread {config['configurable']['thread_id']} at {', '.join(snapshot.next)}")
+        return await self._runner.ainvoke(None, config)
+
+    def _to_chunk(
+        self, mode: str, data: Any, progress: dict[str, Any], start: float
+    ) -> Optional[PostChunk]:
+        """Turn one ("messages" | "updates", data) stream item into a PostChunk.
+
+        Node updates only track the attempt counter; the attempt of a token is
+        the number of finished generate steps (+1 while generating). In
+        best-of-N mode the counter moves after the batched critique, so the
+        candidates and their critique share the round's attempt number; in
+        pipelined mode critique_post moves it when it keeps the rewrite.
+        """
+        if mode == "updates":
+            update = data.get("generate_post") or data.get("critique_post") or data.get("critique_candidates") or {}
+            if "num_attempts" in update:
+                progress["generated"] = update["num_attempts"]
+            return None
+
+        message, metadata = data
+        node = metadata.get("langgraph_node", "")
+        # "messages" mode also emits the HumanMessages the nodes write to the state
+        if not isinstance(message, AIMessage) or not message.content or node not in (
+            "generate_post", "critique_post", "speculate_post", "generate_candidate", "critique_candidates"
+        ):
+            return None
+        attempt = progress["generated"] + (0 if node == "critique_post" else 1)
+        elapsed = time.perf_counter() - start
+        first = (node, attempt) not in progress["seen"]
+        if first:
+            progress["seen"].add((node, attempt))
+            logger.info(f"Time to first token for {node} attempt #{attempt}: {elapsed:.3f}s")
+        return {"node": node, "attempt": attempt, "content": message.content, "first": first, "elapsed": elapsed}
+
+    def stream(self, topic: str) -> Iterator[PostChunk]:
+        """Stream token chunks of every generate/critique call for a topic."""
+        logger.info(f"Streaming agent on topic: '{topic}'")
+        progress: dict[str, Any] = {"generated": 0, "seen": set()}
+        start = time.perf_counter()
+        config = self._fresh_config(topic)
+        for mode, data in self._runner.stream(self._initial_state(topic), config, stream_mode=["messages", "updates"]):
+            chunk = self._to_chunk(mode, data, progress, start)
+            if chunk is not None:
+                yield chunk
+        logger.info(f"Agent stream complete in {time.perf_counter() - start:.2f}s.")
+
+    async def astream(self, topic: str) -> AsyncIterator[PostChunk]:
+        """Async version of `stream`."""
+        logger.info(f"Streaming agent asynchronously on topic: '{topic}'")
+        progress: dict[str, Any] = {"generated": 0, "seen": set()}
+        start = time.perf_counter()
+        config = await self._afresh_config(topic)
+        async for mode, data in self._runner.astream(self._initial_state(topic), config, stream_mode=["messages", "updates"]):
+            chunk = self._to_chunk(mode, data, progress, start)
+            if chunk is not None:
+                yield chunk
+        logger.info(f"Agent stream complete in {time.perf_counter() - start:.2f}s.")
+
+    def speculation_stats(self) -> dict[str, Any]:
+        """Pipelined mode: rewrites started/kept/discarded and their (wasted) tokens, over all runs."""
+        return self.speculation_tracker.stats()
+
+    def run_stats(self, state: AgentState) -> RunStats:
+        """Summarise how many generate attempts a finished run used.
+
+        `last_critique_score` belongs to the last critiqued post, which is the
+        final post only when the run stopped early on the target score.
+        """
+        return {
+            "attempts": state["num_attempts"],
+            "max_attempts": self.max_attempts,
+            "attempts_saved": max(self.max_attempts - state["num_attempts"], 0),
+            "last_critique_score": state.get("critique_score"),
+            "reached_target": self._reached_target(state),
+            "speculation": state.get("speculation") or self._no_speculation(),
+        }
+
+    def _record(self, result: TopicRunResult, writer: Optional[ResultsWriter], keep_state: bool) -> TopicRunResult:
+        """Append the finished run to `writer` and optionally drop its full state."""
+        if writer is not None:
+            writer.write_result(result)
+        if not keep_state:
+            result = {**result, "state": None}
+        return result
+
+    def _run_one(
+        self, topic: str, writer: Optional[ResultsWriter] = None, keep_state: bool = True, resume: bool = False
+    ) -> TopicRunResult:
+        """Run a single topic, capturing the failure instead of raising."""
+        start = time.perf_counter()
+        try:
+            state, error = self.run(topic, resume=resume), None
+        except Exception as e:
+            logger.error(f"Run failed for topic '{topic}': {e}")
+            state, error = None, f"{type(e).__name__}: {e}"
+        result: TopicRunResult = {"topic": topic, "state": state, "error": error, "elapsed": time.perf_counter() - start}
+        return self._record(result, writer, keep_state)
+
+    async def _arun_one(
+        self,
+        topic: str,
+        semaphore: asyncio.Semaphore,
+        writer: Optional[ResultsWriter] = None,
+        keep_state: bool = True,
+        resume: bool = False,
+    ) -> TopicRunResult:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                state, error = await self.arun(topic, resume=resume), None
+            except Exception as e:
+                logger.error(f"Run failed for topic '{topic}': {e}")
+                state, error = None, f"{type(e).__name__}: {e}"
+            result: TopicRunResult = {"topic": topic, "state": state, "error": error, "elapsed": time.perf_counter() - start}
+            return self._record(result, writer, keep_state)
+
+    @staticmethod
+    def _build_report(results: list[TopicRunResult], elapsed: float) -> BatchRunReport:
+        failed = sum(1 for r in results if r["error"] is not None)
+        report: BatchRunReport = {
+            "results": results,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "elapsed": elapsed,
+            "topics_per_second": len(results) / elapsed if elapsed > 0 else 0.0,
+        }
+        logger.info(
+            f"Batch complete: {report['succeeded']} succeeded, {failed} failed "
+            f"in {elapsed:.2f}s ({report['topics_per_second']:.2f} topics/s)"
+        )
+        return report
+
+    def run_many(
+        self,
+        topics: Iterable[str],
+        max_concurrency: int = 4,
+        writer: Optional[ResultsWriter] = None,
+        keep_state: bool = True,
+        resume: bool = False,
+    ) -> BatchRunReport:
+        """Run many topics concurrently on a thread pool.
+
+        Results keep the input order; a failing topic is reported in its own
+        result and does not abort the batch. With a `writer` every run is
+        appended to the results file as soon as it finishes, so a crash
+        loses only the runs in flight; `keep_state=False` then drops the
+        full states from the report to keep memory flat on large batches.
+        With a checkpointer, `resume=True` makes a rerun of the batch continue
+        the topics that failed and return finished ones without model calls.
+        """
+        topics = list(topics)
+        logger.info(f"Running {len(topics)} topics with max_concurrency={max_concurrency}")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            results = list(pool.map(lambda topic: self._run_one(topic, writer, keep_state, resume), topics))
+        return self._build_report(results, time.perf_counter() - start)
+
+    async def arun_many(
+        self,
+        topics: Iterable[str],
+        max_concurrency: int = 16,
+        writer: Optional[ResultsWriter] = None,
+        keep_state: bool = True,
+        resume: bool = False,
+    ) -> BatchRunReport:
+        """Asyncio counterpart of `run_many` built on `ainvoke`."""
+        topics = list(topics)
+        logger.info(f"Running {len(topics)} topics asynchronously with max_concurrency={max_concurrency}")
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        start = time.perf_counter()
+        results = await asyncio.gather(*(self._arun_one(topic, semaphore, writer, keep_state, resume) for topic in topics))
+        return self._build_report(list(results), time.perf_counter() - start)
+
 if __name__ == "__main__":
     logger.info("Starting LinkedInPostAgent main run...")
-    agent = LinkedInPostAgent()
+    topics = sys.argv[1:] or ["How to become a software engineer"]
+    agent = LinkedInPostAgent(warm_up=True)
     agent.save_workflow_png("linkedin_workflow.png")
-    result = agent.run("How to become a software engineer")
-
-    for message in result["messages"]:
-        if isinstance(message, AIMessage):
-            print(message.content)
-        elif isinstance(message, HumanMessage):
-            print(message.content)
-        elif isinstance(message, SystemMessage):
-            print(message.content)
-        elif isinstance(message, ToolMessage):
-            print(message.content)
-        else:
-            print(message)
+
+    # One compact record per topic, appended as each run finishes
+    with ResultsWriter("results.jsonl") as writer:
+        report = agent.run_many(topics, writer=writer)
+
+    for result in report["results"]:
+        state = result["state"] or {}
+        print(f"{result['topic']} | attempts: {state.get('num_attempts')} | score: {state.get('critique_score')}")
+        print(state.get("generated_post") or result["error"])
         print("--------------------------------")
-    with open("result.txt", "w", encoding="utf-8") as f:
-        f.write(result["generated_post"])
-    logger.info("Agent run complete.")
+    logger.info(f"Agent run complete: {report['succeeded']} succeeded, {report['failed']} failed. Results in results.jsonl")
@@ -0,0 +1,119 @@
+# history.py
+import logging
+from typing import Any, Literal, Optional, Sequence
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, get_buffer_string
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.constants import TAG_NOSTREAM
+
+from states import AgentState
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HistoryMode = Literal["full", "last_n", "latest", "summary"]
+
+# One reflection turn = one generated post + its critique
+MESSAGES_PER_TURN = 2
+
+SUMMARY_PROMPT = """Summarise the earlier drafts and critiques of a LinkedIn post below.
+Keep every concrete piece of feedback that is still relevant, drop repeated drafts.
+Answer with at most 150 words."""
+
+
+class HistoryPolicy:
+    """Decide which part of `AgentState.messages` is sent to the model.
+
+    Modes:
+        full:    send the whole history (original behaviour).
+        last_n:  send only the last `max_turns` post/critique turns.
+        latest:  send only the latest post and critique.
+        summary: send the last `max_turns` turns exactly and a running
+                 summary of everything older.
+    """
+
+    def __init__(
+        self,
+        mode: HistoryMode = "full",
+        max_turns: int = 1,
+        summary_llm: Optional[BaseChatModel] = None,
+    ):
+        if mode not in ("full", "last_n", "latest", "summary"):
+            raise ValueError(f"Unknown history mode: {mode}")
+        if max_turns < 1:
+            raise ValueError("max_turns must be at least 1")
+        self.mode = mode
+        self.max_turns = 1 if mode == "latest" else max_turns
+        self.summary_llm = summary_llm
+
+    def _split(self, messages: Sequence[BaseMessage]) -> tuple[list[BaseMessage], list[BaseMessage]]:
+        """Split history into (older, recent) according to the window size."""
+        messages = list(messages)
+        if self.mode == "full":
+            return [], messages
+        keep = self.max_turns * MESSAGES_PER_TURN
+        return messages[:-keep] if len(messages) > keep else [], messages[-keep:]
+
+    def _summary_messages(self, older: list[BaseMessage], state: AgentState) -> list[BaseMessage]:
+        return [
+            SystemMessage(content=SUMMARY_PROMPT),
+            HumanMessage(
+                content=(
+                    f"Existing summary:\n{state.get('history_summary') or '(none)'}\n\n"
+                    f"New history to fold in:\n{get_buffer_string(older)}"
+                )
+            ),
+        ]
+
+    def _with_summary(self, summary: str, recent: list[BaseMessage]) -> list[BaseMessage]:
+        if not summary:
+            return recent
+        return [HumanMessage(content=f"Summary of earlier attempts:\n\n{summary}")] + recent
+
+    def prepare(self, state: AgentState, llm: BaseChatModel) -> tuple[list[BaseMessage], dict[str, Any]]:
+        """Return the prompt history and any state update (new summary)."""
+        older, recent = self._split(state["messages"])
+        if self.mode != "summary":
+            return recent, {}
+
+        summarized = state.get("summarized_messages", 0)
+        if len(older) <= summarized:
+            return self._with_summary(state.get("history_summary", ""), recent), {}
+
+        logger.info(f"Summarising {len(older) - summarized} older history messages.")
+        response = (self.summary_llm or llm).invoke(
+            self._summary_messages(older[summarized:], state), config={"tags": [TAG_NOSTREAM]}
+        )
+        update = {"history_summary": response.content, "summarized_messages": len(older)}
+        return self._with_summary(response.content, recent), update
+
+    async def aprepare(self, state: AgentState, llm: BaseChatModel) -> tuple[list[BaseMessage], dict[str, Any]]:
+        """Async version of `prepare`."""
+        older, recent = self._split(state["messages"])
+        if self.mode != "summary":
+            return recent, {}
+
+        summarized = state.get("summarized_messages", 0)
+        if len(older) <= summarized:
+            return self._with_summary(state.get("history_summary", ""), recent), {}
+
+        logger.info(f"Summarising {len(older) - summarized} older history messages.")
+        response = await (self.summary_llm or llm).ainvoke(
+            self._summary_messages(older[summarized:], state), config={"tags": [TAG_NOSTREAM]}
+        )
+        update = {"history_summary": response.content, "summarized_messages": len(older)}
+        return self._with_summary(response.content, recent), update
+
+
+def count_prompt_tokens(messages: Sequence[BaseMessage]) -> int:
+    """Approximate token count of a rendered prompt (model-agnostic)."""
+    return count_tokens_approximately(messages)
+
+
+def token_totals(state: AgentState) -> dict[str, int]:
+    """Sum prompt tokens per node over a finished run."""
+    totals: dict[str, int] = {}
+    for entry in state.get("token_counts", []):
+        totals[entry["node"]] = totals.get(entry["node"], 0) + entry["prompt_tokens"]
+    return totals
@@ -1,103 +1,626 @@
 # nodes.py
+import asyncio
+import contextvars
 import logging
-from typing import Any
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 from dotenv import load_dotenv
+from langchain_core.caches import BaseCache
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.prompt_values import PromptValue
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_ollama import ChatOllama
 
-from states import AgentState
+from cache import cache_from_env
+from history import HistoryPolicy, count_prompt_tokens
+from ollama_client import OllamaClientManager, client_manager_from_env
+from scoring import best_candidate, parse_critique, split_candidate_critiques
+from states import AgentState, NodeTokenCount, SpeculationStats
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 load_dotenv()
 
-def get_llm() -> ChatOllama:
-    """Factory function to create and return Ollama LLM instance."""
+if TYPE_CHECKING:
+    from langchain_ollama import ChatOllama
+
+OLLAMA_MODEL = "qwen2.5:3b"
+
+@lru_cache(maxsize=1)
+def get_client_manager() -> OllamaClientManager:
+    """Process-wide Ollama client manager (pooled HTTP client, keep-alive, metrics)."""
+    return client_manager_from_env()
+
+def get_llm(cache: Optional[BaseCache] = None) -> "ChatOllama":
+    """Factory function to create and return Ollama LLM instance.
+
+    `cache` serves repeated identical calls without reaching Ollama.
+    Instances are shared per settings and use one pooled HTTP client,
+    see ollama_client.py.
+    """
     try:
-        llm = ChatOllama(
-            model="qwen2.5:3b",
-            temperature=0.1,
-        )
+        llm = get_client_manager().chat_model(OLLAMA_MODEL, temperature=0.1, cache=cache)
         logger.info(f"Successfully initialized {llm.model}")
         return llm
     except Exception as e:
         logger.error(f"Failed to initialize LLM: {e}")
         raise
 
-LLM_MODEL = get_llm()
+@lru_cache(maxsize=1)
+def get_llm_cache() -> Optional[BaseCache]:
+    """Response cache shared by the default model, built on first use."""
+    return cache_from_env()
 
-def generate_post(state: AgentState) -> dict[str, Any]:
-    """Generate LinkedIn post based on topic and previous critique."""
-    logger.info(f"Starting post generation for topic: {state['topic']} | Attempt #{state['num_attempts']+1}")
+@lru_cache(maxsize=1)
+def get_default_llm() -> "ChatOllama":
+    """Default model shared by all nodes, built on first use."""
+    return get_llm(cache=get_llm_cache())
 
-    # Include topic and previous critique in context
-    system_prompt = """You are a LinkedIn influencer writing viral AI engineer posts.
+def warm_up_default_llm(background: bool = True) -> Optional[float]:
+    """Load the default model on the Ollama server before the first node needs it."""
+    return get_client_manager().warm_up(OLLAMA_MODEL, background=background)
+
+def __getattr__(name: str):
+    # LLM_MODEL / LLM_CACHE used to be built at import time; keep the names
+    if name == "LLM_MODEL":
+        return get_default_llm()
+    if name == "LLM_CACHE":
+        return get_llm_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+DEFAULT_HISTORY = HistoryPolicy()
+
+# Prompts are built once at import. The system message is identical for every
+# call so the model server can reuse its KV cache for the prompt prefix; the
+# per-call parts (critique, topic, post) come last and are filled at invoke time.
+GENERATE_SYSTEM_PROMPT = """You are a LinkedIn influencer writing viral AI engineer posts.
     Write engaging posts (200-300 words) with hooks, insights, emojis, and calls-to-action.
     Make them professional yet conversational."""
 
+GENERATE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", GENERATE_SYSTEM_PROMPT),
+    MessagesPlaceholder(variable_name="messages"),
+    ("human", "{critique_section}Topic: {topic}"),
+])
+
+CRITIQUE_SYSTEM_PROMPT = """You are a viral LinkedIn strategist grading posts (1-10 scale).
+        Start with exactly "SCORE: <grade>/10" on its own line.
+        Critique structure, hook, value, engagement, length, hashtags, CTA - EVERYTHING.
+        Be specific: "Hook too weak", "Add code example", "Too long", etc.
+        End with exactly "IMPROVEMENTS: 1. ... 2. ... 3. ... 4. ..."."""
+
+CRITIQUE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", CRITIQUE_SYSTEM_PROMPT),
+    MessagesPlaceholder(variable_name="messages"),
+    ("human", "Post to critique:\n\n{generated_post}\n\nTopic: {topic}"),
+])
+
+# Pipelined mode: the rewrite for attempt N+1 starts while attempt N is being
+# critiqued, so it cannot see the critique and gets a generic instruction.
+SPECULATE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", GENERATE_SYSTEM_PROMPT),
+    MessagesPlaceholder(variable_name="messages"),
+    ("human", "Improve this post: sharper hook, tighter wording, a clearer insight and call-to-action.\n\n"
+              "Post:\n{generated_post}\n\nTopic: {topic}"),
+])
+
+# Best-of-N mode: every parallel candidate gets its own angle so the drafts
+# differ even at a low temperature, and one batched call grades them all.
+CANDIDATE_ANGLES = (
+    "Open with a short personal story.",
+    "Lead with a surprising fact or number.",
+    "Take a clear, slightly contrarian stance.",
+    "Make it a practical step-by-step guide.",
+)
+
+GENERATE_CANDIDATE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", GENERATE_SYSTEM_PROMPT),
+    MessagesPlaceholder(variable_name="messages"),
+    ("human", "{critique_section}Topic: {topic}\n\nAngle: {angle}"),
+])
+
+CRITIQUE_CANDIDATES_SYSTEM_PROMPT = """You are a viral LinkedIn strategist grading several candidate posts on the same topic (1-10 scale).
+        For every candidate write a section starting with exactly "CANDIDATE <n>" on its own line,
+        followed by exactly "SCORE: <grade>/10" on its own line.
+        Critique structure, hook, value, engagement, length, hashtags, CTA - EVERYTHING.
+        Be specific: "Hook too weak", "Add code example", "Too long", etc.
+        End every section with exactly "IMPROVEMENTS: 1. ... 2. ... 3. ... 4. ..."."""
+
+CRITIQUE_CANDIDATES_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", CRITIQUE_CANDIDATES_SYSTEM_PROMPT),
+    MessagesPlaceholder(variable_name="messages"),
+    ("human", "Posts to critique:\n\n{candidates}\n\nTopic: {topic}"),
+])
+
+def _generate_inputs(state: AgentState, messages: list[BaseMessage]) -> dict[str, Any]:
+    """Template variables for the generation prompt."""
+    critique_section = ""
     if state["critique"]:
-        logger.debug(f"Including previous critique in system prompt")
-        system_prompt += f"\n\nPREVIOUS CRITIQUE (address these issues):\n{state['critique']}"
+        logger.debug("Including previous critique in prompt")
+        critique_section = f"PREVIOUS CRITIQUE (address these issues):\n{state['critique']}\n\n"
+    return {"messages": messages, "critique_section": critique_section, "topic": state["topic"]}
+
+def _render(
+    prompt: ChatPromptTemplate, inputs: dict[str, Any], node: str, attempt: int
+) -> tuple[PromptValue, NodeTokenCount]:
+    """Render the prompt and measure its size for the token metric."""
+    prompt_value = prompt.invoke(inputs)
+    tokens = count_prompt_tokens(prompt_value.to_messages())
+    logger.info(f"{node} prompt: {tokens} tokens (~{len(inputs['messages'])} history messages)")
+    return prompt_value, {
+        "node": node,
+        "attempt": attempt,
+        "prompt_tokens": tokens,
+        "history_messages": len(inputs["messages"]),
+    }
+
+def _generate_update(state: AgentState, post: str, tokens: NodeTokenCount) -> dict[str, Any]:
+    logger.debug(f"Generated post preview: {post[:100]}...")
+
+    return {
+        "messages": [HumanMessage(content=f"Generated post (attempt {state['num_attempts']+1}):\n\n{post}")],
+        "topic": state["topic"],
+        "generated_post": post,
+        "critique": state["critique"],
+        "num_attempts": state["num_attempts"] + 1,
+        "token_counts": [tokens],
+    }
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
-        MessagesPlaceholder(variable_name="messages"),
-        ("human", f"Topic: {state['topic']}"),
-    ])
+def generate_post(
+    state: AgentState,
+    llm: Optional[BaseChatModel] = None,
+    history: Optional[HistoryPolicy] = None,
+) -> dict[str, Any]:
+    """Generate LinkedIn post based on topic and previous critique.
 
-    chain = prompt | LLM_MODEL
+    `llm` overrides the module-level model (e.g. a fake model in benchmarks)
+    and `history` selects how much of the message history is sent.
+    """
+    logger.info(f"Starting post generation for topic: {state['topic']} | Attempt #{state['num_attempts']+1}")
+    llm = llm or get_default_llm()
+    messages, history_update = (history or DEFAULT_HISTORY).prepare(state, llm)
+    prompt_value, tokens = _render(GENERATE_PROMPT, _generate_inputs(state, messages), "generate_post", state["num_attempts"] + 1)
 
     try:
-        logger.info("Invoking LLM chain to generate post.")
-        response = chain.invoke({"messages": state["messages"]})
+        logger.info("Invoking LLM to generate post.")
+        response = llm.invoke(prompt_value)
         post = response.content
         logger.info("Post generation complete.")
     except Exception as e:
         logger.error(f"Error during post generation: {e}")
         raise
 
-    logger.debug(f"Generated post preview: {post[:100]}...")
+    return {**_generate_update(state, post, tokens), **history_update}
+
+async def agenerate_post(
+    state: AgentState,
+    llm: Optional[BaseChatModel] = None,
+    history: Optional[HistoryPolicy] = None,
+) -> dict[str, Any]:
+    """Async version of `generate_post` that awaits the model via `ainvoke`."""
+    logger.info(f"Starting async post generation for topic: {state['topic']} | Attempt #{state['num_attempts']+1}")
+    llm = llm or get_default_llm()
+    messages, history_update = await (history or DEFAULT_HISTORY).aprepare(state, llm)
+    prompt_value, tokens = _render(GENERATE_PROMPT, _generate_inputs(state, messages), "generate_post", state["num_attempts"] + 1)
+
+    try:
+        logger.info("Awaiting LLM to generate post.")
+        response = await llm.ainvoke(prompt_value)
+        post = response.content
+        logger.info("Post generation complete.")
+    except Exception as e:
+        logger.error(f"Error during post generation: {e}")
+        raise
+
+    return {**_generate_update(state, post, tokens), **history_update}
+
+def _critique_inputs(state: AgentState, messages: list[BaseMessage]) -> dict[str, Any]:
+    """Template variables for the critique prompt."""
+    return {"messages": messages, "generated_post": state["generated_post"], "topic": state["topic"]}
+
+def _critique_update(state: AgentState, critique: str, tokens: NodeTokenCount) -> dict[str, Any]:
+    logger.debug(f"Critique preview: {critique[:100]}...")
+    parsed = parse_critique(critique)
+    logger.info(f"Critique score: {parsed['score']} | {len(parsed['improvements'])} improvements")
 
     return {
-        "messages": [HumanMessage(content=f"Generated post (attempt {state['num_attempts']+1}):\n\n{post}")],
+        "messages": [HumanMessage(content=f"Critique:\n\n{critique}")],
         "topic": state["topic"],
-        "generated_post": post,
-        "critique": state["critique"],
-        "num_attempts": state["num_attempts"] + 1,
+        "generated_post": state["generated_post"],
+        "critique": critique,
+        "num_attempts": state["num_attempts"],
+        "critique_score": parsed["score"],
+        "improvements": parsed["improvements"],
+        "token_counts": [tokens],
     }
 
-def critique_post(state: AgentState) -> dict[str, Any]:
+def critique_post(
+    state: AgentState,
+    llm: Optional[BaseChatModel] = None,
+    history: Optional[HistoryPolicy] = None,
+) -> dict[str, Any]:
     """Critique the generated post and provide score + improvements."""
     logger.info("Starting critique for generated post.")
+    llm = llm or get_default_llm()
+    messages, history_update = (history or DEFAULT_HISTORY).prepare(state, llm)
+    prompt_value, tokens = _render(CRITIQUE_PROMPT, _critique_inputs(state, messages), "critique_post", state["num_attempts"])
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are a viral LinkedIn strategist grading posts (1-10 scale).
-        Critique structure, hook, value, engagement, length, hashtags, CTA - EVERYTHING.
-        Be specific: "Hook too weak", "Add code example", "Too long", etc.
-        End with exactly "IMPROVEMENTS: 1. ... 2. ... 3. ... 4. ..."."""),
-        MessagesPlaceholder(variable_name="messages"),
-        ("human", f"Post to critique:\n\n{state['generated_post']}\n\nTopic: {state['topic']}"),
-    ])
+    try:
+        logger.info("Invoking LLM to critique post.")
+        response = llm.invoke(prompt_value)
+        critique = response.content
+        logger.info("Critique complete.")
+    except Exception as e:
+        logger.error(f"Error during critique: {e}")
+        raise
+
+    return {**_critique_update(state, critique, tokens), **history_update}
 
-    chain = prompt | LLM_MODEL
+async def acritique_post(
+    state: AgentState,
+    llm: Optional[BaseChatModel] = None,
+    history: Optional[HistoryPolicy] = None,
+) -> dict[str, Any]:
+    """Async version of `critique_post` that awaits the model via `ainvoke`."""
+    logger.info("Starting async critique for generated post.")
+    llm = llm or get_default_llm()
+    messages, history_update = await (history or DEFAULT_HISTORY).aprepare(state, llm)
+    prompt_value, tokens = _render(CRITIQUE_PROMPT, _critique_inputs(state, messages), "critique_post", state["num_attempts"])
 
     try:
-        logger.info("Invoking LLM chain to critique post.")
-        response = chain.invoke({"messages": state["messages"]})
+        logger.info("Awaiting LLM to critique post.")
+        response = await llm.ainvoke(prompt_value)
         critique = response.content
         logger.info("Critique complete.")
     except Exception as e:
         logger.error(f"Error during critique: {e}")
         raise
 
-    logger.debug(f"Critique preview: {critique[:100]}...")
+    return {**_critique_update(state, critique, tokens), **history_update}
+
+class SpeculationTracker:
+    """Token accounting of the speculative rewrites of an agent, across runs.
+
+    A discarded rewrite is not waited for: sync runs cancel it while it is
+    still queued for a speculation thread and otherwise let it finish in the
+    background (its tokens are counted once it does), async runs cancel it
+    and count only its prompt.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {"started": 0, "kept": 0, "discarded": 0, "cancelled": 0, "in_flight": 0, "tokens": 0, "wasted_tokens": 0}
+
+    def started(self) -> None:
+        with self._lock:
+            self._counters["started"] += 1
+            self._counters["in_flight"] += 1
+
+    def finished(self, tokens: int, kept: bool, cancelled: bool = False) -> None:
+        with self._lock:
+            self._counters["in_flight"] -= 1
+            self._counters["tokens"] += tokens
+            self._counters["kept" if kept else "discarded"] += 1
+            if cancelled:
+                self._counters["cancelled"] += 1
+            if not kept:
+                self._counters["wasted_tokens"] += tokens
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+        stats["wasted_ratio"] = stats["wasted_tokens"] / stats["tokens"] if stats["tokens"] else 0.0
+        return stats
+
+def _misses_target(score: Optional[float], target_score: Optional[float]) -> bool:
+    return target_score is None or score is None or score < target_score
 
+def _speculation_tokens(response: BaseMessage, tokens: NodeTokenCount) -> int:
+    """Prompt + output tokens of a speculative rewrite."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    return tokens["prompt_tokens"] + (usage.get("output_tokens") or count_prompt_tokens([response]))
+
+def _render_speculation(state: AgentState, messages: list[BaseMessage]) -> tuple[PromptValue, NodeTokenCount]:
+    inputs = {"messages": messages, "generated_post": state["generated_post"], "topic": state["topic"]}
+    return _render(SPECULATE_PROMPT, inputs, "speculate_post", state["num_attempts"] + 1)
+
+# Tokens of the rewrite are streamed and traced as "speculate_post"
+SPECULATE_CONFIG = {"metadata": {"langgraph_node": "speculate_post"}, "run_name": "speculate_post"}
+
+# Speculative rewrites of every agent share these threads; one per pooled
+# Ollama connection (see ollama_client.py)
+SPECULATION_WORKERS = 8
+
+@lru_cache(maxsize=1)
+def get_speculation_pool() -> ThreadPoolExecutor:
+    """Process-wide threads for speculative rewrites, built on first use."""
+    return ThreadPoolExecutor(max_workers=SPECULATION_WORKERS, thread_name_prefix="speculate-post")
+
+def _speculate(fn: Callable[[], Any]) -> Future:
+    """Run `fn` on the speculation pool, keeping the callback context (tracing, streaming)."""
+    return get_speculation_pool().submit(contextvars.copy_context().run, fn)
+
+def _discard(speculation: Future, tracker: SpeculationTracker, tokens: NodeTokenCount) -> None:
+    """Drop a rewrite that is no longer needed without waiting for it.
+
+    A rewrite still queued for a thread is cancelled before its prompt is
+    sent; a running one finishes in the background and its tokens are
+    counted when it does. Its exception, if any, is only logged.
+    """
+    if speculation.cancel():
+        tracker.finished(0, kept=False, cancelled=True)
+        return
+
+    def finished(future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            logger.warning(f"Discarded speculative rewrite failed: {error}")
+        tracker.finished(0 if error else _speculation_tokens(future.result(), tokens), kept=False)
+
+    speculation.add_done_callback(finished)
+
+def _pipelined_update(
+    state: AgentState, update: dict[str, Any], post: Optional[str], tokens: Optional[NodeTokenCount]
+) -> dict[str, Any]:
+    """Critique update plus, if `post` is set, the speculative rewrite adopted as the next attempt."""
+    stats: SpeculationStats = {**state["speculation"]}
+    stats["started"] += 1
+    if post is None:
+        stats["discarded"] += 1
+        logger.info("Critique reached the target; discarding the speculative rewrite.")
+        return {**update, "speculation": stats}
+
+    stats["kept"] += 1
+    attempt = state["num_attempts"] + 1
+    logger.info(f"Keeping speculative rewrite as attempt #{attempt}.")
     return {
-        "messages": [HumanMessage(content=f"Critique:\n\n{critique}")],
-        "topic": state["topic"],
-        "generated_post": state["generated_post"],
-        "critique": critique,
-        "num_attempts": state["num_attempts"],
+        **update,
+        "messages": update["messages"] + [HumanMessage(content=f"Generated post (attempt {attempt}):\n\n{post}")],
+        "generated_post": post,
+        "num_attempts": attempt,
+        "token_counts": update["token_counts"] + [tokens],
+        "speculation": stats,
     }
+
+def pipelined_critique(
+    state: AgentState,
+    llm: Optional[BaseChatModel] = None,
+    history: Optional[HistoryPolicy] = None,
+    speculate_llm: Optional[BaseChatModel] = None,
+    target_score: Optional[float] = None,
+    tracker: Optional[SpeculationTracker] = None,
+) -> dict[str, Any]:
+    """Critique the post while a speculative rewrite of it runs on the speculation pool.
+
+    The rewrite becomes the next attempt when the score misses
+    `target_score`; otherwise the node returns without waiting for it.
+    """
+    logger.info(f"Starting critique with speculative rewrite | Attempt #{state['num_attempts']+1}")
+    llm = llm or get_default_llm()
+    speculate_llm = speculate_llm or llm
+    tracker = tracker or SpeculationTracker()
+    messages, history_update = (history or DEFAULT_HISTORY).prepare(state, llm)
+    speculate_prompt, speculate_tokens = _render_speculation(state, messages)
+    critique_prompt, tokens = _render(CRITIQUE_PROMPT, _critique_inputs(state, messages), "critique_post", state["num_attempts"])
+
+    tracker.started()
+    speculation = _speculate(lambda: speculate_llm.invoke(speculate_prompt, config=SPECULATE_CONFIG))
+    try:
+        logger.info("Invoking LLM to critique post.")
+        critique = llm.invoke(critique_prompt).content
+    except Exception as e:
+        logger.error(f"Error during critique: {e}")
+        _discard(speculation, tracker, speculate_tokens)
+        raise
+    update = {**_critique_update(state, critique, tokens), **history_update}
+
+    if not _misses_target(update["critique_score"], target_score):
+        _discard(speculation, tracker, speculate_tokens)
+        return _pipelined_update(state, update, None, None)
+    try:
+        response = speculation.result()
+    except Exception as e:
+        logger.error(f"Error during speculative rewrite: {e}")
+        tracker.finished(0, kept=False)
+        raise
+    tracker.finished(_speculation_tokens(response, speculate_tokens), kept=True)
+    return _pipelined_update(state, update, response.content, speculate_tokens)
+
+def _adiscard(speculation: asyncio.Task, tracker: SpeculationTracker, tokens: NodeTokenCount) -> None:
+    """Async counterpart of `_discard`: a rewrite still running is cancelled."""
+    if not speculation.done() or speculation.cancelled():
+        # The prompt was sent; the partial output is not counted
+        speculation.cancel()
+        tracker.finished(tokens["prompt_tokens"], kept=False, cancelled=True)
+        return
+    # Retrieving the exception keeps asyncio from reporting it as never retrieved
+    error = speculation.exception()
+    if error is not None:
+        logger.warning(f"Discarded speculative rewrite failed: {error}")
+    tracker.finished(0 if error else _speculation_tokens(speculation.result(), tokens), kept=False)
+
+async def apipelined_critique(
+    state: AgentState,
+    llm: Optional[BaseChatModel] = None,
+    history: Optional[HistoryPolicy] = None,
+    speculate_llm: Optional[BaseChatModel] = None,
+    target_score: Optional[float] = None,
+    tracker: Optional[SpeculationTracker] = None,
+) -> dict[str, Any]:
+    """Async version of `pipelined_critique`; a discarded rewrite is cancelled."""
+    logger.info(f"Starting async critique with speculative rewrite | Attempt #{state['num_attempts']+1}")
+    llm = llm or get_default_llm()
+    speculate_llm = speculate_llm or llm
+    tracker = tracker or SpeculationTracker()
+    messages, history_update = await (history or DEFAULT_HISTORY).aprepare(state, llm)
+    speculate_prompt, speculate_tokens = _render_speculation(state, messages)
+    critique_prompt, tokens = _render(CRITIQUE_PROMPT, _critique_inputs(state, messages), "critique_post", state["num_attempts"])
+
+    tracker.started()
+    speculation = asyncio.create_task(speculate_llm.ainvoke(speculate_prompt, config=SPECULATE_CONFIG))
+    try:
+        logger.info("Awaiting LLM to critique post.")
+        critique = (await llm.ainvoke(critique_prompt)).content
+        update = {**_critique_update(state, critique, tokens), **history_update}
+        keep = _misses_target(update["critique_score"], target_score)
+    except BaseException as e:
+        logger.error(f"Error during critique: {e}")
+        keep = False
+        raise
+    finally:
+        if not keep:
+            _adiscard(speculation, tracker, speculate_tokens)
+
+    if not keep:
+        return _pipelined_update(state, update, None, None)
+    try:
+        response = await speculation
+    except Exception as e:
+        logger.error(f"Error during speculative rewrite: {e}")
+        tracker.finished(0, kept=False)
+        raise
+    tracker.finished(_speculation_tokens(response, speculate_tokens), kept=True)
+    return _pipelined_update(state, update, response.content, speculate_tokens)
+
+def prepare_round(
+    state: AgentState,
+    llm: Optional[BaseChatModel] = None,
+    history: Optional[HistoryPolicy] = None,
+) -> dict[str, Any]:
+    """Fold older history into the summary once per best-of-N round.
+
+    Runs before the fan-out so the parallel candidates find the summary up to
+    date instead of each summarising the same messages.
+    """
+    _, history_update = (history or DEFAULT_HISTORY).prepare(state, llm or get_default_llm())
+    return history_update
+
+async def aprepare_round(
+    state: AgentState,
+    llm: Optional[BaseChatModel] = None,
+    history: Optional[HistoryPolicy] = None,
+) -> dict[str, Any]:
+    """Async version of `prepare_round`."""
+    _, history_update = await (history or DEFAULT_HISTORY).aprepare(state, llm or get_default_llm())
+    return history_update
+
+def _candidate_inputs(state: AgentState, messages: list[BaseMessage]) -> dict[str, Any]:
+    """Template variables for one candidate; `state["candidate"]` is set by the fan-out `Send`."""
+    angle = CANDIDATE_ANGLES[state["candidate"] % len(CANDIDATE_ANGLES)]
+    return {**_generate_inputs(state, messages), "angle": angle}
+
+def generate_candidate(
+    state: AgentState,
+    llm: Optional[BaseChatModel] = None,
+    history: Optional[HistoryPolicy] = None,
+) -> dict[str, Any]:
+    """Generate one of the parallel best-of-N candidates for this round."""
+    logger.info(f"Generating candidate #{state['candidate']+1} | Attempt #{state['num_attempts']+1}")
+    llm = llm or get_default_llm()
+    # prepare_round already updated the summary, so there is nothing to write back
+    messages, _ = (history or DEFAULT_HISTORY).prepare(state, llm)
+    prompt_value, tokens = _render(
+        GENERATE_CANDIDATE_PROMPT, _candidate_inputs(state, messages), "generate_candidate", state["num_attempts"] + 1
+    )
+
+    try:
+        response = llm.invoke(prompt_value)
+    except Exception as e:
+        logger.error(f"Error during candidate generation: {e}")
+        raise
+
+    return {"candidates": [response.content], "token_counts": [tokens]}
+
+async def agenerate_candidate(
+    state: AgentState,
+    llm: Optional[BaseChatModel] = None,
+    history: Optional[HistoryPolicy] = None,
+) -> dict[str, Any]:
+    """Async version of `generate_candidate`."""
+    logger.info(f"Generating candidate #{state['candidate']+1} asynchronously | Attempt #{state['num_attempts']+1}")
+    llm = llm or get_default_llm()
+    messages, _ = await (history or DEFAULT_HISTORY).aprepare(state, llm)
+    prompt_value, tokens = _render(
+        GENERATE_CANDIDATE_PROMPT, _candidate_inputs(state, messages), "generate_candidate", state["num_attempts"] + 1
+    )
+
+    try:
+        response = await llm.ainvoke(prompt_value)
+    except Exception as e:
+        logger.error(f"Error during candidate generation: {e}")
+        raise
+
+    return {"candidates": [response.content], "token_counts": [tokens]}
+
+def _critique_candidates_inputs(state: AgentState, messages: list[BaseMessage]) -> dict[str, Any]:
+    candidates = "\n\n".join(f"CANDIDATE {i}:\n{post}" for i, post in enumerate(state["candidates"], start=1))
+    return {"messages": messages, "candidates": candidates, "topic": state["topic"]}
+
+def _critique_candidates_update(state: AgentState, critique: str, tokens: NodeTokenCount) -> dict[str, Any]:
+    candidates = state["candidates"]
+    sections = split_candidate_critiques(critique, len(candidates))
+    parsed = [parse_critique(section) for section in sections]
+    best = best_candidate(parsed)
+    attempt = state["num_attempts"] + 1
+    scores = [p["score"] for p in parsed]
+    logger.info(f"Candidate scores: {scores} | picked #{best+1}")
+
+    return {
+        "messages": [
+            HumanMessage(content=f"Generated post (attempt {attempt}, best of {len(candidates)}):\n\n{candidates[best]}"),
+            HumanMessage(content=f"Critique:\n\n{sections[best]}"),
+        ],
+        "generated_post": candidates[best],
+        "critique": sections[best],
+        "num_attempts": attempt,
+        "critique_score": parsed[best]["score"],
+        "improvements": parsed[best]["improvements"],
+        "candidates": [],
+        "candidate_scores": scores,
+        "token_counts": [tokens],
+    }
+
+def critique_candidates(
+    state: AgentState,
+    llm: Optional[BaseChatModel] = None,
+    history: Optional[HistoryPolicy] = None,
+) -> dict[str, Any]:
+    """Grade all candidates of the round in one call and keep the best one."""
+    logger.info(f"Starting batched critique of {len(state['candidates'])} candidates.")
+    llm = llm or get_default_llm()
+    messages, history_update = (history or DEFAULT_HISTORY).prepare(state, llm)
+    prompt_value, tokens = _render(
+        CRITIQUE_CANDIDATES_PROMPT, _critique_candidates_inputs(state, messages), "critique_candidates", state["num_attempts"] + 1
+    )
+
+    try:
+        response = llm.invoke(prompt_value)
+    except Exception as e:
+        logger.error(f"Error during batched critique: {e}")
+        raise
+
+    return {**_critique_candidates_update(state, response.content, tokens), **history_update}
+
+async def acritique_candidates(
+    state: AgentState,
+    llm: Optional[BaseChatModel] = None,
+    history: Optional[HistoryPolicy] = None,
+) -> dict[str, Any]:
+    """Async version of `critique_candidates`."""
+    logger.info(f"Starting async batched critique of {len(state['candidates'])} candidates.")
+    llm = llm or get_default_llm()
+    messages, history_update = await (history or DEFAULT_HISTORY).aprepare(state, llm)
+    prompt_value, tokens = _render(
+        CRITIQUE_CANDIDATES_PROMPT, _critique_candidates_inputs(state, messages), "critique_candidates", state["num_attempts"] + 1
+    )
+
+    try:
+        response = await llm.ainvoke(prompt_value)
+    except Exception as e:
+        logger.error(f"Error during batched critique: {e}")
+        raise
+
+    return {**_critique_candidates_update(state, response.content, tokens), **history_update}
@@ -0,0 +1,55 @@
+# ollama_chat.py
+from typing import Any, Optional
+
+from langchain_ollama import ChatOllama
+from pydantic import Field, model_validator
+from typing_extensions import Self
+
+# ChatOllama settings that change what the model answers
+OUTPUT_PARAMS = (
+    "model",
+    "temperature",
+    "top_k",
+    "top_p",
+    "num_ctx",
+    "num_predict",
+    "repeat_penalty",
+    "repeat_last_n",
+    "seed",
+    "mirostat",
+    "mirostat_eta",
+    "mirostat_tau",
+    "tfs_z",
+    "format",
+    "reasoning",
+)
+
+
+class PooledChatOllama(ChatOllama):
+    """ChatOllama on clients it is given, as built by OllamaClientManager.
+
+    `sync_client` / `async_client` replace the clients ChatOllama would
+    build for itself, so many models share one connection pool.
+    ChatOllama also reports no identifying parameters, so its llm_string
+    (what response caches and request keys are derived from) is the same
+    for every model and temperature. This one reports the settings in
+    OUTPUT_PARAMS.
+    """
+
+    sync_client: Optional[Any] = Field(default=None, exclude=True)
+    """`ollama.Client` to send sync requests through."""
+    async_client: Optional[Any] = Field(default=None, exclude=True)
+    """`ollama.AsyncClient` (or a stand-in with its methods) for async requests."""
+
+    @model_validator(mode="after")
+    def _use_given_clients(self) -> Self:
+        # Runs after ChatOllama built its own clients from `client_kwargs`
+        if self.sync_client is not None:
+            self._client = self.sync_client
+        if self.async_client is not None:
+            self._async_client = self.async_client
+        return self
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in OUTPUT_PARAMS}
@@ -0,0 +1,233 @@
+# ollama_client.py
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Optional, Union
+from uuid import UUID
+
+from graph_common.stats import percentile
+from langchain_core.caches import BaseCache
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+if TYPE_CHECKING:
+    from ollama import AsyncClient, Client
+
+    from ollama_chat import PooledChatOllama
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# A call whose server-side model load took longer than this counts as cold
+COLD_LOAD_SECONDS = 0.05
+
+
+def _load_seconds(response: LLMResult) -> Optional[float]:
+    """Ollama's `load_duration` (ns) of the response, in seconds."""
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "response_metadata", None) or {}
+            if metadata.get("load_duration") is not None:
+                return metadata["load_duration"] / 1e9
+    return None
+
+
+class LatencyRecorder(BaseCallbackHandler):
+    """Model call latencies, split into cold (model had to be loaded) and warm.
+
+    Cold/warm comes from Ollama's reported `load_duration`; without it the
+    first call of each model counts as cold.
+    """
+
+    def __init__(self):
+        self._starts: dict[UUID, tuple[str, float]] = {}
+        self._seen: set[str] = set()
+        self._latencies: dict[str, list[float]] = {"cold": [], "warm": []}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float, cold: Optional[bool] = None) -> None:
+        with self._lock:
+            if cold is None:
+                cold = model not in self._seen
+            kind = "cold" if cold else "warm"
+            self._seen.add(model)
+            self._latencies[kind].append(seconds)
+
+    def on_chat_model_start(self, serialized: dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        model = (kwargs.get("invocation_params") or {}).get("model") or (kwargs.get("metadata") or {}).get("ls_model_name", "")
+        with self._lock:
+            self._starts[run_id] = (model, time.perf_counter())
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            started = self._starts.pop(run_id, None)
+        if started is not None:
+            load = _load_seconds(response)
+            self.record(started[0], time.perf_counter() - started[1], None if load is None else load > COLD_LOAD_SECONDS)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._starts.pop(run_id, None)
+
+    def report(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            latencies = {kind: list(values) for kind, values in self._latencies.items()}
+        return {
+            kind: {
+                "count": len(values),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "max_ms": max(values, default=0.0) * 1000,
+            }
+            for kind, values in latencies.items()
+        }
+
+
+class _LoopAsyncClient:
+    """Stands in for an `ollama.AsyncClient`: forwards every call to the
+    manager's client for the running event loop."""
+
+    def __init__(self, manager: "OllamaClientManager"):
+        self._manager = manager
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._manager.async_client(), name)
+
+
+class OllamaClientManager:
+    """One pooled Ollama HTTP client shared by every ChatOllama in the process.
+
+    `chat_model` memoises PooledChatOllama instances per (model,
+    temperature, cache) and hands them all the same sync `ollama.Client`,
+    and for async calls the same `ollama.AsyncClient` per event loop, so
+    nodes and agent instances reuse its keep-alive connections. The pool size
+    (`max_connections`, per client) also caps how many requests are in
+    flight on the server at once; match it to the server's
+    OLLAMA_NUM_PARALLEL.
+    `keep_alive` is sent with every request so the model stays loaded
+    between runs, and `warm_up` loads it before the first real call.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        keep_alive: Union[str, int] = "30m",
+        max_connections: int = 8,
+        max_keepalive_connections: Optional[int] = None,
+        timeout: float = 300.0,
+    ):
+        self.base_url = base_url
+        self.keep_alive = keep_alive
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections or max_connections
+        self.timeout = timeout
+        self.metrics = LatencyRecorder()
+        self._models: dict[tuple[str, float, int], "PooledChatOllama"] = {}
+        self._client: Optional["Client"] = None
+        # httpx async connections belong to the loop that opened them
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, "AsyncClient"] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def client_kwargs(self) -> dict[str, Any]:
+        """httpx settings for the Ollama clients (connection pool + timeout)."""
+        import httpx
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections, max_keepalive_connections=self.max_keepalive_connections
+        )
+        return {"limits": limits, "timeout": self.timeout}
+
+    def client(self) -> "Client":
+        """The shared sync Ollama client, built on first use."""
+        with self._lock:
+            if self._client is None:
+                from ollama import Client
+
+                self._client = Client(host=self.base_url, **self.client_kwargs())
+            return self._client
+
+    def async_client(self) -> "AsyncClient":
+        """The shared async Ollama client of the running event loop, built on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                from ollama import AsyncClient
+
+                client = self._async_clients[loop] = AsyncClient(host=self.base_url, **self.client_kwargs())
+            return client
+
+    def chat_model(self, model: str, temperature: float = 0.1, cache: Optional[BaseCache] = None) -> "PooledChatOllama":
+        """Shared ChatOllama for these settings, built on first use."""
+        # Imported here so importing this module stays cheap
+        from ollama_chat import PooledChatOllama
+
+        key = (model, temperature, id(cache))
+        client = self.client()
+        with self._lock:
+            if key not in self._models:
+                self._models[key] = PooledChatOllama(
+                    model=model,
+                    temperature=temperature,
+                    cache=cache,
+                    base_url=self.base_url,
+                    keep_alive=self.keep_alive,
+                    callbacks=[self.metrics],
+                    sync_client=client,
+                    async_client=_LoopAsyncClient(self),
+                )
+                logger.info(f"Created shared ChatOllama for {model} (keep_alive={self.keep_alive})")
+            return self._models[key]
+
+    def warm_up(self, model: str, background: bool = False) -> Optional[float]:
+        """Load `model` into server memory with an empty generate request.
+
+        Returns the request time in seconds (None on failure or when run in
+        the background); it is recorded as a cold start unless the server
+        reports the model was already loaded.
+        """
+        if background:
+            threading.Thread(target=self.warm_up, args=(model,), name=f"warm-up-{model}", daemon=True).start()
+            return None
+        start = time.perf_counter()
+        try:
+            response = self.client().generate(model=model, prompt="", keep_alive=self.keep_alive)
+        except Exception as e:
+            logger.warning(f"Warm-up of {model} failed: {e}")
+            return None
+        elapsed = time.perf_counter() - start
+        load = getattr(response, "load_duration", None)
+        self.metrics.record(model, elapsed, cold=True if load is None else load / 1e9 > COLD_LOAD_SECONDS)
+        logger.info(f"Warmed up {model} in {elapsed:.2f}s")
+        return elapsed
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Cold-start and warm call latencies."""
+        return self.metrics.report()
+
+
+def _keep_alive(value: str) -> Union[str, int]:
+    # Ollama accepts durations ("30m") and seconds (-1 = forever, 0 = unload now)
+    return int(value) if value.lstrip("-").isdigit() else value
+
+
+def client_manager_from_env() -> OllamaClientManager:
+    """Build the client manager from the environment.
+
+    OLLAMA_HOST (default http://localhost:11434), OLLAMA_KEEP_ALIVE (default
+    30m), OLLAMA_MAX_CONNECTIONS (default 8) and OLLAMA_TIMEOUT (seconds,
+    default 300).
+    """
+    host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+    if "://" not in host:
+        host = f"http://{host}"
+    return OllamaClientManager(
+        base_url=host,
+        keep_alive=_keep_alive(os.getenv("OLLAMA_KEEP_ALIVE", "30m")),
+        max_connections=int(os.getenv("OLLAMA_MAX_CONNECTIONS", "8")),
+        timeout=float(os.getenv("OLLAMA_TIMEOUT", "300")),
+    )
@@ -0,0 +1,41 @@
+# ollama_profiles.py
+from typing import TYPE_CHECKING, Optional
+
+from graph_common.model_profiles import ModelProfile, ProfileRegistry
+
+if TYPE_CHECKING:
+    from langchain_ollama import ChatOllama
+
+
+# Local Ollama models; "qwen2.5-3b" is what every node used before tiering
+MODEL_PROFILES: dict[str, ModelProfile] = {
+    "qwen2.5-1.5b": {"model": "qwen2.5:1.5b", "temperature": 0.0, "input_cost": 0.0, "output_cost": 0.0},
+    "qwen2.5-3b": {"model": "qwen2.5:3b", "temperature": 0.1, "input_cost": 0.0, "output_cost": 0.0},
+    "qwen2.5-7b": {"model": "qwen2.5:7b", "temperature": 0.1, "input_cost": 0.0, "output_cost": 0.0},
+}
+
+# Stronger generator, cheap critic: the critique only scores and lists fixes
+TIERED_NODE_MODELS: dict[str, str] = {
+    "generate_post": "qwen2.5-7b",
+    "generate_candidate": "qwen2.5-7b",
+    "critique_post": "qwen2.5-1.5b",
+    "critique_candidates": "qwen2.5-1.5b",
+    "prepare_round": "qwen2.5-1.5b",
+}
+
+
+def build_profile_model(profile: ModelProfile) -> "ChatOllama":
+    """Shared ChatOllama for a profile, on the pooled client and response cache of nodes.py."""
+    from nodes import get_client_manager, get_llm_cache
+
+    return get_client_manager().chat_model(profile["model"], profile["temperature"], cache=get_llm_cache())
+
+
+PROFILES = ProfileRegistry(MODEL_PROFILES, build_profile_model)
+
+
+def warm_up_profile(name: str, background: bool = True) -> Optional[float]:
+    """Load the profile's model on the Ollama server before the first node needs it."""
+    from nodes import get_client_manager
+
+    return get_client_manager().warm_up(PROFILES.get(name)["model"], background=background)
@@ -0,0 +1,151 @@
+# results_writer.py
+import gzip
+import json
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Literal, Optional
+
+from langchain_core.messages import BaseMessage
+
+from history import token_totals
+from states import RunRecord, TopicRunResult
+
+ResultsFormat = Literal["jsonl", "msgpack"]
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError("msgpack output needs the msgpack package (pip install msgpack)") from e
+    return msgpack
+
+
+def _critiques(messages: list[BaseMessage]) -> list[str]:
+    prefix = "Critique:\n\n"
+    return [m.content[len(prefix):] for m in messages if isinstance(m.content, str) and m.content.startswith(prefix)]
+
+
+def run_record(result: TopicRunResult) -> RunRecord:
+    """Compact summary of one run: no message history, only what is needed to review it."""
+    state = result["state"] or {}
+    return {
+        "topic": result["topic"],
+        "ok": result["error"] is None,
+        "error": result["error"],
+        "attempts": state.get("num_attempts", 0),
+        "final_score": state.get("critique_score"),
+        "generated_post": state.get("generated_post", ""),
+        "critiques": _critiques(state.get("messages", [])),
+        "prompt_tokens": token_totals(state) if state else {},
+        "elapsed": result["elapsed"],
+        "finished_at": time.time(),
+    }
+
+
+class ResultsWriter:
+    """Append one record per finished run to a JSONL or msgpack file.
+
+    The format is taken from the suffix (`.jsonl`, `.msgpack`, optionally
+    followed by `.gz`). Every record is encoded up front and written with a
+    single `write` on an O_APPEND descriptor, so concurrent writers (threads
+    or processes) never interleave and a crash can only cut off the last
+    record. With gzip each record is its own gzip member; the file is still
+    one valid gzip stream.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        format: Optional[ResultsFormat] = None,
+        compress: Optional[bool] = None,
+        fsync: bool = False,
+    ):
+        suffixes = Path(path).suffixes
+        self.path = path
+        self.compress = compress if compress is not None else suffixes[-1:] == [".gz"]
+        self.format = format or ("msgpack" if ".msgpack" in suffixes else "jsonl")
+        self.fsync = fsync
+        self.records = 0
+        if self.format == "msgpack":
+            _msgpack()  # fail early if it is missing
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _encode(self, record: dict[str, Any]) -> bytes:
+        if self.format == "msgpack":
+            data = _msgpack().packb(record, default=str)
+        else:
+            data = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        return gzip.compress(data) if self.compress else data
+
+    def write(self, record: dict[str, Any]) -> None:
+        data = self._encode(record)
+        with self._lock:
+            if self._fd is None:
+                raise ValueError(f"ResultsWriter for {self.path} is closed")
+            written = os.write(self._fd, data)
+            if written != len(data):
+                raise OSError(f"short write to {self.path}: {written} of {len(data)} bytes")
+            if self.fsync:
+                os.fsync(self._fd)
+            self.records += 1
+
+    def write_result(self, result: TopicRunResult) -> None:
+        self.write(run_record(result))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self) -> "ResultsWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _gunzip_members(f: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """Decompress gzip members one by one, dropping a truncated last member."""
+    decompressor, pending = zlib.decompressobj(wbits=31), []
+    while chunk := f.read(chunk_size):
+        while chunk:
+            pending.append(decompressor.decompress(chunk))
+            if not decompressor.eof:
+                break
+            yield b"".join(pending)
+            chunk, pending = decompressor.unused_data, []
+            decompressor = zlib.decompressobj(wbits=31)
+
+
+def read_results(
+    path: str, format: Optional[ResultsFormat] = None, chunk_size: int = 1 << 16
+) -> Iterator[dict[str, Any]]:
+    """Stream the records of a results file, skipping a record cut off by a crash."""
+    suffixes = Path(path).suffixes
+    format = format or ("msgpack" if ".msgpack" in suffixes else "jsonl")
+    with open(path, "rb") as f:
+        if suffixes[-1:] == [".gz"]:
+            pieces = _gunzip_members(f, chunk_size)
+        else:
+            pieces = iter(lambda: f.read(chunk_size), b"")
+
+        if format == "msgpack":
+            unpacker = _msgpack().Unpacker(raw=False)
+            for piece in pieces:
+                unpacker.feed(piece)
+                yield from unpacker
+            return
+
+        buffer = b""
+        for piece in pieces:
+            *lines, buffer = (buffer + piece).split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+        # whatever is left in `buffer` is a partial last line
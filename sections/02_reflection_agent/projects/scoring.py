@@ -0,0 +1,62 @@
+# scoring.py
+import re
+from typing import Optional
+
+from states import ParsedCritique
+
+_SCORE_RE = re.compile(r"SCORE\s*[:=]\s*\**\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+_OUT_OF_TEN_RE = re.compile(r"(\d+(?:\.\d+)?)\s*/\s*10\b")
+_IMPROVEMENTS_RE = re.compile(r"IMPROVEMENTS\s*:(.*)", re.IGNORECASE | re.DOTALL)
+_NUMBERED_ITEM_RE = re.compile(r"(?:^|\s)\d+[.)]\s+")
+_CANDIDATE_RE = re.compile(r"^[\s#*]*CANDIDATE\s*#?\s*(\d+)\b", re.IGNORECASE | re.MULTILINE)
+
+
+def parse_score(text: str) -> Optional[float]:
+    """Extract the 1-10 grade from a critique, or None if there is none."""
+    match = _SCORE_RE.search(text) or _OUT_OF_TEN_RE.search(text)
+    if match is None:
+        return None
+    return min(max(float(match.group(1)), 0.0), 10.0)
+
+
+def parse_improvements(text: str) -> list[str]:
+    """Split the trailing "IMPROVEMENTS: 1. ... 2. ..." section into items."""
+    match = _IMPROVEMENTS_RE.search(text)
+    if match is None:
+        return []
+    items = _NUMBERED_ITEM_RE.split(match.group(1))
+    return [item.strip() for item in items if item.strip()]
+
+
+def parse_critique(text: str) -> ParsedCritique:
+    """Turn the critic's free-text answer into a score and improvements list."""
+    return {"score": parse_score(text), "improvements": parse_improvements(text)}
+
+
+def split_candidate_critiques(text: str, count: int) -> list[str]:
+    """Split a batched critique into one section per "CANDIDATE <n>" header.
+
+    Candidates without a section get an empty string. An answer without any
+    header is taken as the critique of the first candidate.
+    """
+    sections = [""] * count
+    matches = list(_CANDIDATE_RE.finditer(text))
+    if not matches:
+        if count:
+            sections[0] = text
+        return sections
+    for match, following in zip(matches, matches[1:] + [None]):
+        index = int(match.group(1)) - 1
+        if 0 <= index < count and not sections[index]:
+            sections[index] = text[match.end():following.start() if following else len(text)].strip(" :.\n")
+    return sections
+
+
+def best_candidate(critiques: list[ParsedCritique]) -> int:
+    """Index of the highest-scored candidate; unscored ones rank last, ties go to the earlier one."""
+    best = 0
+    for i, critique in enumerate(critiques):
+        score, best_score = critique["score"], critiques[best]["score"]
+        if score is not None and (best_score is None or score > best_score):
+            best = i
+    return best
@@ -1,13 +1,92 @@
 import operator
-from typing import Annotated, Sequence, TypedDict
+from typing import Annotated, Optional, Sequence, TypedDict
 
 from langchain_core.messages import BaseMessage
 
 
+class NodeTokenCount(TypedDict):
+    node: str
+    attempt: int
+    prompt_tokens: int
+    history_messages: int
+
+
+class ParsedCritique(TypedDict):
+    score: Optional[float]
+    improvements: list[str]
+
+
+class SpeculationStats(TypedDict):
+    started: int
+    kept: int
+    discarded: int
+
+
+def merge_candidates(left: list[str], right: list[str]) -> list[str]:
+    """Collect candidates from parallel branches; an empty update starts a new round."""
+    if not right:
+        return []
+    return left + right
+
+
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], operator.add]
     topic: str
     generated_post: str
     critique: str
     num_attempts: int
+    critique_score: Optional[float]
+    improvements: list[str]
+    history_summary: str
+    summarized_messages: int
+    token_counts: Annotated[list[NodeTokenCount], operator.add]
+    candidates: Annotated[list[str], merge_candidates]  # best-of-N drafts of the current round
+    candidate_scores: list[Optional[float]]
+    speculation: SpeculationStats  # pipelined mode: rewrites started alongside the critique
+
+
+class RunStats(TypedDict):
+    attempts: int
+    max_attempts: int
+    attempts_saved: int
+    # Score of the last critiqued post. A run that stops at max_attempts does
+    # not critique its final post, so this is then the previous attempt's score
+    last_critique_score: Optional[float]
+    reached_target: bool  # the last critique reached target_score (early exit)
+    speculation: SpeculationStats
+
+
+class PostChunk(TypedDict):
+    node: str
+    attempt: int
+    content: str
+    first: bool  # first token of this node/attempt (time-to-first-token marker)
+    elapsed: float  # seconds since the stream started
+
+
+class TopicRunResult(TypedDict):
+    topic: str
+    state: Optional[AgentState]
+    error: Optional[str]
+    elapsed: float
+
+
+class RunRecord(TypedDict):
+    topic: str
+    ok: bool
+    error: Optional[str]
+    attempts: int
+    final_score: Optional[float]
+    generated_post: str
+    critiques: list[str]
+    prompt_tokens: dict[str, int]  # per node
+    elapsed: float
+    finished_at: float  # unix time
+
 
+class BatchRunReport(TypedDict):
+    results: list[TopicRunResult]
+    succeeded: int
+    failed: int
+    elapsed: float
+    topics_per_second: float
@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+# The project's modules are imported flat, as when run from its directory.
+# graph_common is its only local dependency (see pyproject.toml); the fake
+# models and the Ollama stub server come from the benchmarks
+for path in (REPO_ROOT / "projects/graph_benchmarks", REPO_ROOT / "projects/graph_common", PROJECT_DIR):
+    sys.path.insert(0, str(path))
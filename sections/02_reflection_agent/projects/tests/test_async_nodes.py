@@ -0,0 +1,62 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Any
+
+import pytest
+from fake_models import FakeChatModel
+
+from graph import LinkedInPostAgent
+
+
+class CountingChatModel(FakeChatModel):
+    """Counts sync and async model calls separately."""
+
+    counts: Any
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.counts["sync"] += 1
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.counts["async"] += 1
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+def test_async_nodes_await_the_model_and_match_the_sync_run():
+    counts = Counter()
+    llm = CountingChatModel(latency=0.0, output_tokens=5, counts=counts)
+    sync_state = LinkedInPostAgent(max_attempts=2, llm=llm, single_flight=False).run("async")
+    assert counts == {"sync": 3}
+
+    counts.clear()
+    async_state = asyncio.run(
+        LinkedInPostAgent(max_attempts=2, llm=llm, use_async_nodes=True, single_flight=False).arun("async")
+    )
+
+    assert counts == {"async": 3}
+    for key in ("generated_post", "critique", "num_attempts", "critique_score", "token_counts"):
+        assert async_state[key] == sync_state[key]
+
+
+def test_concurrent_async_runs_overlap_on_one_event_loop():
+    agent = LinkedInPostAgent(
+        max_attempts=2, llm=FakeChatModel(latency=0.1, output_tokens=5), use_async_nodes=True, single_flight=False
+    )
+
+    async def run_all():
+        return await asyncio.gather(*(agent.arun(f"topic {i}") for i in range(5)))
+
+    start = time.perf_counter()
+    states = asyncio.run(run_all())
+
+    # 3 model calls of 0.1 s per run; sequential runs would take 1.5 s
+    assert time.perf_counter() - start < 0.9
+    assert [state["topic"] for state in states] == [f"topic {i}" for i in range(5)]
+
+
+def test_async_nodes_cannot_be_driven_synchronously():
+    agent = LinkedInPostAgent(max_attempts=1, llm=FakeChatModel(latency=0.0), use_async_nodes=True, single_flight=False)
+
+    with pytest.raises(TypeError):
+        agent.run("async")
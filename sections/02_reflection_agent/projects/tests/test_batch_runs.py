@@ -0,0 +1,71 @@
+import asyncio
+import threading
+from typing import Any
+
+from fake_models import FakeChatModel
+from graph import LinkedInPostAgent
+
+
+class ConcurrencyProbe:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self.in_flight -= 1
+
+
+class ProbedChatModel(FakeChatModel):
+    """Fails on prompts mentioning `fail_on` and records how many calls overlap."""
+
+    probe: Any
+    fail_on: str = "doomed topic"
+
+    def _check(self, messages):
+        if any(self.fail_on in str(message.content) for message in messages):
+            raise RuntimeError("model unavailable")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        with self.probe:
+            self._check(messages)
+            return super()._generate(messages, stop, run_manager, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        with self.probe:
+            self._check(messages)
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+TOPICS = ["topic 0", "topic 1", "doomed topic", "topic 3", "topic 4", "topic 5"]
+
+
+def check_report(report, probe, max_concurrency):
+    assert [result["topic"] for result in report["results"]] == TOPICS
+    assert (report["succeeded"], report["failed"]) == (5, 1)
+    failed = report["results"][2]
+    assert failed["state"] is None and failed["error"] == "RuntimeError: model unavailable"
+    assert all(result["state"]["topic"] == result["topic"] for result in report["results"] if result["error"] is None)
+    assert 1 < probe.peak <= max_concurrency
+
+
+def test_run_many_keeps_order_isolates_failures_and_bounds_concurrency():
+    probe = ConcurrencyProbe()
+    agent = LinkedInPostAgent(max_attempts=2, llm=ProbedChatModel(latency=0.05, probe=probe), single_flight=False)
+
+    check_report(agent.run_many(TOPICS, max_concurrency=3), probe, max_concurrency=3)
+
+
+def test_arun_many_keeps_order_isolates_failures_and_bounds_concurrency():
+    probe = ConcurrencyProbe()
+    agent = LinkedInPostAgent(
+        max_attempts=2, llm=ProbedChatModel(latency=0.05, probe=probe), use_async_nodes=True, single_flight=False
+    )
+
+    check_report(asyncio.run(agent.arun_many(TOPICS, max_concurrency=3)), probe, max_concurrency=3)
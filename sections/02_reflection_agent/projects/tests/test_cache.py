@@ -0,0 +1,97 @@
+import time
+
+import pytest
+from fake_models import FakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration
+
+from cache import InMemoryLRUCache, SQLiteResponseCache, cache_from_env, cache_key
+from ollama_client import OllamaClientManager
+
+
+def test_cache_key_depends_on_model_and_temperature():
+    manager = OllamaClientManager()
+    settings = [("qwen2.5:7b", 0.1), ("qwen2.5:1.5b", 0.1), ("qwen2.5:7b", 0.0)]
+    keys = {cache_key("prompt", manager.chat_model(model, temperature)._get_llm_string()) for model, temperature in settings}
+    assert len(keys) == len(settings)
+
+
+def test_response_of_one_model_is_not_served_to_another():
+    cache = InMemoryLRUCache()
+    manager = OllamaClientManager()
+    large = manager.chat_model("qwen2.5:7b", 0.1, cache=cache)
+    small = manager.chat_model("qwen2.5:1.5b", 0.1, cache=cache)
+    cache.update("prompt", large._get_llm_string(), [ChatGeneration(message=AIMessage(content="from 7b"))])
+
+    assert cache.lookup("prompt", small._get_llm_string()) is None
+    assert cache.lookup("prompt", large._get_llm_string())[0].message.content == "from 7b"
+
+
+def test_lru_evicts_least_recently_used():
+    cache = InMemoryLRUCache(max_entries=2)
+    for prompt in ("a", "b"):
+        cache.update(prompt, "llm", [ChatGeneration(message=AIMessage(content=prompt))])
+    cache.lookup("a", "llm")
+    cache.update("c", "llm", [ChatGeneration(message=AIMessage(content="c"))])
+
+    assert cache.lookup("b", "llm") is None
+    assert cache.lookup("a", "llm") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    SQLiteResponseCache(path).update("prompt", "llm", [ChatGeneration(message=AIMessage(content="saved"))])
+
+    assert SQLiteResponseCache(path).lookup("prompt", "llm")[0].message.content == "saved"
+
+
+def test_ttl_expired_entries_are_misses():
+    cache = InMemoryLRUCache(ttl=0.0)
+    cache.update("prompt", "llm", [ChatGeneration(message=AIMessage(content="stale"))])
+    time.sleep(0.01)
+
+    assert cache.lookup("prompt", "llm") is None
+    assert cache.stats()["evictions"] == 1 and len(cache) == 0
+
+
+def test_repeated_model_call_is_served_from_the_cache():
+    cache = InMemoryLRUCache()
+    llm = FakeChatModel(latency=0.0, output_tokens=5, cache=cache)
+    prompt = [HumanMessage(content="Write a post")]
+
+    first, second = llm.invoke(prompt), llm.invoke(prompt)
+    llm.invoke([HumanMessage(content="Critique it")])
+
+    assert first.content == second.content
+    assert {key: cache.stats()[key] for key in ("hits", "misses", "size")} == {"hits": 1, "misses": 2, "size": 2}
+
+
+@pytest.mark.parametrize("backend, cache_type", [
+    (None, InMemoryLRUCache),
+    ("memory", InMemoryLRUCache),
+    ("SQLite", SQLiteResponseCache),
+    ("off", type(None)),
+])
+def test_llm_cache_selects_the_backend(monkeypatch, tmp_path, backend, cache_type):
+    if backend is None:
+        monkeypatch.delenv("LLM_CACHE", raising=False)
+    else:
+        monkeypatch.setenv("LLM_CACHE", backend)
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    monkeypatch.setenv("LLM_CACHE_MAX_ENTRIES", "7")
+
+    cache = cache_from_env()
+
+    assert type(cache) is cache_type
+    if cache is not None:
+        assert cache.max_entries == 7
+    if backend == "SQLite":
+        assert (tmp_path / "cache.sqlite").exists()
+
+
+def test_unknown_llm_cache_backend_is_rejected(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE", "redis")
+
+    with pytest.raises(ValueError, match="redis"):
+        cache_from_env()
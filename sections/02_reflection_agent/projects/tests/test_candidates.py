@@ -0,0 +1,25 @@
+from scoring import split_candidate_critiques
+from states import merge_candidates
+
+
+def test_batched_critique_is_split_per_candidate_header():
+    text = "CANDIDATE 2: Too long. SCORE: 5\n\n## Candidate #1\nStrong hook. SCORE: 8\n"
+
+    assert split_candidate_critiques(text, 3) == ["Strong hook. SCORE: 8", "Too long. SCORE: 5", ""]
+
+
+def test_critique_without_headers_goes_to_the_first_candidate():
+    assert split_candidate_critiques("SCORE: 6", 2) == ["SCORE: 6", ""]
+
+
+def test_out_of_range_and_repeated_headers_are_ignored():
+    text = "CANDIDATE 1: first\nCANDIDATE 4: unknown\nCANDIDATE 1: again"
+
+    assert split_candidate_critiques(text, 2) == ["first", ""]
+
+
+def test_candidates_from_parallel_branches_are_collected_and_reset_by_empty_update():
+    collected = merge_candidates(merge_candidates([], ["draft a"]), ["draft b"])
+
+    assert collected == ["draft a", "draft b"]
+    assert merge_candidates(collected, []) == []
@@ -0,0 +1,37 @@
+import asyncio
+import sqlite3
+
+import pytest
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from fake_models import FakeChatModel
+from graph import LinkedInPostAgent
+from nodes import get_client_manager
+
+
+def test_thread_id_depends_on_model_name_and_temperature():
+    manager = get_client_manager()
+    agents = [
+        LinkedInPostAgent(node_models={"generate_post": "qwen2.5-7b"}),
+        LinkedInPostAgent(node_models={"generate_post": "qwen2.5-1.5b"}),
+        LinkedInPostAgent(llm=manager.chat_model("qwen2.5:3b", 0.1)),
+        LinkedInPostAgent(llm=manager.chat_model("qwen2.5:3b", 0.7)),
+    ]
+    assert len({agent.thread_id("x") for agent in agents}) == len(agents)
+
+
+def test_async_agent_runs_and_resumes_on_sqlite_checkpoints(tmp_path):
+    agent = LinkedInPostAgent(
+        max_attempts=2, llm=FakeChatModel(latency=0.0), use_async_nodes=True, checkpointer=str(tmp_path / "runs.sqlite")
+    )
+    report = asyncio.run(agent.arun_many(["a", "b"]))
+    assert report["failed"] == 0
+
+    resumed = asyncio.run(agent.arun("a", resume=True))
+    assert resumed["num_attempts"] == report["results"][0]["state"]["num_attempts"]
+
+
+def test_plain_sqlite_saver_is_rejected_for_async_nodes(tmp_path):
+    saver = SqliteSaver(sqlite3.connect(tmp_path / "runs.sqlite", check_same_thread=False))
+    with pytest.raises(ValueError, match="no async interface"):
+        LinkedInPostAgent(llm=FakeChatModel(), use_async_nodes=True, checkpointer=saver)
@@ -0,0 +1,70 @@
+import pytest
+from fake_models import FakeChatModel
+from langchain_core.messages import HumanMessage
+
+from graph import LinkedInPostAgent
+from history import HistoryPolicy, token_totals
+
+
+def history_state(turns, **extra):
+    messages = []
+    for i in range(1, turns + 1):
+        messages += [HumanMessage(content=f"post {i}"), HumanMessage(content=f"critique {i}")]
+    return {"messages": messages, "history_summary": "", "summarized_messages": 0, **extra}
+
+
+def contents(messages):
+    return [message.content for message in messages]
+
+
+@pytest.mark.parametrize("policy, expected", [
+    (HistoryPolicy("full"), ["post 1", "critique 1", "post 2", "critique 2", "post 3", "critique 3"]),
+    (HistoryPolicy("last_n", max_turns=2), ["post 2", "critique 2", "post 3", "critique 3"]),
+    (HistoryPolicy("latest", max_turns=5), ["post 3", "critique 3"]),
+])
+def test_window_modes_send_only_the_recent_turns(policy, expected):
+    messages, update = policy.prepare(history_state(3), FakeChatModel(latency=0.0))
+
+    assert contents(messages) == expected and update == {}
+
+
+def test_summary_mode_folds_older_turns_once():
+    llm = FakeChatModel(latency=0.0, output_tokens=3, response_prefix="SUMMARY ")
+    policy = HistoryPolicy("summary", max_turns=1)
+
+    messages, update = policy.prepare(history_state(3), llm)
+
+    assert update == {"history_summary": "SUMMARY token token token", "summarized_messages": 4}
+    assert contents(messages)[1:] == ["post 3", "critique 3"]
+    assert contents(messages)[0].endswith("SUMMARY token token token")
+
+    # Nothing new has left the window: the stored summary is reused without a model call
+    messages, update = policy.prepare(history_state(3, **update), llm=None)
+    assert update == {} and contents(messages)[0].endswith("SUMMARY token token token")
+
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(ValueError):
+        HistoryPolicy("everything")
+    with pytest.raises(ValueError):
+        HistoryPolicy("last_n", max_turns=0)
+
+
+def run(mode):
+    llm = FakeChatModel(latency=0.0, output_tokens=40)
+    agent = LinkedInPostAgent(max_attempts=4, llm=llm, history_policy=HistoryPolicy(mode), single_flight=False)
+    return agent.run("history")
+
+
+def test_token_counts_record_every_prompt_and_the_window_bounds_growth():
+    full, latest = run("full"), run("latest")
+
+    assert [(c["node"], c["attempt"]) for c in full["token_counts"]] == [
+        ("generate_post", 1), ("critique_post", 1), ("generate_post", 2), ("critique_post", 2),
+        ("generate_post", 3), ("critique_post", 3), ("generate_post", 4),
+    ]
+    assert [c["history_messages"] for c in full["token_counts"]] == [0, 1, 2, 3, 4, 5, 6]
+    assert max(c["history_messages"] for c in latest["token_counts"]) == 2
+    assert full["token_counts"][-1]["prompt_tokens"] > latest["token_counts"][-1]["prompt_tokens"]
+    assert sum(token_totals(latest).values()) < sum(token_totals(full).values())
+    assert set(token_totals(full)) == {"generate_post", "critique_post"}
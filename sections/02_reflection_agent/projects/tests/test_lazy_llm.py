@@ -0,0 +1,32 @@
+import json
+import os
+import subprocess
+import sys
+
+import nodes
+
+
+def test_importing_the_agent_builds_no_model():
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    code = (
+        "import json, sys, graph, nodes\n"
+        "print(json.dumps([nodes.get_default_llm.cache_info().currsize, nodes.get_llm_cache.cache_info().currsize,"
+        " 'langchain_ollama' in sys.modules]))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == [0, 0, False]
+
+
+def test_legacy_module_names_build_the_shared_model_on_first_access(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE", "memory")
+    nodes.get_default_llm.cache_clear()
+    nodes.get_llm_cache.cache_clear()
+    try:
+        llm = nodes.LLM_MODEL
+
+        assert nodes.LLM_MODEL is llm is nodes.get_default_llm()
+        assert llm.model == nodes.OLLAMA_MODEL and llm.cache is nodes.LLM_CACHE
+    finally:
+        nodes.get_default_llm.cache_clear()
+        nodes.get_llm_cache.cache_clear()
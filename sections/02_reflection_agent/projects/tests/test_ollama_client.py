@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from ollama_client import OllamaClientManager
+from stub_servers import OllamaStubServer
+
+
+@pytest.fixture
+def stub():
+    with OllamaStubServer(load_delay=0.1, output_tokens=5) as server:
+        yield server
+
+
+def test_warm_up_loads_the_model_before_the_first_call(stub):
+    manager = OllamaClientManager(base_url=stub.url)
+
+    assert manager.warm_up("qwen2.5:3b") >= stub.load_delay
+    manager.chat_model("qwen2.5:3b").invoke([HumanMessage(content="hi")])
+
+    assert stub.counters["loads"] == 1
+    stats = manager.stats()
+    assert stats["cold"]["count"] == 1
+    assert stats["warm"]["count"] == 1
+
+
+@pytest.mark.parametrize("keep_alive, loads", [("30m", 1), (0, 2)])
+def test_keep_alive_is_sent_with_every_request(stub, keep_alive, loads):
+    manager = OllamaClientManager(base_url=stub.url, keep_alive=keep_alive)
+    manager.warm_up("qwen2.5:3b")
+    manager.chat_model("qwen2.5:3b").invoke([HumanMessage(content="hi")])
+
+    assert stub.counters["loads"] == loads
+
+
+def test_models_share_one_connection(stub):
+    manager = OllamaClientManager(base_url=stub.url)
+    for model in ("qwen2.5:1.5b", "qwen2.5:3b", "qwen2.5:7b"):
+        manager.chat_model(model).invoke([HumanMessage(content="hi")])
+
+    assert stub.counters["requests"] == 3
+    assert stub.counters["connections"] == 1
+
+
+def test_async_calls_share_one_connection_per_event_loop(stub):
+    manager = OllamaClientManager(base_url=stub.url)
+
+    async def run() -> None:
+        for model in ("qwen2.5:1.5b", "qwen2.5:3b"):
+            await manager.chat_model(model).ainvoke([HumanMessage(content="hi")])
+
+    asyncio.run(run())
+    asyncio.run(run())
+
+    assert stub.counters["requests"] == 4
+    assert stub.counters["connections"] == 2
@@ -0,0 +1,37 @@
+import pytest
+from langchain_core.messages import HumanMessage
+
+import nodes
+from ollama_profiles import PROFILES
+from stub_servers import OllamaStubServer
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with OllamaStubServer(load_delay=0.0, output_tokens=5) as server:
+        monkeypatch.setenv("OLLAMA_HOST", server.url)
+        monkeypatch.setenv("LLM_CACHE", "memory")
+        nodes.get_client_manager.cache_clear()
+        nodes.get_llm_cache.cache_clear()
+        yield server
+    nodes.get_client_manager.cache_clear()
+    nodes.get_llm_cache.cache_clear()
+
+
+def test_profiles_sharing_the_response_cache_get_their_own_answers(stub):
+    messages = [HumanMessage(content="Critique this post")]
+    large = PROFILES.build("qwen2.5-7b").invoke(messages)
+    small = PROFILES.build("qwen2.5-1.5b").invoke(messages)
+
+    assert stub.counters["requests"] == 2
+    assert large.response_metadata["model"] == "qwen2.5:7b"
+    assert small.response_metadata["model"] == "qwen2.5:1.5b"
+
+
+def test_repeated_call_of_one_profile_is_served_from_the_cache(stub):
+    messages = [HumanMessage(content="Write a post")]
+    PROFILES.build("qwen2.5-7b").invoke(messages)
+    PROFILES.build("qwen2.5-7b").invoke(messages)
+
+    assert stub.counters["requests"] == 1
+
@@ -0,0 +1,48 @@
+from fake_models import FakeChatModel
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from graph import LinkedInPostAgent
+from nodes import CRITIQUE_PROMPT, CRITIQUE_SYSTEM_PROMPT, GENERATE_PROMPT, GENERATE_SYSTEM_PROMPT, _generate_inputs
+
+
+class PromptRecorder(BaseCallbackHandler):
+    def __init__(self):
+        self.prompts = []
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.prompts.extend(messages)
+
+
+def state(topic, critique=""):
+    return {"topic": topic, "critique": critique, "generated_post": "a post"}
+
+
+def test_per_call_parts_come_after_a_fixed_system_prefix():
+    first = GENERATE_PROMPT.invoke(_generate_inputs(state("agents"), [])).to_messages()
+    second = GENERATE_PROMPT.invoke(_generate_inputs(state("caching", "SCORE: 4/10"), [HumanMessage(content="draft")])).to_messages()
+
+    assert first[0] == second[0] == SystemMessage(content=GENERATE_SYSTEM_PROMPT)
+    assert first[-1].content == "Topic: agents"
+    assert second[-1].content == "PREVIOUS CRITIQUE (address these issues):\nSCORE: 4/10\n\nTopic: caching"
+    assert second[1].content == "draft"
+
+
+def test_braces_in_user_text_are_not_template_fields():
+    topic = "Python {f-strings} and {{templates}}"
+
+    generate = GENERATE_PROMPT.invoke(_generate_inputs(state(topic, "use {x}"), [])).to_messages()
+    critique = CRITIQUE_PROMPT.invoke({"messages": [], "generated_post": "{post}", "topic": topic}).to_messages()
+
+    assert generate[-1].content.endswith(f"use {{x}}\n\nTopic: {topic}")
+    assert critique[-1].content == f"Post to critique:\n\n{{post}}\n\nTopic: {topic}"
+
+
+def test_every_model_call_of_a_run_starts_with_its_node_system_prompt():
+    recorder = PromptRecorder()
+    llm = FakeChatModel(latency=0.0, output_tokens=5, callbacks=[recorder])
+
+    LinkedInPostAgent(max_attempts=3, llm=llm, single_flight=False).run("prompts")
+
+    systems = [prompt[0].content for prompt in recorder.prompts]
+    assert systems == [GENERATE_SYSTEM_PROMPT, CRITIQUE_SYSTEM_PROMPT] * 2 + [GENERATE_SYSTEM_PROMPT]
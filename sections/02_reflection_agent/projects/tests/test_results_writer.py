@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from results_writer import ResultsWriter, read_results
+
+
+def write_then_cut_off_last_record(path: str, cut: int) -> None:
+    with ResultsWriter(path) as writer:
+        for i in range(3):
+            writer.write({"topic": f"topic {i}", "ok": True})
+    os.truncate(path, os.path.getsize(path) - cut)
+
+
+@pytest.mark.parametrize("name", ["results.jsonl", "results.jsonl.gz"])
+def test_truncated_last_record_is_skipped(tmp_path, name):
+    path = str(tmp_path / name)
+    write_then_cut_off_last_record(path, cut=5)
+
+    assert [record["topic"] for record in read_results(path, chunk_size=16)] == ["topic 0", "topic 1"]
+
+
+def test_msgpack_truncated_last_record_is_skipped(tmp_path):
+    pytest.importorskip("msgpack")
+    path = str(tmp_path / "results.msgpack")
+    write_then_cut_off_last_record(path, cut=3)
+
+    assert [record["topic"] for record in read_results(path)] == ["topic 0", "topic 1"]
+
+
+def test_writer_appends_to_an_existing_file(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    for i in range(2):
+        with ResultsWriter(path) as writer:
+            writer.write({"topic": f"topic {i}"})
+
+    assert len(list(read_results(path))) == 2
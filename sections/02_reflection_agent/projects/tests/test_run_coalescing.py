@@ -0,0 +1,72 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_models import FakeChatModel
+from graph_common.single_flight import SingleFlight
+from langchain_core.callbacks import BaseCallbackHandler
+
+from graph import LinkedInPostAgent
+
+
+class CallCounter(BaseCallbackHandler):
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        with self._lock:
+            self.calls += 1
+
+
+class KeyRecorder(SingleFlight):
+    def __init__(self):
+        super().__init__()
+        self.keys = []
+
+    def do(self, key, fn):
+        self.keys.append(key)
+        return super().do(key, fn)
+
+
+def make_agent(counter, **options):
+    llm = FakeChatModel(latency=0.1, output_tokens=5, callbacks=[counter])
+    return LinkedInPostAgent(max_attempts=2, llm=llm, **options)
+
+
+def test_concurrent_identical_runs_share_one_graph_run():
+    counter = CallCounter()
+    agent = make_agent(counter, single_flight=SingleFlight())
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        states = list(pool.map(lambda _: agent.run("coalesced"), range(4)))
+
+    assert counter.calls == 3
+    assert all(state is states[0] for state in states)
+
+
+def test_concurrent_identical_async_runs_share_one_graph_run():
+    counter = CallCounter()
+    agent = make_agent(counter, use_async_nodes=True, single_flight=SingleFlight())
+
+    async def run_all():
+        return await asyncio.gather(*(agent.arun("coalesced") for _ in range(4)))
+
+    states = asyncio.run(run_all())
+
+    assert counter.calls == 3
+    assert agent.single_flight.stats()["coalesced"] == 3
+    assert all(state is states[0] for state in states)
+
+
+def test_resumed_runs_are_keyed_apart_from_fresh_runs(tmp_path):
+    recorder = KeyRecorder()
+    agent = make_agent(CallCounter(), single_flight=recorder, checkpointer=str(tmp_path / "runs.sqlite"))
+
+    agent.run("never saved", resume=True)
+    agent.run("never saved")
+    agent.run("never saved", resume=True)
+
+    fresh_without_checkpoint, fresh, resumed = recorder.keys
+    assert fresh_without_checkpoint == fresh
+    assert resumed != fresh
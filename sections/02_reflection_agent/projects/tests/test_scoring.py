@@ -0,0 +1,55 @@
+import pytest
+from fake_models import FakeChatModel
+
+from graph import LinkedInPostAgent
+from scoring import parse_critique
+
+
+def test_score_and_numbered_improvements_are_parsed():
+    critique = "Solid hook, weak ending.\nSCORE: 7/10\nIMPROVEMENTS: 1. Add a call to action 2. Cut the jargon"
+
+    assert parse_critique(critique) == {"score": 7.0, "improvements": ["Add a call to action", "Cut the jargon"]}
+
+
+@pytest.mark.parametrize("text, score", [
+    ("Overall I would give it 8.5/10.", 8.5),
+    ("**SCORE:** 12", 10.0),
+    ("Good post, no grade given.", None),
+])
+def test_score_falls_back_to_out_of_ten_and_is_clamped(text, score):
+    assert parse_critique(text)["score"] == score
+
+
+def test_missing_improvements_section_gives_empty_list():
+    assert parse_critique("SCORE: 9")["improvements"] == []
+
+
+def scored_agent(score):
+    return LinkedInPostAgent(
+        max_attempts=3,
+        llm=FakeChatModel(latency=0.0, output_tokens=5, response_prefix=f"SCORE: {score}/10\n"),
+        target_score=8,
+        single_flight=False,
+    )
+
+
+def test_run_stops_once_the_critique_reaches_the_target():
+    agent = scored_agent(9)
+
+    stats = agent.run_stats(agent.run("scores"))
+
+    assert (stats["attempts"], stats["attempts_saved"]) == (1, 2)
+    assert (stats["last_critique_score"], stats["reached_target"]) == (9, True)
+
+
+def test_run_at_max_attempts_reports_the_score_of_the_last_critiqued_post():
+    agent = scored_agent(5)
+
+    state = agent.run("scores")
+    stats = agent.run_stats(state)
+
+    # The third and final post is never critiqued
+    critiqued = [entry["attempt"] for entry in state["token_counts"] if entry["node"] == "critique_post"]
+    assert critiqued == [1, 2]
+    assert (stats["attempts"], stats["attempts_saved"]) == (3, 0)
+    assert (stats["last_critique_score"], stats["reached_target"]) == (5, False)
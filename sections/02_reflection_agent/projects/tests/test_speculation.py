@@ -0,0 +1,132 @@
+import asyncio
+import gc
+import time
+from concurrent.futures import Future
+
+import pytest
+from fake_models import FakeChatModel
+
+from graph import LinkedInPostAgent
+from nodes import SpeculationTracker, _discard
+
+
+class FailingChatModel(FakeChatModel):
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        raise RuntimeError("rewrite failed")
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        raise RuntimeError("rewrite failed")
+
+
+def make_agent(score, rewriter, use_async_nodes=False, critic_latency=0.05):
+    return LinkedInPostAgent(
+        max_attempts=3,
+        llm=FakeChatModel(latency=0.0, output_tokens=5, response_prefix="DRAFT\n"),
+        node_models={
+            "critique_post": FakeChatModel(latency=critic_latency, output_tokens=5, response_prefix=f"SCORE: {score}/10\n"),
+            "speculate_post": rewriter,
+        },
+        target_score=8,
+        pipelined=True,
+        use_async_nodes=use_async_nodes,
+        single_flight=False,
+    )
+
+
+def rewriter(latency=0.0):
+    return FakeChatModel(latency=latency, output_tokens=5, response_prefix="REWRITE\n")
+
+
+def wait_until_settled(agent, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while agent.speculation_stats()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return agent.speculation_stats()
+
+
+def test_rewrite_is_kept_when_the_critique_asks_for_one():
+    agent = make_agent(score=5, rewriter=rewriter())
+
+    state = agent.run("pipelines")
+
+    assert state["num_attempts"] == 3 and state["generated_post"].startswith("REWRITE")
+    assert state["speculation"] == {"started": 2, "kept": 2, "discarded": 0}
+    stats = agent.speculation_stats()
+    assert (stats["kept"], stats["discarded"], stats["in_flight"], stats["wasted_tokens"]) == (2, 0, 0, 0)
+
+
+def test_sync_run_on_target_returns_without_waiting_for_the_rewrite():
+    agent = make_agent(score=9, rewriter=rewriter(latency=0.5), critic_latency=0.0)
+
+    start = time.perf_counter()
+    state = agent.run("pipelines")
+
+    assert time.perf_counter() - start < 0.5
+    assert state["num_attempts"] == 1 and state["generated_post"].startswith("DRAFT")
+    assert state["speculation"] == {"started": 1, "kept": 0, "discarded": 1}
+    stats = wait_until_settled(agent)
+    assert (stats["discarded"], stats["cancelled"]) == (1, 0)
+    assert stats["wasted_tokens"] == stats["tokens"] > 0
+
+
+def test_async_run_on_target_cancels_the_rewrite():
+    agent = make_agent(score=9, rewriter=rewriter(latency=0.5), use_async_nodes=True, critic_latency=0.0)
+
+    state = asyncio.run(agent.arun("pipelines"))
+
+    assert state["speculation"] == {"started": 1, "kept": 0, "discarded": 1}
+    stats = agent.speculation_stats()
+    assert (stats["discarded"], stats["cancelled"], stats["in_flight"]) == (1, 1, 0)
+
+
+def test_queued_rewrite_is_cancelled_before_its_prompt_is_sent():
+    tracker = SpeculationTracker()
+    tracker.started()
+
+    _discard(Future(), tracker, {"prompt_tokens": 40})
+
+    stats = tracker.stats()
+    assert (stats["cancelled"], stats["in_flight"], stats["tokens"]) == (1, 0, 0)
+
+
+@pytest.mark.parametrize("score", [5, 9])
+def test_sync_and_async_runs_report_the_same_speculation(score):
+    # The rewrite finishes before the critique, so neither path cancels it
+    sync_agent = make_agent(score=score, rewriter=rewriter())
+    async_agent = make_agent(score=score, rewriter=rewriter(), use_async_nodes=True)
+
+    sync_state = sync_agent.run("pipelines")
+    async_state = asyncio.run(async_agent.arun("pipelines"))
+
+    assert sync_agent.run_stats(sync_state) == async_agent.run_stats(async_state)
+    assert wait_until_settled(sync_agent) == async_agent.speculation_stats()
+
+
+def test_failed_rewrite_fails_the_run_only_when_it_is_kept():
+    agent = make_agent(score=5, rewriter=FailingChatModel(latency=0.0))
+
+    with pytest.raises(RuntimeError, match="rewrite failed"):
+        agent.run("pipelines")
+    assert agent.speculation_stats()["in_flight"] == 0
+
+
+def test_failed_discarded_rewrite_does_not_leak_its_exception():
+    sync_agent = make_agent(score=9, rewriter=FailingChatModel(latency=0.0))
+    async_agent = make_agent(score=9, rewriter=FailingChatModel(latency=0.0), use_async_nodes=True)
+
+    assert sync_agent.run("pipelines")["speculation"]["discarded"] == 1
+    assert wait_until_settled(sync_agent)["tokens"] == 0
+
+    async def run_and_collect_loop_errors():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        state = await async_agent.arun("pipelines")
+        gc.collect()
+        return state, errors
+
+    state, errors = asyncio.run(run_and_collect_loop_errors())
+    assert state["speculation"]["discarded"] == 1 and errors == []
+    stats = async_agent.speculation_stats()
+    assert (stats["in_flight"], stats["cancelled"], stats["tokens"]) == (0, 0, 0)
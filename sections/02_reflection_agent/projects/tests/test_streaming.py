@@ -0,0 +1,60 @@
+import asyncio
+from collections import defaultdict
+
+from fake_models import FakeChatModel
+
+from graph import LinkedInPostAgent
+from history import HistoryPolicy
+
+
+def make_agent(**options):
+    llm = FakeChatModel(latency=0.0, output_tokens=8)
+    return LinkedInPostAgent(max_attempts=3, llm=llm, single_flight=False, **options)
+
+
+def group(chunks):
+    """Joined content per (node, attempt), in stream order, and the number of `first` markers."""
+    contents, firsts = defaultdict(str), defaultdict(int)
+    for chunk in chunks:
+        key = (chunk["node"], chunk["attempt"])
+        contents[key] += chunk["content"]
+        firsts[key] += chunk["first"]
+    return dict(contents), dict(firsts)
+
+
+def test_stream_tags_tokens_with_node_and_attempt():
+    agent = make_agent()
+    state = agent.run("streaming")
+
+    chunks = list(agent.stream("streaming"))
+    contents, firsts = group(chunks)
+
+    assert list(contents) == [
+        ("generate_post", 1), ("critique_post", 1), ("generate_post", 2), ("critique_post", 2), ("generate_post", 3),
+    ]
+    assert set(firsts.values()) == {1} and chunks[0]["first"]
+    assert contents[("generate_post", 3)] == state["generated_post"]
+    assert contents[("critique_post", 2)] == state["critique"]
+    assert all(a["elapsed"] <= b["elapsed"] for a, b in zip(chunks, chunks[1:]))
+
+
+def test_astream_yields_the_same_chunks_as_stream():
+    sync_chunks = list(make_agent().stream("streaming"))
+
+    async def collect():
+        return [chunk async for chunk in make_agent(use_async_nodes=True).astream("streaming")]
+
+    async_chunks = asyncio.run(collect())
+
+    strip = lambda chunks: [{key: value for key, value in chunk.items() if key != "elapsed"} for chunk in chunks]
+    assert strip(async_chunks) == strip(sync_chunks)
+
+
+def test_history_summaries_are_not_streamed():
+    agent = make_agent(history_policy=HistoryPolicy("summary", max_turns=1))
+    state = agent.run("streaming")
+
+    contents, _ = group(agent.stream("streaming"))
+
+    assert state["history_summary"]
+    assert contents[("critique_post", 2)] == state["critique"]